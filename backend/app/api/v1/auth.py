@@ -1,69 +1,289 @@
 """Authentication endpoints"""
 
 import uuid
+from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.passwords import (
+    PasswordHasherBusyError,
+    email_throttle,
+    ip_throttle,
+    password_hasher,
+)
+from app.core.rate_limit import client_ip
 from app.core.security import (
     create_access_token,
+    create_refresh_token,
+    get_current_principal,
     get_current_user,
-    get_password_hash,
-    verify_password,
+    hash_refresh_token,
+    optional_oauth2_scheme,
+    revoke_access_tokens,
 )
-from app.db.database import get_db
+from app.db.database import get_async_db
+from app.models.refresh_token import REVOKED_LOGOUT, REVOKED_ROTATED, RefreshToken
 from app.models.user import User
-from app.schemas.user import Token, UserCreate, UserResponse
+from app.schemas.user import (
+    LogoutRequest,
+    RefreshRequest,
+    Token,
+    UserCreate,
+    UserResponse,
+)
 
 router = APIRouter()
 
 
+def _raise_if_throttled(ip_key: str, email_key: str | None = None) -> None:
+    """Reject the request with 429 if its IP or email failed too often"""
+    retry_after = ip_throttle.retry_after(ip_key)
+    if retry_after is None and email_key is not None:
+        retry_after = email_throttle.retry_after(email_key)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed attempts, please retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def _busy(e: PasswordHasherBusyError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": "1"},
+    )
+
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def _issue_tokens(db: AsyncSession, user_id: str, token_version: int) -> Token:
+    """Create an access token and a stored refresh token, and commit"""
+    now = datetime.utcnow()
+    # Expired refresh tokens of the user are no longer needed, even for
+    # reuse detection
+    await db.execute(
+        delete(RefreshToken).where(
+            RefreshToken.user_id == user_id, RefreshToken.expires_at <= now
+        )
+    )
+    refresh_token = create_refresh_token()
+    db.add(
+        RefreshToken(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            token_hash=hash_refresh_token(refresh_token),
+            expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    await db.commit()
+
+    return Token(
+        access_token=create_access_token(subject=user_id, token_version=token_version),
+        token_type="bearer",
+        refresh_token=refresh_token,
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+
+async def _revoke_sessions(db: AsyncSession, user_id: str) -> None:
+    """Invalidate every access and refresh token of a user, and commit"""
+    token_version = await db.scalar(
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+        .returning(User.token_version)
+    )
+    await db.execute(delete(RefreshToken).where(RefreshToken.user_id == user_id))
+    await db.commit()
+    if token_version is not None:
+        revoke_access_tokens(user_id, token_version)
+
+
 @router.post(
     "/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
-def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+async def signup(
+    user_data: UserCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
     """Register a new user"""
+    ip_key = f"ip:{client_ip(request)}"
+    _raise_if_throttled(ip_key)
+
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(
+        select(User.id).where(User.email == user_data.email)
+    )
     if existing_user:
+        ip_throttle.record_failure(ip_key)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
+    # Hash in the bcrypt executor, off the shared threadpool
+    try:
+        password_hash = await password_hasher.hash(user_data.password)
+    except PasswordHasherBusyError as e:
+        raise _busy(e)
+
     # Create new user
     user = User(
         id=str(uuid.uuid4()),
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=password_hash,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     return user
 
 
 @router.post("/login", response_model=Token)
-def login(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+async def login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Authenticate user and return JWT token"""
-    # Find user by email (OAuth2 form uses 'username' field)
-    user = db.query(User).filter(User.email == form_data.username).first()
+    """Authenticate user and return an access and refresh token pair"""
+    # OAuth2 form uses 'username' field for the email
+    ip_key = f"ip:{client_ip(request)}"
+    email_key = f"email:{form_data.username.lower()}"
+    _raise_if_throttled(ip_key, email_key)
+
+    user = await db.scalar(select(User).where(User.email == form_data.username))
+
+    try:
+        valid = user is not None and await password_hasher.verify(
+            form_data.password, user.password_hash
+        )
+    except PasswordHasherBusyError as e:
+        raise _busy(e)
 
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not valid:
+        ip_throttle.record_failure(ip_key)
+        email_throttle.record_failure(email_key)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    email_throttle.reset(email_key)
+
+    return await _issue_tokens(db, user.id, user.token_version)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_tokens(
+    refresh: RefreshRequest, db: AsyncSession = Depends(get_async_db)
+):
+    """Exchange a refresh token for a new access and refresh token pair"""
+    now = datetime.utcnow()
+    stored = (
+        await db.execute(
+            select(
+                RefreshToken.id, RefreshToken.user_id, RefreshToken.expires_at
+            ).where(
+                RefreshToken.token_hash == hash_refresh_token(refresh.refresh_token)
+            )
+        )
+    ).first()
+    if stored is None or stored.expires_at <= now:
+        raise _invalid_refresh_token()
+
+    # Claim the token in one conditional UPDATE, so it can be used only once
+    claimed = (
+        await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == stored.id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now, revoked_reason=REVOKED_ROTATED)
+        )
+    ).rowcount
+    if not claimed:
+        reason = await db.scalar(
+            select(RefreshToken.revoked_reason).where(RefreshToken.id == stored.id)
+        )
+        if reason == REVOKED_ROTATED:
+            # A rotated token came back: assume it leaked and end every session
+            await _revoke_sessions(db, stored.user_id)
+        raise _invalid_refresh_token()
+
+    token_version = await db.scalar(
+        select(User.token_version).where(User.id == stored.user_id)
+    )
+    if token_version is None:
+        await db.rollback()
+        raise _invalid_refresh_token()
+
+    return await _issue_tokens(db, stored.user_id, token_version)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    logout_data: LogoutRequest,
+    db: AsyncSession = Depends(get_async_db),
+    token: str | None = Depends(optional_oauth2_scheme),
+):
+    """
+    End the session of a refresh token, or every session of the user.
+
+    The refresh token alone authenticates the request, so a client whose
+    access token has expired can still log out; without one the access
+    token is required. With allSessions every access token of the user is
+    rejected at once; otherwise the current access token stays valid until
+    it expires.
+    """
+    now = datetime.utcnow()
+    if logout_data.refresh_token:
+        token_hash = hash_refresh_token(logout_data.refresh_token)
+        if not logout_data.all_sessions:
+            await db.execute(
+                update(RefreshToken)
+                .where(
+                    RefreshToken.token_hash == token_hash,
+                    RefreshToken.revoked_at.is_(None),
+                )
+                .values(revoked_at=now, revoked_reason=REVOKED_LOGOUT)
+            )
+            await db.commit()
+            return None
+
+        user_id = await db.scalar(
+            select(RefreshToken.user_id).where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+        )
+        if user_id is None:
+            raise _invalid_refresh_token()
+    else:
+        if token is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Not authenticated",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        user_id = (await get_current_principal(token, db)).id
 
-    # Create access token
-    access_token = create_access_token(subject=user.id)
+    if logout_data.all_sessions:
+        await _revoke_sessions(db, user_id)
 
-    return Token(access_token=access_token, token_type="bearer")
+    return None
 
 
 @router.get("/me", response_model=UserResponse)
@@ -1,30 +1,56 @@
 import uuid
-
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import get_current_user
-from app.db.database import get_db
+from app.core.rate_limit import RateLimit
+from app.core.security import Principal, get_current_principal
+from app.db.database import get_async_db, upsert_insert
 from app.models.book import Book
-from app.models.user import User
-from app.schemas.book import BookListResponse, BookResponse, BookUpdate
+from app.models.dictionary import DictionaryWord
+from app.schemas.book import (
+    BookListResponse,
+    BookPageResponse,
+    BookResponse,
+    BookUpdate,
+    BookWordsResponse,
+)
+from app.services.definition_warmer import definition_warmer
 from app.services.pdf_service import pdf_service
 from app.services.sample_book import (
     SAMPLE_BOOK_ID,
+    SAMPLE_BOOK_CONTENT,
     get_sample_book_data,
     is_sample_book,
 )
+from app.services.word_annotator import word_annotator
+from app.services.word_index import word_index
 
 router = APIRouter()
 
 
 @router.get("", response_model=BookListResponse)
-def list_books(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+async def list_books(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """List all books uploaded by the user"""
-    books = db.query(Book).filter(Book.user_id == current_user.id).all()
+    books = (
+        await db.scalars(select(Book).where(Book.user_id == current_user.id))
+    ).all()
 
     # Add the sample book (loaded from code, always up to date)
     sample_book_data = get_sample_book_data()
@@ -38,11 +64,17 @@ def list_books(
     return BookListResponse(books=book_responses)
 
 
-@router.post("", response_model=BookResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=BookResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(RateLimit("upload_book").by_user)],
+)
 async def upload_book(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Upload a new PDF book"""
 
@@ -70,36 +102,35 @@ async def upload_book(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid PDF file"
         )
 
-    # Extract text from PDF
+    # Extract text from PDF, off the event loop (parsing is CPU-bound)
     try:
-        content = pdf_service.extract_text_from_pdf(file_content)
+        content = await run_in_threadpool(
+            pdf_service.extract_text_from_pdf, file_content
+        )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+    # Prefetch definitions of the book's hardest words once the response is sent
+    background_tasks.add_task(definition_warmer.warm_book, content)
+
     # Create book name from filename (remove .pdf extension)
     book_name = file.filename
     if book_name.lower().endswith(".pdf"):
         book_name = book_name[:-4]
 
-    # Check if book with same name already exists
-    existing_book = (
-        db.query(Book)
-        .filter(Book.user_id == current_user.id, Book.name == book_name)
-        .first()
-    )
+    # Words saved from an earlier upload point into its text, so a re-upload
+    # with different text must drop their positions
+    previous = (
+        await db.execute(
+            select(Book.id, Book.content).where(
+                Book.user_id == current_user.id, Book.name == book_name
+            )
+        )
+    ).first()
 
-    if existing_book:
-        # Update existing book
-        existing_book.content = content
-        existing_book.total_pages = len(content)
-        existing_book.file_size = file_size
-        existing_book.current_page = 0
-        db.commit()
-        db.refresh(existing_book)
-        return existing_book
-
-    # Create new book
-    book = Book(
+    # Create the book, or replace the content of the user's book with the
+    # same name, in one statement on the unique (user_id, name) index
+    insert_book = upsert_insert(db, Book).values(
         id=str(uuid.uuid4()),
         user_id=current_user.id,
         name=book_name,
@@ -108,29 +139,49 @@ async def upload_book(
         total_pages=len(content),
         file_size=file_size,
     )
-
-    db.add(book)
-    db.commit()
-    db.refresh(book)
+    book = (
+        await db.scalars(
+            insert_book.on_conflict_do_update(
+                index_elements=["user_id", "name"],
+                set_={
+                    "content": insert_book.excluded.content,
+                    "total_pages": insert_book.excluded.total_pages,
+                    "file_size": insert_book.excluded.file_size,
+                    "current_page": 0,
+                    "updated_at": datetime.utcnow(),
+                },
+            )
+            .returning(Book)
+            .execution_options(populate_existing=True)
+        )
+    ).one()
+    if previous is not None and previous.content != content:
+        await db.execute(
+            update(DictionaryWord)
+            .where(
+                DictionaryWord.user_id == current_user.id,
+                DictionaryWord.book_id == previous.id,
+            )
+            .values(page_index=None, char_offset=None)
+        )
+    await db.commit()
 
     return book
 
 
 @router.get("/{book_id}", response_model=BookResponse)
-def get_book(
+async def get_book(
     book_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get a specific book by ID"""
     # Handle sample book specially - load from code
     if is_sample_book(book_id):
         return BookResponse(**get_sample_book_data())
 
-    book = (
-        db.query(Book)
-        .filter(Book.id == book_id, Book.user_id == current_user.id)
-        .first()
+    book = await db.scalar(
+        select(Book).where(Book.id == book_id, Book.user_id == current_user.id)
     )
 
     if not book:
@@ -141,12 +192,95 @@ def get_book(
     return book
 
 
+@router.get("/{book_id}/pages/{page_index}", response_model=BookPageResponse)
+async def get_book_page(
+    book_id: str,
+    page_index: int,
+    annotate: str | None = Query(default=None, pattern="^saved$"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Get one page of a book.
+
+    With annotate=saved the response also lists every whole-word occurrence
+    of the user's saved words on the page, found in one pass over the text.
+    """
+    if is_sample_book(book_id):
+        content = SAMPLE_BOOK_CONTENT
+    else:
+        content = await db.scalar(
+            select(Book.content).where(
+                Book.id == book_id, Book.user_id == current_user.id
+            )
+        )
+        if content is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Book not found"
+            )
+
+    if not 0 <= page_index < len(content):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid page number. Book has {len(content)} pages",
+        )
+
+    page = content[page_index]
+    annotations = None
+    if annotate == "saved":
+        annotations = await word_annotator.annotate(db, current_user.id, page)
+
+    return BookPageResponse(
+        book_id=book_id,
+        page_index=page_index,
+        total_pages=len(content),
+        content=page,
+        annotations=annotations,
+    )
+
+
+@router.get("/{book_id}/words", response_model=BookWordsResponse)
+async def get_book_words(
+    book_id: str,
+    page: int | None = Query(default=None, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Get the dictionary words saved from a book, in reading order"""
+    if not is_sample_book(book_id):
+        exists = await db.scalar(
+            select(
+                select(Book.id)
+                .where(Book.id == book_id, Book.user_id == current_user.id)
+                .exists()
+            )
+        )
+        if not exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Book not found"
+            )
+
+    # One range scan on (user_id, book_id, page_index, char_offset)
+    query = select(DictionaryWord).where(
+        DictionaryWord.user_id == current_user.id, DictionaryWord.book_id == book_id
+    )
+    if page is not None:
+        query = query.where(DictionaryWord.page_index == page)
+    words = (
+        await db.scalars(
+            query.order_by(DictionaryWord.page_index, DictionaryWord.char_offset)
+        )
+    ).all()
+
+    return BookWordsResponse(book_id=book_id, words=words)
+
+
 @router.patch("/{book_id}", response_model=BookResponse)
-def update_book_progress(
+async def update_book_progress(
     book_id: str,
     book_update: BookUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Update book reading progress"""
     # Handle sample book - progress is not persisted
@@ -162,10 +296,8 @@ def update_book_progress(
         sample_data["current_page"] = book_update.current_page
         return BookResponse(**sample_data)
 
-    book = (
-        db.query(Book)
-        .filter(Book.id == book_id, Book.user_id == current_user.id)
-        .first()
+    book = await db.scalar(
+        select(Book).where(Book.id == book_id, Book.user_id == current_user.id)
     )
 
     if not book:
@@ -181,17 +313,17 @@ def update_book_progress(
         )
 
     book.current_page = book_update.current_page
-    db.commit()
-    db.refresh(book)
+    await db.commit()
+    await db.refresh(book)
 
     return book
 
 
 @router.delete("/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_book(
+async def delete_book(
     book_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Delete a book"""
     # Sample book cannot be deleted
@@ -201,10 +333,8 @@ def delete_book(
             detail="The sample book cannot be deleted",
         )
 
-    book = (
-        db.query(Book)
-        .filter(Book.id == book_id, Book.user_id == current_user.id)
-        .first()
+    book = await db.scalar(
+        select(Book).where(Book.id == book_id, Book.user_id == current_user.id)
     )
 
     if not book:
@@ -212,7 +342,18 @@ def delete_book(
             status_code=status.HTTP_404_NOT_FOUND, detail="Book not found"
         )
 
-    db.delete(book)
-    db.commit()
+    # Words saved from the book go with it, in one set-based DELETE
+    deleted_words = (
+        await db.execute(
+            delete(DictionaryWord).where(
+                DictionaryWord.user_id == current_user.id,
+                DictionaryWord.book_id == book_id,
+            )
+        )
+    ).rowcount
+    await db.delete(book)
+    await db.commit()
+    if deleted_words:
+        word_index.invalidate(current_user.id)
 
     return None
@@ -0,0 +1,105 @@
+"""App start endpoint"""
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings as app_settings
+from app.core.security import Principal, get_current_principal
+from app.db.database import get_async_db
+from app.models.book import Book
+from app.models.dictionary import DictionaryWord
+from app.models.settings import DEFAULT_SETTINGS, UserSettings
+from app.models.user import User
+from app.schemas.book import BookSummary
+from app.schemas.bootstrap import BootstrapResponse, DictionarySummary
+from app.schemas.settings import UserSettingsResponse
+from app.schemas.user import UserResponse
+from app.services.sample_book import get_sample_book_data
+
+router = APIRouter()
+
+
+@router.get("", response_model=BootstrapResponse)
+async def get_bootstrap(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Get the user, settings, library and dictionary summary in one request.
+
+    Read-only and two queries: the user row with its settings and saved-word
+    counts, then the library metadata (page content is not loaded). Runs on
+    the same async session as authentication, which adds one query when the
+    token is not cached yet.
+    """
+    now = datetime.utcnow()
+    words = (
+        select(func.count())
+        .select_from(DictionaryWord)
+        .where(DictionaryWord.user_id == current_user.id)
+    )
+    due = words.where(DictionaryWord.due_at <= now)
+
+    row = (
+        await db.execute(
+            select(
+                User.id,
+                User.email,
+                User.created_at,
+                UserSettings.timer_duration,
+                UserSettings.reading_mode,
+                UserSettings.updated_at,
+                words.scalar_subquery().label("total_words"),
+                due.scalar_subquery().label("due_words"),
+            )
+            .outerjoin(UserSettings, UserSettings.user_id == User.id)
+            .where(User.id == current_user.id)
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Users who never changed their settings get the defaults, without a write
+    if row.timer_duration is None:
+        user_settings = UserSettingsResponse(
+            user_id=row.id, updated_at=row.created_at, **DEFAULT_SETTINGS
+        )
+    else:
+        user_settings = UserSettingsResponse(
+            user_id=row.id,
+            timer_duration=row.timer_duration,
+            reading_mode=row.reading_mode,
+            updated_at=row.updated_at,
+        )
+    user_settings.dev_mode = app_settings.DEV_MODE
+
+    books = (
+        await db.execute(
+            select(
+                Book.id,
+                Book.name,
+                Book.current_page,
+                Book.total_pages,
+                Book.file_size,
+                Book.created_at,
+                Book.updated_at,
+            ).where(Book.user_id == current_user.id)
+        )
+    ).all()
+
+    return BootstrapResponse(
+        user=UserResponse(id=row.id, email=row.email, created_at=row.created_at),
+        settings=user_settings,
+        books=[BookSummary(**get_sample_book_data())]
+        + [BookSummary.model_validate(book) for book in books],
+        dictionary=DictionarySummary(
+            total=row.total_words, due_for_review=row.due_words
+        ),
+    )
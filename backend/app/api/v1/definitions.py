@@ -1,30 +1,104 @@
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse
 
+from app.core.rate_limit import RateLimit
 from app.schemas.dictionary import WordDefinitionResponse, WordPronunciationResponse
-from app.services.dictionary_service import dictionary_service
+from app.services.audio_service import audio_service
+from app.services.dictionary_service import (
+    DictionaryUnavailableError,
+    dictionary_service,
+)
 
 router = APIRouter()
 
+# The clip behind a word changes if the upstream starts pointing it at
+# another recording, so it is cached for a day rather than forever
+AUDIO_CACHE_CONTROL = "public, max-age=86400"
 
-@router.get("/{word}", response_model=WordDefinitionResponse)
+# Lookups may reach the upstream dictionary API
+definitions_rate_limit = Depends(RateLimit("definitions").by_ip)
+
+
+@router.get(
+    "/{word}",
+    response_model=WordDefinitionResponse,
+    dependencies=[definitions_rate_limit],
+)
 async def get_word_definition(word: str):
     """Get definition of a word from external dictionary API"""
 
     try:
         definition = await dictionary_service.get_word_definition(word)
         return definition
+    except DictionaryUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
-@router.get("/{word}/pronounce", response_model=WordPronunciationResponse)
+@router.get(
+    "/{word}/pronounce",
+    response_model=WordPronunciationResponse,
+    dependencies=[definitions_rate_limit],
+)
 async def get_word_pronunciation(
-    word: str, voice: str = Query(default="us", pattern="^(us|uk|au)$")
+    request: Request,
+    word: str,
+    voice: str = Query(default="us", pattern="^(us|uk|au)$"),
 ):
     """Get pronunciation audio URL for a word"""
 
     try:
         pronunciation = await dictionary_service.get_word_pronunciation(word, voice)
+        pronunciation.cached_audio_url = str(
+            request.url_for("get_word_audio", word=word)
+        )
         return pronunciation
+    except DictionaryUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get(
+    "/{word}/audio",
+    response_class=FileResponse,
+    dependencies=[definitions_rate_limit],
+)
+async def get_word_audio(word: str):
+    """
+    Serve pronunciation audio for a word from the local audio cache.
+
+    The clip is downloaded from the dictionary's audio URL on first request.
+    Range requests are supported.
+    """
+
+    try:
+        definition = await dictionary_service.get_word_definition(word)
+    except DictionaryUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    if not definition.audio_url:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Pronunciation not available for '{word}'",
+        )
+
+    try:
+        path = await audio_service.get_audio(definition.audio_url)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+
+    return FileResponse(
+        path,
+        media_type="audio/mpeg",
+        headers={"Cache-Control": AUDIO_CACHE_CONTROL},
+    )
@@ -1,112 +1,363 @@
+import base64
+import json
 import uuid
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_current_user
-from app.db.database import get_db
+from app.core.config import settings
+from app.core.security import Principal, get_current_principal
+from app.db.database import get_async_db, upsert_insert
+from app.models.book import Book
 from app.models.dictionary import DictionaryWord
-from app.models.user import User
 from app.schemas.dictionary import (
+    DictionaryImportResponse,
     DictionaryListResponse,
+    DictionarySearchResponse,
     DictionaryWordCreate,
     DictionaryWordResponse,
+    ReviewBatchRequest,
+    ReviewBatchResponse,
+    ReviewQueueResponse,
     WordExistsResponse,
+    WordsCheckRequest,
+    WordsCheckResponse,
 )
+from app.services.dictionary_io import (
+    FILE_EXTENSIONS,
+    MEDIA_TYPES,
+    ImportedWord,
+    InvalidRowError,
+    detect_format,
+    read_words,
+    write_words_async,
+)
+from app.services.review_service import ReviewState, schedule_review
+from app.services.sample_book import SAMPLE_BOOK_CONTENT, is_sample_book
+from app.services.word_index import find_saved_words, word_index
+from app.services.word_normalizer import extract_words, normalize_word
+from app.services.word_search import word_search_service
 
 router = APIRouter()
 
 
+# Rows per dedupe query and executemany INSERT during bulk import
+IMPORT_BATCH_SIZE = 1000
+# Invalid rows reported back by message; the rest are only counted
+MAX_IMPORT_ERRORS = 20
+# Rows fetched per round trip while streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+# Sort orders of GET /dictionary: (column, descending). Timestamp orders are
+# made total with the id tiebreaker; words are unique per user.
+SORT_ORDERS = {
+    "addedAt_desc": ("added_at", True),
+    "addedAt_asc": ("added_at", False),
+    "word_asc": ("word", False),
+    "word_desc": ("word", True),
+}
+
+
+def _encode_cursor(sort: str, word: DictionaryWord) -> str:
+    """Opaque token pointing just past word in the given sort order"""
+    column, _ = SORT_ORDERS[sort]
+    key = [word.added_at.isoformat(), word.id] if column == "added_at" else [word.word]
+    payload = json.dumps({"s": sort, "k": key}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> list:
+    """
+    Decode a cursor produced by _encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        cursor_sort, key = payload["s"], payload["k"]
+        if SORT_ORDERS[sort][0] == "added_at":
+            added_at, word_id = key
+            key = [datetime.fromisoformat(added_at), str(word_id)]
+        else:
+            (word,) = key
+            key = [str(word)]
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if cursor_sort != sort:
+        raise ValueError("Cursor does not match the requested sort order")
+    return key
+
+
 @router.get("", response_model=DictionaryListResponse)
-def get_dictionary(
+async def get_dictionary(
     sort: str = Query(
         default="addedAt_desc",
         pattern="^(addedAt_desc|addedAt_asc|word_asc|word_desc)$",
     ),
     limit: int = Query(default=100, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    cursor: str | None = Query(default=None),
+    include_total: bool = Query(default=True, alias="includeTotal"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    """Get user's personal dictionary"""
+    """
+    Get user's personal dictionary
+
+    Pages can be fetched by offset or, preferably, by passing the previous
+    page's nextCursor: cursor pages seek straight to their first row through
+    the (user_id, added_at, id) / (user_id, word) indexes instead of scanning
+    and discarding every row before the offset. The total count costs an
+    extra query and can be skipped with includeTotal=false.
+    """
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or offset, not both",
+        )
+
+    column_name, descending = SORT_ORDERS[sort]
+    if column_name == "added_at":
+        sort_columns = [DictionaryWord.added_at, DictionaryWord.id]
+    else:
+        sort_columns = [DictionaryWord.word]
 
     # Build query
-    query = db.query(DictionaryWord).filter(DictionaryWord.user_id == current_user.id)
-
-    # Apply sorting
-    if sort == "addedAt_desc":
-        query = query.order_by(DictionaryWord.added_at.desc())
-    elif sort == "addedAt_asc":
-        query = query.order_by(DictionaryWord.added_at.asc())
-    elif sort == "word_asc":
-        query = query.order_by(DictionaryWord.word.asc())
-    elif sort == "word_desc":
-        query = query.order_by(DictionaryWord.word.desc())
+    query = select(DictionaryWord).where(DictionaryWord.user_id == current_user.id)
 
     # Get total count
-    total = query.count()
+    total = None
+    if include_total:
+        total = await db.scalar(
+            select(func.count())
+            .select_from(DictionaryWord)
+            .where(DictionaryWord.user_id == current_user.id)
+        )
 
     # Apply pagination
-    words = query.offset(offset).limit(limit).all()
+    if cursor is not None:
+        try:
+            key = _decode_cursor(cursor, sort)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        sort_key, cursor_key = tuple_(*sort_columns), tuple_(*key)
+        query = query.where(
+            sort_key < cursor_key if descending else sort_key > cursor_key
+        )
+
+    query = query.order_by(
+        *(column.desc() if descending else column.asc() for column in sort_columns)
+    )
+
+    # Fetch one extra row to learn whether another page follows
+    words = (await db.scalars(query.offset(offset).limit(limit + 1))).all()
+    next_cursor = None
+    if len(words) > limit:
+        words = words[:limit]
+        next_cursor = _encode_cursor(sort, words[-1])
+
+    return DictionaryListResponse(
+        words=words,
+        total=total,
+        limit=limit,
+        offset=offset,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/search", response_model=DictionarySearchResponse)
+async def search_dictionary(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Search the dictionary: prefix matches first, then typo-tolerant matches"""
+    words = await word_search_service.search(db, current_user.id, q, limit=limit)
+    return DictionarySearchResponse(query=q.lower().strip(), words=words)
+
+
+@router.get("/review/next", response_model=ReviewQueueResponse)
+async def get_review_queue(
+    n: int = Query(default=20, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Get the next cards due for review, most overdue first"""
+    cards = (
+        await db.scalars(
+            select(DictionaryWord)
+            .where(
+                DictionaryWord.user_id == current_user.id,
+                DictionaryWord.due_at <= datetime.utcnow(),
+            )
+            .order_by(DictionaryWord.due_at)
+            .limit(n)
+        )
+    ).all()
+
+    return ReviewQueueResponse(cards=cards)
+
+
+@router.post("/review", response_model=ReviewBatchResponse)
+async def grade_reviews(
+    batch: ReviewBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Grade a batch of review cards
+
+    All cards are loaded with one query and rescheduled with one bulk UPDATE
+    in a single transaction; if any card is not found nothing is changed.
+    A card graded twice in the batch is rescheduled twice, in order.
+    """
+    ids = {grade.word_id for grade in batch.grades}
+    cards = {
+        card.id: card
+        for card in await db.scalars(
+            select(DictionaryWord).where(DictionaryWord.id.in_(ids))
+        )
+        if card.user_id == current_user.id
+    }
+
+    missing = ids - cards.keys()
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Words not found in dictionary: {', '.join(sorted(missing))}",
+        )
+
+    now = datetime.utcnow()
+    states = {
+        card.id: ReviewState(
+            interval_days=card.interval_days,
+            ease=card.ease,
+            repetitions=card.repetitions,
+            due_at=card.due_at,
+        )
+        for card in cards.values()
+    }
+    for grade in batch.grades:
+        states[grade.word_id] = schedule_review(states[grade.word_id], grade.grade, now)
+
+    await db.execute(
+        update(DictionaryWord),
+        [
+            {
+                "id": word_id,
+                "interval_days": state.interval_days,
+                "ease": state.ease,
+                "repetitions": state.repetitions,
+                "due_at": state.due_at,
+                "reviewed_at": now,
+            }
+            for word_id, state in states.items()
+        ],
+    )
+    await db.commit()
+
+    graded = await db.scalars(
+        select(DictionaryWord)
+        .where(DictionaryWord.id.in_(ids))
+        .execution_options(populate_existing=True)
+    )
+    order = list(dict.fromkeys(grade.word_id for grade in batch.grades))
+    by_id = {card.id: card for card in graded}
+    return ReviewBatchResponse(cards=[by_id[word_id] for word_id in order])
 
-    return DictionaryListResponse(words=words, total=total, limit=limit, offset=offset)
+
+async def _check_word_source(
+    db: AsyncSession, user: Principal, word_data: DictionaryWordCreate
+):
+    """Validate the book and page a word is being saved from"""
+    if is_sample_book(word_data.book_id):
+        total_pages = len(SAMPLE_BOOK_CONTENT)
+    else:
+        total_pages = await db.scalar(
+            select(Book.total_pages).where(
+                Book.id == word_data.book_id, Book.user_id == user.id
+            )
+        )
+        if total_pages is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Book not found"
+            )
+
+    if word_data.page_index is not None and word_data.page_index >= total_pages:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid page number. Book has {total_pages} pages",
+        )
 
 
 @router.post(
     "", response_model=DictionaryWordResponse, status_code=status.HTTP_201_CREATED
 )
-def add_word_to_dictionary(
+async def add_word_to_dictionary(
     word_data: DictionaryWordCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Add a new word to dictionary"""
 
     clean_word = word_data.word.lower().strip()
 
-    # Check if word already exists
-    existing_word = (
-        db.query(DictionaryWord)
-        .filter(
-            DictionaryWord.user_id == current_user.id, DictionaryWord.word == clean_word
+    if word_data.book_id is not None:
+        await _check_word_source(db, current_user, word_data)
+
+    # Insert unless the word is already saved; the unique (user_id, word)
+    # index makes this safe against concurrent adds, in one round trip
+    dictionary_word = (
+        await db.scalars(
+            upsert_insert(db, DictionaryWord)
+            .values(
+                id=str(uuid.uuid4()),
+                user_id=current_user.id,
+                word=clean_word,
+                definition=word_data.definition,
+                context=word_data.context,
+                book_id=word_data.book_id,
+                page_index=word_data.page_index,
+                char_offset=word_data.char_offset,
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "word"])
+            .returning(DictionaryWord)
         )
-        .first()
-    )
+    ).first()
 
-    if existing_word:
+    if dictionary_word is None:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Word already exists in your dictionary",
         )
 
-    # Create new dictionary word
-    dictionary_word = DictionaryWord(
-        id=str(uuid.uuid4()),
-        user_id=current_user.id,
-        word=clean_word,
-        definition=word_data.definition,
-        context=word_data.context,
-    )
-
-    db.add(dictionary_word)
-    db.commit()
-    db.refresh(dictionary_word)
+    await db.commit()
+    word_index.invalidate(current_user.id)
 
     return dictionary_word
 
 
 @router.delete("/{word_id}", status_code=status.HTTP_204_NO_CONTENT)
-def remove_word_from_dictionary(
+async def remove_word_from_dictionary(
     word_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Remove a word from dictionary"""
 
-    word = (
-        db.query(DictionaryWord)
-        .filter(DictionaryWord.id == word_id, DictionaryWord.user_id == current_user.id)
-        .first()
+    word = await db.scalar(
+        select(DictionaryWord).where(
+            DictionaryWord.id == word_id, DictionaryWord.user_id == current_user.id
+        )
     )
 
     if not word:
@@ -114,29 +365,181 @@ def remove_word_from_dictionary(
             status_code=status.HTTP_404_NOT_FOUND, detail="Word not found in dictionary"
         )
 
-    db.delete(word)
-    db.commit()
+    await db.delete(word)
+    await db.commit()
+    word_index.invalidate(current_user.id)
 
     return None
 
 
 @router.get("/check/{word}", response_model=WordExistsResponse)
-def check_word_in_dictionary(
+async def check_word_in_dictionary(
     word: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Check if a word exists in the dictionary"""
 
     clean_word = word.lower().strip()
 
-    exists = (
-        db.query(DictionaryWord)
-        .filter(
-            DictionaryWord.user_id == current_user.id, DictionaryWord.word == clean_word
+    exists = await word_index.contains(db, current_user.id, clean_word)
+
+    return WordExistsResponse(exists=exists, word=clean_word)
+
+
+async def _get_page(db: AsyncSession, user: Principal, check: WordsCheckRequest) -> str:
+    """Text of the book page named by a check request"""
+    if is_sample_book(check.book_id):
+        content = SAMPLE_BOOK_CONTENT
+    else:
+        content = await db.scalar(
+            select(Book.content).where(
+                Book.id == check.book_id, Book.user_id == user.id
+            )
+        )
+        if content is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Book not found"
+            )
+
+    if check.page_index >= len(content):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid page number. Book has {len(content)} pages",
+        )
+    return content[check.page_index]
+
+
+@router.post("/check", response_model=WordsCheckResponse)
+async def check_words_in_dictionary(
+    check: WordsCheckRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Check which of a batch of words are saved in the dictionary
+
+    Takes either a list of words or a book page (bookId + pageIndex) and
+    answers from the in-memory word index (one indexed query to load it), so
+    a reader can highlight every saved word on a page in a single request.
+    """
+    if check.words is not None:
+        words = set()
+        for word in check.words:
+            # Stored words are lower()/strip()ped; also match the text a
+            # reader selected with its punctuation and possessives removed
+            words.update(w for w in (word.lower().strip(), normalize_word(word)) if w)
+    else:
+        words = set(extract_words(await _get_page(db, current_user, check)))
+
+    saved = await word_index.saved_subset(db, current_user.id, words)
+    return WordsCheckResponse(saved=sorted(saved))
+
+
+@router.post("/import", response_model=DictionaryImportResponse)
+async def import_dictionary(
+    file: UploadFile = File(...),
+    file_format: str | None = Query(
+        default=None, alias="format", pattern="^(csv|anki|ndjson)$"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Bulk import words from a CSV, Anki or NDJSON file
+
+    The file is parsed as a stream and handled in batches: each batch is
+    checked against the saved words with one IN query and inserted with one
+    executemany. Words already saved (or repeated in the file) are skipped,
+    and the import is committed as a whole.
+    """
+    if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File too large. Maximum file size is {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB",
+        )
+
+    try:
+        rows = read_words(file.file, file_format or detect_format(file.filename))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    result = DictionaryImportResponse(imported=0, duplicates=0, invalid=0)
+    seen: set[str] = set()
+    batch: list[ImportedWord] = []
+
+    async def flush():
+        saved = await db.run_sync(
+            find_saved_words, current_user.id, {item.word for item in batch}
         )
-        .first()
-        is not None
+        new_words = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": current_user.id,
+                "word": item.word,
+                "definition": item.definition,
+                "context": item.context,
+            }
+            for item in batch
+            if item.word not in saved
+        ]
+        if new_words:
+            # A word added concurrently since the check is skipped, not an error
+            await db.execute(
+                upsert_insert(db, DictionaryWord).on_conflict_do_nothing(
+                    index_elements=["user_id", "word"]
+                ),
+                new_words,
+            )
+        result.imported += len(new_words)
+        result.duplicates += len(batch) - len(new_words)
+        batch.clear()
+
+    for row in rows:
+        if isinstance(row, InvalidRowError):
+            result.invalid += 1
+            if len(result.errors) < MAX_IMPORT_ERRORS:
+                result.errors.append(str(row))
+        elif row.word in seen:
+            result.duplicates += 1
+        else:
+            seen.add(row.word)
+            batch.append(row)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await flush()
+
+    if batch:
+        await flush()
+    await db.commit()
+    word_index.invalidate(current_user.id)
+
+    return result
+
+
+@router.get("/export")
+async def export_dictionary(
+    file_format: str = Query(
+        default="csv", alias="format", pattern="^(csv|anki|ndjson)$"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Export the dictionary as CSV, Anki (tab-separated) or NDJSON
+
+    Rows are streamed from the database in batches and written out as they
+    arrive, so the whole dictionary is never held in memory.
+    """
+    words = await db.stream_scalars(
+        select(DictionaryWord)
+        .where(DictionaryWord.user_id == current_user.id)
+        .order_by(DictionaryWord.added_at.asc(), DictionaryWord.id.asc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
     )
+    filename = f"dictionary.{FILE_EXTENSIONS[file_format]}"
 
-    return WordExistsResponse(exists=exists, word=clean_word)
+    return StreamingResponse(
+        write_words_async(words, file_format, chunk_rows=EXPORT_BATCH_SIZE),
+        media_type=MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
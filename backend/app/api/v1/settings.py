@@ -1,35 +1,59 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings as app_settings
-from app.core.security import get_current_user
-from app.db.database import get_db
-from app.models.settings import ReadingMode, UserSettings
-from app.models.user import User
+from app.core.security import Principal, get_current_principal
+from app.db.database import get_async_db, upsert_insert
+from app.models.settings import DEFAULT_SETTINGS, UserSettings
 from app.schemas.settings import UserSettingsResponse, UserSettingsUpdate
 
 router = APIRouter()
 
 
+async def _upsert_settings(
+    db: AsyncSession, user_id: str, changes: dict
+) -> UserSettings:
+    """
+    Create the user's settings with defaults (plus changes) or apply changes
+    to the existing row, in one statement that is safe under concurrency
+    """
+    insert_settings = upsert_insert(db, UserSettings).values(
+        user_id=user_id, **{**DEFAULT_SETTINGS, **changes}
+    )
+    if changes:
+        set_ = {**changes, "updated_at": datetime.utcnow()}
+    else:
+        # No-op update so the existing row is returned
+        set_ = {"user_id": insert_settings.excluded.user_id}
+
+    settings = (
+        await db.scalars(
+            insert_settings.on_conflict_do_update(index_elements=["user_id"], set_=set_)
+            .returning(UserSettings)
+            .execution_options(populate_existing=True)
+        )
+    ).one()
+    await db.commit()
+    return settings
+
+
 @router.get("", response_model=UserSettingsResponse)
-def get_settings(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def get_settings(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get user settings"""
 
-    settings = (
-        db.query(UserSettings).filter(UserSettings.user_id == current_user.id).first()
+    settings = await db.scalar(
+        select(UserSettings).where(UserSettings.user_id == current_user.id)
     )
 
     # Create default settings if not exists
     if not settings:
-        settings = UserSettings(
-            user_id=current_user.id, timer_duration=5, reading_mode=ReadingMode.PAGE
-        )
-        db.add(settings)
-        db.commit()
-        db.refresh(settings)
+        settings = await _upsert_settings(db, current_user.id, {})
 
     # Add dev_mode from app settings
     response = UserSettingsResponse.model_validate(settings)
@@ -39,33 +63,15 @@ def get_settings(
 
 
 @router.patch("", response_model=UserSettingsResponse)
-def update_settings(
+async def update_settings(
     settings_update: UserSettingsUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Update user settings"""
 
-    settings = (
-        db.query(UserSettings).filter(UserSettings.user_id == current_user.id).first()
-    )
-
-    # Create if not exists
-    if not settings:
-        settings = UserSettings(
-            user_id=current_user.id, timer_duration=5, reading_mode=ReadingMode.PAGE
-        )
-        db.add(settings)
-
-    # Update fields
-    if settings_update.timer_duration is not None:
-        settings.timer_duration = settings_update.timer_duration
-
-    if settings_update.reading_mode is not None:
-        settings.reading_mode = settings_update.reading_mode
-
-    db.commit()
-    db.refresh(settings)
+    changes = settings_update.model_dump(exclude_none=True)
+    settings = await _upsert_settings(db, current_user.id, changes)
 
     # Add dev_mode from app settings
     response = UserSettingsResponse.model_validate(settings)
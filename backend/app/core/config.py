@@ -16,10 +16,49 @@ class Settings(BaseSettings):
     # Security
     SECRET_KEY: str = Field(default="your-secret-key-change-in-production")
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    # Access tokens are short-lived; sessions continue with rotating refresh tokens
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # Verified access tokens are cached for this long (bounded LRU) so
+    # authenticated requests skip the JWT decode and user lookup
+    AUTH_CACHE_TTL_SECONDS: int = Field(default=60)
+    AUTH_CACHE_MAX_ENTRIES: int = Field(default=10_000)
+    # Password hashing: bcrypt cost (pick with python -m app.core.passwords),
+    # dedicated worker threads and how many more hashes may wait for one
+    BCRYPT_ROUNDS: int = Field(default=12)
+    PASSWORD_HASH_WORKERS: int = Field(default=2)
+    PASSWORD_HASH_QUEUE_SIZE: int = Field(default=32)
+    # Failed sign-ins allowed per client IP and per email in each window
+    LOGIN_ATTEMPTS_PER_IP: int = Field(default=50)
+    LOGIN_ATTEMPTS_PER_EMAIL: int = Field(default=10)
+    LOGIN_ATTEMPT_WINDOW_SECONDS: int = Field(default=300)
+    # Token-bucket limits of expensive routes, "<requests>/<second|minute|hour>"
+    # per user (book upload) or per client IP (definition lookups)
+    RATE_LIMIT_ENABLED: bool = Field(default=True)
+    RATE_LIMITS: dict[str, str] = Field(
+        default={"upload_book": "10/minute", "definitions": "120/minute"}
+    )
+    RATE_LIMIT_SWEEP_SECONDS: int = Field(default=60)
+    # Reverse proxies (IPs or CIDR networks, comma-separated) whose
+    # X-Forwarded-For header names the client; "*" trusts whichever peer
+    # connects, for hosts only reachable through their proxy (e.g. Render)
+    TRUSTED_PROXIES: str = Field(default="127.0.0.1")
 
     # Database
     DATABASE_URL: str = Field(default="sqlite:///./greatreading.db")
+    # Connection pool (file databases and servers; in-memory SQLite keeps
+    # its single-connection pool)
+    DB_POOL_SIZE: int = Field(default=5)
+    DB_MAX_OVERFLOW: int = Field(default=10)
+    DB_POOL_TIMEOUT: int = Field(default=30)  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = Field(default=1800)  # seconds; -1 to never recycle
+    DB_POOL_PRE_PING: bool = Field(default=True)
+    # SQLite pragmas applied on every new connection. WAL lets readers run
+    # alongside a writer; NORMAL sync is durable across crashes in WAL mode
+    SQLITE_JOURNAL_MODE: str = Field(default="wal")
+    SQLITE_SYNCHRONOUS: str = Field(default="normal")
+    SQLITE_MMAP_SIZE: int = Field(default=256 * 1024 * 1024)
+    SQLITE_BUSY_TIMEOUT_MS: int = Field(default=5000)
 
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = Field(
@@ -35,6 +74,43 @@ class Settings(BaseSettings):
         default="https://api.dictionaryapi.dev/api/v2/entries/en"
     )
 
+    # In-memory index of saved words for existence checks: users kept, and
+    # dictionary size above which a Bloom filter replaces the exact set
+    WORD_INDEX_MAX_USERS: int = Field(default=1000)
+    WORD_INDEX_BLOOM_THRESHOLD: int = Field(default=50_000)
+    # Dictionary search: in-process trigram indexes kept (non-PostgreSQL
+    # databases) and minimum similarity of fuzzy matches
+    WORD_SEARCH_MAX_USERS: int = Field(default=100)
+    WORD_SEARCH_SIMILARITY: float = Field(default=0.3)
+    # Page annotation: per-user Aho–Corasick automata of saved words kept
+    WORD_ANNOTATION_MAX_USERS: int = Field(default=100)
+    # Seconds the structures above are used before checking, with one cheap
+    # query, whether another worker changed the user's words
+    WORD_CACHE_TTL: float = Field(default=5.0)
+
+    # Dictionary providers, tried in order: "local", "cache", "remote"
+    DICTIONARY_PROVIDERS: list[str] = Field(default=["local", "cache", "remote"])
+    LOCAL_DICTIONARY_PATH: str = Field(default="./data/dictionary.sqlite")
+    DEFINITION_CACHE_SIZE: int = 10_000
+    DEFINITION_CACHE_TTL: int = 60 * 60 * 24  # 1 day, then refreshed in background
+    DEFINITION_CACHE_MAX_STALE: int = 60 * 60 * 24 * 7  # served stale at most 7 days
+    DEFINITION_REFRESH_CONCURRENCY: int = 4
+
+    # Pre-warm definitions of a book's rarest words after upload
+    DEFINITION_PREWARM_ENABLED: bool = True
+    DEFINITION_PREWARM_TOP_K: int = 200
+    DEFINITION_PREWARM_RATE: float = 2.0  # upstream lookups per second
+
+    # Upstream dictionary API resilience
+    DICTIONARY_TIMEOUT_MIN: float = 1.0  # seconds
+    DICTIONARY_TIMEOUT_MAX: float = 10.0  # seconds
+    DICTIONARY_TIMEOUT_P99_MULTIPLIER: float = 3.0
+    DICTIONARY_MAX_RETRIES: int = 1
+    DICTIONARY_RETRY_BUDGET_RATIO: float = 0.1  # retries per request
+    DICTIONARY_HEDGING_ENABLED: bool = False
+    DICTIONARY_BREAKER_FAILURE_THRESHOLD: int = 5
+    DICTIONARY_BREAKER_RESET_TIMEOUT: float = 30.0  # seconds
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,452 @@
+"""
+In-process metrics exposed at GET /metrics in the Prometheus text format.
+
+Counters, gauges and histograms are updated on hot paths (every request,
+every SQL statement), so they take no lock: each thread adds into its own
+list of values and a scrape sums the lists of all threads. When a thread
+ends, its list is folded into a base total and dropped, so short-lived
+threads do not accumulate. A scrape may see an update half-applied (a
+histogram count without its sum), which the next scrape corrects; no update
+is ever lost.
+
+Metrics register themselves in ``registry`` when created. Besides the
+metrics defined here, services define their own next to the code they
+measure (PDF extraction, dictionary upstream and cache).
+"""
+
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Request and query latencies, in seconds
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _ThreadOwner:
+    """Kept in a thread's local storage, so it is freed when the thread ends"""
+
+    __slots__ = ("__weakref__",)
+
+
+class _Cells:
+    """
+    A fixed number of float values, summed over per-thread copies.
+
+    Only the owning thread writes to its copy, so ``+=`` needs no lock. When
+    the thread ends, its copy is added to ``_base`` and dropped; the lock
+    only guards that fold, new copies and scrapes, never an update.
+    """
+
+    __slots__ = ("size", "_local", "_shards", "_base", "_lock")
+
+    def __init__(self, size: int):
+        self.size = size
+        self._local = threading.local()
+        # Keyed by id so a fold removes that very list, not an equal one
+        self._shards: dict[int, list[float]] = {}
+        self._base = [0.0] * size
+        self._lock = threading.Lock()
+
+    def shard(self) -> list[float]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = [0.0] * self.size
+            owner = _ThreadOwner()
+            self._local.shard = shard
+            self._local.owner = owner
+            with self._lock:
+                self._shards[id(shard)] = shard
+            weakref.finalize(owner, self._fold, shard).atexit = False
+            return shard
+
+    def _fold(self, shard: list[float]) -> None:
+        with self._lock:
+            for index, value in enumerate(shard):
+                self._base[index] += value
+            del self._shards[id(shard)]
+
+    def totals(self) -> list[float]:
+        with self._lock:
+            totals = list(self._base)
+            for shard in self._shards.values():
+                for index, value in enumerate(shard):
+                    totals[index] += value
+        return totals
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in zip(names, values, strict=True)
+    )
+    return f"{{{pairs}}}" if pairs else ""
+
+
+class MetricsRegistry:
+    """Metrics rendered together by GET /metrics"""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: "Metric") -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name!r} is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class _Child:
+    """Values of a metric for one label set"""
+
+    __slots__ = ("_cells",)
+
+    def __init__(self, cells: _Cells):
+        self._cells = cells
+
+
+class Metric:
+    """
+    Base class of metrics with optional labels.
+
+    A metric without labels is updated directly; a labelled one through
+    ``labels(*values)``, which returns the child for that label set.
+    """
+
+    kind = "untyped"
+    child_class = _Child
+    cells = 1
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        registry: MetricsRegistry | None = registry,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], _Child] = {}
+        if not labelnames:
+            self._unlabelled = self._new_child()
+            self._children[()] = self._unlabelled
+        if registry is not None:
+            registry.register(self)
+
+    def _new_child(self) -> _Child:
+        return self.child_class(_Cells(self.cells))
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if not self.labelnames or len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} takes labels {self.labelnames}, got {values}"
+                )
+            # Two threads may race here; setdefault keeps a single child
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _series(self) -> list[tuple[tuple[str, ...], list[float]]]:
+        return [
+            (values, child._cells.totals())
+            for values, child in list(self._children.items())
+        ]
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, values)} "
+            f"{_format_value(totals[0])}"
+            for values, totals in self._series()
+        ]
+
+
+class _CounterChild(_Child):
+    __slots__ = ()
+
+    def inc(self, amount: float = 1) -> None:
+        self._cells.shard()[0] += amount
+
+
+class Counter(Metric):
+    """Monotonically increasing total"""
+
+    kind = "counter"
+    child_class = _CounterChild
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled.inc(amount)
+
+
+class _GaugeChild(_Child):
+    __slots__ = ()
+
+    def inc(self, amount: float = 1) -> None:
+        self._cells.shard()[0] += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self._cells.shard()[0] -= amount
+
+
+class Gauge(Metric):
+    """
+    Value that goes up and down.
+
+    Only relative updates are supported: a value set by one thread could not
+    be combined with increments made by others without a lock.
+    """
+
+    kind = "gauge"
+    child_class = _GaugeChild
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled.inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._unlabelled.dec(amount)
+
+
+class _HistogramChild(_Child):
+    __slots__ = ("_bounds",)
+
+    def __init__(self, cells: _Cells, bounds: tuple[float, ...]):
+        super().__init__(cells)
+        self._bounds = bounds
+
+    def observe(self, value: float) -> None:
+        shard = self._cells.shard()
+        shard[bisect_left(self._bounds, value)] += 1
+        shard[-1] += value
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values in cumulative buckets.
+
+    Each thread counts observations per bucket (upper bound inclusive, as
+    ``le`` means), plus one overflow bucket and the running sum; cumulative
+    counts are computed at scrape time.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        registry: MetricsRegistry | None = registry,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        # One cell per bucket, one for +Inf and one for the sum
+        self.cells = len(self.buckets) + 2
+        super().__init__(name, help, labelnames, registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(_Cells(self.cells), self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled.observe(value)
+
+    def samples(self) -> list[str]:
+        lines = []
+        for values, totals in self._series():
+            cumulative = 0.0
+            for bound, count in zip(
+                (*self.buckets, float("inf")), totals[:-1], strict=True
+            ):
+                cumulative += count
+                labels = _format_labels(
+                    (*self.labelnames, "le"), (*values, _format_value(float(bound)))
+                )
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(totals[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+class FunctionMetric(Metric):
+    """
+    Metric read from a function at scrape time, for values a service already
+    keeps (e.g. cache hits)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        function: Callable[[], float],
+        kind: str = "gauge",
+        registry: MetricsRegistry | None = registry,
+    ):
+        self.kind = kind
+        self.function = function
+        super().__init__(name, help, registry=registry)
+
+    def _new_child(self) -> _Child:
+        # Nothing is stored; the value is read at scrape time
+        return _Child(_Cells(0))
+
+    def _series(self) -> list[tuple[tuple[str, ...], list[float]]]:
+        return [((), [float(self.function())])]
+
+
+http_requests_total = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code",
+    ("method", "route", "status"),
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve HTTP requests, by route template",
+    ("method", "route"),
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"
+)
+db_query_duration_seconds = Histogram(
+    "db_query_duration_seconds",
+    "SQL statements executed and their duration, by operation",
+    ("operation",),
+)
+
+
+def _route_template(scope) -> str:
+    """
+    Path template of the route that served the request, e.g.
+    ``/api/v1/books/{book_id}``, or "unmatched".
+
+    The router records the matched route in the shared scope. Routes of
+    included routers may only know their own part of the path ("/{book_id}"),
+    so the prefix is taken from the request path.
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if path_format is None:
+        return "unmatched"
+    path = scope["path"]
+    try:
+        suffix = path_format.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return path_format
+    if not path.endswith(suffix):
+        return path_format
+    return path[: len(path) - len(suffix)] + path_format
+
+
+HTTP_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"})
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting and timing HTTP requests.
+
+    Requests are labelled with the route template (``/api/v1/books/{book_id}``)
+    rather than the path, so label sets stay bounded; requests that match no
+    route share the "unmatched" label, and methods outside HTTP_METHODS the
+    "other" label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            route = _route_template(scope)
+            method = scope["method"]
+            if method not in HTTP_METHODS:
+                method = "other"
+            http_request_duration_seconds.labels(method, route).observe(elapsed)
+            http_requests_total.labels(method, route, str(status)).inc()
+
+
+DB_OPERATIONS = frozenset(
+    {"select", "insert", "update", "delete", "with", "pragma", "create", "drop"}
+)
+
+
+@lru_cache(maxsize=1024)
+def _operation(statement: str) -> str:
+    # Statements are compiled once and reused, so this is mostly a cache hit
+    words = statement.lstrip()[:8].split(None, 1)
+    operation = words[0].lower() if words else ""
+    return operation if operation in DB_OPERATIONS else "other"
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time every statement executed on engine (the sync_engine of an
+    AsyncEngine) into db_query_duration_seconds
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started
+        db_query_duration_seconds.labels(_operation(statement)).observe(elapsed)
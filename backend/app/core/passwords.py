@@ -0,0 +1,191 @@
+"""
+Password hashing off the request threadpool, with login-storm protection.
+
+bcrypt costs 100-300 ms of CPU per hash or verify. Running it in sync
+endpoints ties up Starlette's shared threadpool, so a burst of logins
+stalls every other sync endpoint. Hashing runs in a small dedicated
+executor instead. Once its queue is full, new requests are refused
+(503) rather than queued without bound. Failed logins are throttled per
+client IP and per email (429).
+
+Pick BCRYPT_ROUNDS for the host with:
+    uv run python -m app.core.passwords --target-ms 250
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.hash import bcrypt
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 16
+
+
+class PasswordHasherBusyError(ValueError):
+    """Too many password hashes are already running or queued"""
+
+
+class PasswordHasher:
+    """Bounded executor for bcrypt hashing and verification"""
+
+    def __init__(self, workers: int | None = None, queue_size: int | None = None):
+        self.workers = workers or settings.PASSWORD_HASH_WORKERS
+        queue_size = (
+            queue_size if queue_size is not None else settings.PASSWORD_HASH_QUEUE_SIZE
+        )
+        self.max_pending = self.workers + queue_size
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Hashes running or waiting for a worker"""
+        return self._pending
+
+    async def _run(self, func, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordHasherBusyError(
+                    "Too many sign-in requests, please retry shortly"
+                )
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password in the bcrypt executor.
+
+        Raises:
+            PasswordHasherBusyError: If the executor queue is full
+        """
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """
+        Verify a password in the bcrypt executor.
+
+        Raises:
+            PasswordHasherBusyError: If the executor queue is full
+        """
+        return await self._run(verify_password, password, hashed_password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+class AttemptThrottle:
+    """
+    Fixed-window counter of failed attempts per key.
+
+    Keys are free-form ("ip:203.0.113.7", "email:a@example.com"); each key
+    may fail `limit` times per window of `window` seconds.
+    """
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._attempts: dict[str, tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def retry_after(self, key: str) -> int | None:
+        """Seconds until key may try again, or None if it is not throttled"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._attempts.get(key)
+            if entry is None:
+                return None
+            started, count = entry
+            if now - started >= self.window:
+                del self._attempts[key]
+                return None
+            if count < self.limit:
+                return None
+            return max(1, round(started + self.window - now))
+
+    def record_failure(self, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            # Drop expired windows so the table only holds recent offenders
+            if len(self._attempts) >= 10_000:
+                self._attempts = {
+                    k: v for k, v in self._attempts.items() if now - v[0] < self.window
+                }
+            started, count = self._attempts.get(key, (now, 0))
+            if now - started >= self.window:
+                started, count = now, 0
+            self._attempts[key] = (started, count + 1)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._attempts.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._attempts.clear()
+
+
+password_hasher = PasswordHasher()
+ip_throttle = AttemptThrottle(
+    settings.LOGIN_ATTEMPTS_PER_IP, settings.LOGIN_ATTEMPT_WINDOW_SECONDS
+)
+email_throttle = AttemptThrottle(
+    settings.LOGIN_ATTEMPTS_PER_EMAIL, settings.LOGIN_ATTEMPT_WINDOW_SECONDS
+)
+
+
+def calibrate_rounds(target_ms: float, samples: int = 3) -> tuple[int, float]:
+    """
+    Highest bcrypt cost whose hash takes at most target_ms on this host.
+
+    Returns:
+        The cost and its measured median hash time in milliseconds
+    """
+    best = (MIN_ROUNDS, 0.0)
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        hasher = bcrypt.using(rounds=rounds)
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            hasher.hash("calibration-password")
+            timings.append((time.perf_counter() - start) * 1000)
+        elapsed = sorted(timings)[len(timings) // 2]
+        if elapsed > target_ms:
+            break
+        best = (rounds, elapsed)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Pick the bcrypt cost for a target hash latency on this host"
+    )
+    parser.add_argument(
+        "--target-ms", type=float, default=250, help="Target time per hash"
+    )
+    args = parser.parse_args(argv)
+
+    rounds, elapsed = calibrate_rounds(args.target_ms)
+    print(f"BCRYPT_ROUNDS={rounds}  # {elapsed:.0f} ms per hash on this host")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Token-bucket rate limiting for expensive endpoints.
+
+Each limited route names a rule in settings.RATE_LIMITS, written as
+"<requests>/<second|minute|hour>". A client may burst up to <requests>
+calls; tokens then refill evenly over the period. Clients are told when to
+retry with a Retry-After header on the 429 response.
+
+Buckets live in a RateLimitBackend. The default one keeps them in process
+memory and sweeps idle keys periodically; a shared store (e.g. Redis) can
+be plugged in with set_rate_limit_backend() when running several workers.
+"""
+
+import ipaddress
+import math
+import threading
+import time
+from functools import lru_cache
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.security import Principal, get_current_principal
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+
+
+@lru_cache(maxsize=64)
+def parse_rate_limit(rule: str) -> tuple[float, float]:
+    """
+    Parse a "<requests>/<period>" rule.
+
+    Returns:
+        Bucket capacity and refill rate in tokens per second
+
+    Raises:
+        ValueError: If the rule is malformed
+    """
+    try:
+        count, period = rule.split("/")
+        capacity = int(count)
+        seconds = PERIODS[period.strip()]
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid rate limit rule: {rule!r}")
+    if capacity <= 0:
+        raise ValueError(f"Invalid rate limit rule: {rule!r}")
+    return float(capacity), capacity / seconds
+
+
+class RateLimitBackend:
+    """Storage of token buckets"""
+
+    def acquire(self, key: str, capacity: float, rate: float) -> float:
+        """
+        Take one token from the bucket of key.
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Token buckets in a dict of key -> (tokens, last update).
+
+    A bucket idle long enough to have refilled completely is equivalent to
+    no bucket at all, so such keys are dropped every sweep_interval seconds
+    and memory stays proportional to recently active clients.
+    """
+
+    def __init__(self, sweep_interval: float | None = None):
+        self.sweep_interval = (
+            sweep_interval
+            if sweep_interval is not None
+            else settings.RATE_LIMIT_SWEEP_SECONDS
+        )
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._full_after: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def acquire(self, key: str, capacity: float, rate: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now)
+
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / rate
+
+            tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._full_after[key] = now + (capacity - tokens) / rate
+            return 0.0
+
+    def _sweep(self, now: float) -> None:
+        idle = [key for key, full in self._full_after.items() if full <= now]
+        for key in idle:
+            del self._buckets[key]
+            del self._full_after[key]
+        self._last_sweep = now
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._full_after.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+_backend: RateLimitBackend = InMemoryRateLimitBackend()
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    return _backend
+
+
+def set_rate_limit_backend(backend: RateLimitBackend) -> None:
+    """Replace the bucket store, e.g. with one shared between workers"""
+    global _backend
+    _backend = backend
+
+
+@lru_cache(maxsize=8)
+def _trusted_proxies(value: str) -> tuple[bool, frozenset[str], tuple]:
+    """Parse TRUSTED_PROXIES into (any peer, literal hosts, networks)"""
+    entries = [entry.strip() for entry in value.split(",") if entry.strip()]
+    literals = set()
+    networks = []
+    for entry in entries:
+        try:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+        except ValueError:
+            literals.add(entry)
+    return "*" in literals, frozenset(literals - {"*"}), tuple(networks)
+
+
+def _is_trusted(host: str, any_peer: bool = False) -> bool:
+    trust_all, literals, networks = _trusted_proxies(settings.TRUSTED_PROXIES)
+    if any_peer and trust_all:
+        return True
+    if host in literals:
+        return True
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+def client_ip(request: Request) -> str:
+    """
+    IP address of the client that sent the request.
+
+    Behind a reverse proxy every connection comes from the proxy, so when
+    the peer is one of settings.TRUSTED_PROXIES the client is taken from
+    X-Forwarded-For instead: the rightmost address that is not itself a
+    trusted proxy. Addresses further left were supplied by the client and
+    could be forged.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted(peer, any_peer=True):
+        return peer
+
+    forwarded = [
+        address.strip()
+        for header in request.headers.getlist("x-forwarded-for")
+        for address in header.split(",")
+        if address.strip()
+    ]
+    for address in reversed(forwarded):
+        if not _is_trusted(address):
+            return address
+    return forwarded[0] if forwarded else peer
+
+
+class RateLimit:
+    """
+    Dependencies that limit a route per client IP or per user.
+
+    Usage:
+        @router.post("", dependencies=[Depends(RateLimit("upload_book").by_user)])
+
+    Routes whose rule is missing from settings.RATE_LIMITS are not limited.
+    """
+
+    def __init__(self, route: str):
+        self.route = route
+
+    def _check(self, subject: str) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        rule = settings.RATE_LIMITS.get(self.route)
+        if rule is None:
+            return
+        capacity, rate = parse_rate_limit(rule)
+        wait = _backend.acquire(f"{self.route}:{subject}", capacity, rate)
+        if wait > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded, please retry later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+    async def by_ip(self, request: Request) -> None:
+        """Limit requests per client IP"""
+        self._check(f"ip:{client_ip(request)}")
+
+    async def by_user(
+        self, current_user: Principal = Depends(get_current_principal)
+    ) -> None:
+        """Limit requests per authenticated user"""
+        self._check(f"user:{current_user.id}")
@@ -1,3 +1,9 @@
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -5,17 +11,27 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+# For endpoints where the access token is one of several ways to authenticate
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl="/api/v1/auth/login", auto_error=False
+)
 
 
-def create_access_token(subject: str | Any, expires_delta: timedelta = None) -> str:
-    """Create JWT access token"""
+def create_access_token(
+    subject: str | Any, expires_delta: timedelta = None, token_version: int = 0
+) -> str:
+    """Create JWT access token, valid while the user's token_version is unchanged"""
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -23,13 +39,23 @@ def create_access_token(subject: str | Any, expires_delta: timedelta = None) ->
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "sub": str(subject), "ver": token_version}
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
     return encoded_jwt
 
 
+def create_refresh_token() -> str:
+    """Create an opaque refresh token"""
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    """Digest under which a refresh token is stored and looked up"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -40,15 +66,138 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-):
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated user identity, available without loading the User row"""
+
+    id: str
+    email: str
+
+
+class PrincipalCache:
     """
-    Dependency to get the current authenticated user from JWT token.
-    Returns the User object.
+    Bounded TTL cache of verified access token -> Principal.
+
+    Entries expire after AUTH_CACHE_TTL_SECONDS or when the token itself
+    expires, whichever comes first. invalidate_user() drops every cached
+    token of a user, so changes to the user take effect immediately.
+    """
+
+    def __init__(self, max_entries: int | None = None, ttl: float | None = None):
+        self.max_entries = max_entries or settings.AUTH_CACHE_MAX_ENTRIES
+        self.ttl = ttl if ttl is not None else settings.AUTH_CACHE_TTL_SECONDS
+        self._entries: OrderedDict[str, tuple[Principal, float]] = OrderedDict()
+        self._tokens_by_user: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Principal | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            principal, deadline = entry
+            if time.monotonic() >= deadline:
+                self._remove(token)
+                return None
+            self._entries.move_to_end(token)
+            return principal
+
+    def put(self, token: str, principal: Principal, token_expires_at: float) -> None:
+        """Cache a verified token; token_expires_at is its exp claim"""
+        # exp is wall-clock time, deadlines are kept on the monotonic clock
+        lifetime = min(self.ttl, token_expires_at - time.time())
+        if lifetime <= 0:
+            return
+        with self._lock:
+            self._remove(token)
+            self._entries[token] = (principal, time.monotonic() + lifetime)
+            self._tokens_by_user.setdefault(principal.id, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Forget every cached token of a user"""
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[0].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[0].id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TokenVersionCache:
+    """
+    Bounded LRU of user id -> token_version.
+
+    Access tokens carry the version they were issued under. Knowing the
+    current version lets a revoked token be rejected before any query.
+    """
+
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries = max_entries or settings.AUTH_CACHE_MAX_ENTRIES
+        self._versions: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> int | None:
+        with self._lock:
+            version = self._versions.get(user_id)
+            if version is not None:
+                self._versions.move_to_end(user_id)
+            return version
+
+    def set(self, user_id: str, version: int) -> None:
+        with self._lock:
+            # Versions only grow; never let a stale read lower one
+            self._versions[user_id] = max(version, self._versions.get(user_id, 0))
+            self._versions.move_to_end(user_id)
+            while len(self._versions) > self.max_entries:
+                self._versions.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+
+
+principal_cache = PrincipalCache()
+token_versions = TokenVersionCache()
+
+
+def revoke_access_tokens(user_id: str, token_version: int) -> None:
+    """Reject the user's access tokens issued before token_version"""
+    token_versions.set(user_id, token_version)
+    principal_cache.invalidate_user(user_id)
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """
+    Dependency to get the identity of the authenticated user.
+
+    Served from the token cache on repeat requests, with no JWT decode and
+    no database access; use it for endpoints that only need the user id.
     """
     from app.models.user import User
 
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -65,8 +214,45 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
+    # Revoked tokens are rejected from memory, without a query
+    version = payload.get("ver", 0)
+    known_version = token_versions.get(user_id)
+    if known_version is not None and version < known_version:
+        raise credentials_exception
+
+    row = (
+        await db.execute(
+            select(User.id, User.email, User.token_version).where(User.id == user_id)
+        )
+    ).first()
+    if row is None:
         raise credentials_exception
+    token_versions.set(row.id, row.token_version)
+    if version < row.token_version:
+        raise credentials_exception
+
+    principal = Principal(id=row.id, email=row.email)
+    principal_cache.put(token, principal, payload.get("exp", float("inf")))
+    return principal
+
+
+def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    """
+    Dependency to get the current authenticated user from JWT token.
+    Returns the User object.
+    """
+    from app.models.user import User
+
+    user = db.get(User, principal.id)
+    if user is None:
+        principal_cache.invalidate_user(principal.id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     return user
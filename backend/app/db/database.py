@@ -1,18 +1,114 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+
+
+def sqlite_pragmas() -> dict[str, str | int]:
+    """SQLite pragmas from settings, applied to every new connection"""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+
+
+# Async drivers used for each backend by the async engine
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_database_url(url: str) -> URL:
+    """The same database as url, addressed through its async driver"""
+    database_url = make_url(url)
+    backend = database_url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise NotImplementedError(f"No async driver configured for {backend}")
+    return database_url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def _engine_options(url: URL, options: dict) -> dict:
+    """Pool settings from settings, unless given or not applicable"""
+    is_sqlite = url.get_backend_name() == "sqlite"
+    in_memory = is_sqlite and url.database in (None, "", ":memory:")
+
+    if is_sqlite:
+        options.setdefault("connect_args", {"check_same_thread": False})
+    if not in_memory and "poolclass" not in options:
+        options.setdefault("pool_size", settings.DB_POOL_SIZE)
+        options.setdefault("max_overflow", settings.DB_MAX_OVERFLOW)
+        options.setdefault("pool_timeout", settings.DB_POOL_TIMEOUT)
+        options.setdefault("pool_recycle", settings.DB_POOL_RECYCLE)
+    options.setdefault("pool_pre_ping", settings.DB_POOL_PRE_PING)
+    return options
+
+
+def _set_sqlite_pragmas(engine: Engine, pragmas: dict[str, str | int]) -> None:
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}
-    if "sqlite" in settings.DATABASE_URL
-    else {},
-)
+
+def create_db_engine(
+    url: str, pragmas: dict[str, str | int] | None = None, **options
+) -> Engine:
+    """
+    Engine with the pool settings from settings.
+
+    SQLite connections get the given pragmas (sqlite_pragmas() by default)
+    on connect. In-memory SQLite databases live in a single connection, so
+    they keep SQLAlchemy's default pool and no pool sizing applies. Every
+    statement is timed into the db_query_duration_seconds metric.
+    """
+    database_url = make_url(url)
+    engine = create_engine(database_url, **_engine_options(database_url, options))
+    if database_url.get_backend_name() == "sqlite":
+        _set_sqlite_pragmas(engine, sqlite_pragmas() if pragmas is None else pragmas)
+    instrument_engine(engine)
+    return engine
+
+
+def create_async_db_engine(
+    url: str, pragmas: dict[str, str | int] | None = None, **options
+) -> AsyncEngine:
+    """
+    Async engine for the database at url (aiosqlite / asyncpg), configured
+    like create_db_engine()
+    """
+    database_url = async_database_url(url)
+    engine = create_async_engine(database_url, **_engine_options(database_url, options))
+    if database_url.get_backend_name() == "sqlite":
+        _set_sqlite_pragmas(
+            engine.sync_engine, sqlite_pragmas() if pragmas is None else pragmas
+        )
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+engine = create_db_engine(settings.DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Request handlers of the books, dictionary and settings routers wait on the
+# database without holding a threadpool thread
+async_engine = create_async_db_engine(settings.DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -23,3 +119,23 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def upsert_insert(db: Session | AsyncSession, model):
+    """
+    INSERT construct for the session's database that supports
+    ``on_conflict_do_nothing`` / ``on_conflict_do_update`` (SQLite and
+    PostgreSQL share the same API)
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"Upserts are not supported on {dialect}")
@@ -1,17 +1,40 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.api.v1 import api_router
 from app.core.config import settings
-from app.db.database import Base, engine
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.core.passwords import password_hasher
+from app.db.database import async_engine, engine
+from app.services.dictionary_service import dictionary_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup and shutdown of the app.
+
+    Nothing is done at import time: the schema is migrated once per deploy
+    (alembic upgrade head), and database connections, HTTP clients and heavy
+    modules such as pypdf are created on first use. Work that must run before
+    the first request goes before the yield. On shutdown the pooled
+    resources are released.
+    """
+    yield
+    await dictionary_service.aclose()
+    password_hasher.shutdown()
+    await async_engine.dispose()
+    engine.dispose()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Set up CORS - allow all origins in development
@@ -23,6 +46,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so the time spent in CORS handling is counted too
+app.add_middleware(MetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -41,3 +67,15 @@ async def root():
 async def health():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+
+@app.get("/health/dictionary")
+async def dictionary_health():
+    """Dictionary lookup metrics: circuit breaker state and upstream latency"""
+    return dictionary_service.metrics()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Request, database, PDF and dictionary metrics in the Prometheus text format"""
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
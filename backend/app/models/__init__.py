@@ -1,6 +1,14 @@
 from app.models.book import Book
 from app.models.dictionary import DictionaryWord
+from app.models.refresh_token import RefreshToken
 from app.models.settings import ReadingMode, UserSettings
 from app.models.user import User
 
-__all__ = ["Book", "DictionaryWord", "UserSettings", "ReadingMode", "User"]
+__all__ = [
+    "Book",
+    "DictionaryWord",
+    "RefreshToken",
+    "UserSettings",
+    "ReadingMode",
+    "User",
+]
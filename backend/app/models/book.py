@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from app.db.database import Base
@@ -10,11 +10,13 @@ class Book(Base):
     """Book model for storing uploaded PDF books"""
 
     __tablename__ = "books"
+    __table_args__ = (
+        # One book per name and user; also the target of upload's upsert
+        Index("ix_books_user_name", "user_id", "name", unique=True),
+    )
 
-    id = Column(String, primary_key=True, index=True)
-    user_id = Column(
-        String, index=True, nullable=False
-    )  # For future multi-user support
+    id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=False)  # For future multi-user support
     name = Column(String, nullable=False)
     content = Column(JSON, nullable=False)  # Array of page contents
     current_page = Column(Integer, default=0, nullable=False)
@@ -1,18 +1,71 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, String, Text
+from sqlalchemy import (
+    DDL,
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+)
 
 from app.db.database import Base
 
 
 class DictionaryWord(Base):
     __tablename__ = "dictionary_words"
+    __table_args__ = (
+        # One index per sort order of GET /dictionary, so keyset pages are a
+        # single index range scan. Both also serve plain user_id lookups.
+        Index("ix_dictionary_words_user_added", "user_id", "added_at", "id"),
+        # Also the unique constraint behind ON CONFLICT (user_id, word)
+        Index("ix_dictionary_words_user_word", "user_id", "word", unique=True),
+        # Words saved from a book, in reading order
+        Index(
+            "ix_dictionary_words_user_book",
+            "user_id",
+            "book_id",
+            "page_index",
+            "char_offset",
+        ),
+        # Review queue: due cards are one range scan
+        Index("ix_dictionary_words_user_due", "user_id", "due_at"),
+        # Fuzzy search on PostgreSQL (pg_trgm); other databases use an
+        # in-process trigram index
+        Index(
+            "ix_dictionary_words_word_trgm",
+            "word",
+            postgresql_using="gin",
+            postgresql_ops={"word": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
-    id = Column(String, primary_key=True, index=True)
-    user_id = Column(
-        String, index=True, nullable=False
-    )  # For future multi-user support
-    word = Column(String, nullable=False, index=True)
+    id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=False)  # For future multi-user support
+    word = Column(String, nullable=False)
     definition = Column(Text, nullable=False)
     context = Column(Text, nullable=True)
     added_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Where the word was saved from; no foreign key since the sample book
+    # only exists in code. Removed together with the book in delete_book.
+    book_id = Column(String, nullable=True)
+    page_index = Column(Integer, nullable=True)
+    char_offset = Column(Integer, nullable=True)
+
+    # Spaced-repetition (SM-2) review state; new words are due immediately
+    due_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    interval_days = Column(Integer, default=0, nullable=False)
+    ease = Column(Float, default=2.5, nullable=False)
+    repetitions = Column(Integer, default=0, nullable=False)
+    reviewed_at = Column(DateTime, nullable=True)
+
+
+event.listen(
+    DictionaryWord.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,36 @@
+"""Refresh token model for long-lived sessions"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, String
+
+from app.db.database import Base
+
+# Values of RefreshToken.revoked_reason
+REVOKED_ROTATED = "rotated"
+REVOKED_LOGOUT = "logout"
+
+
+class RefreshToken(Base):
+    """
+    Rotating refresh token of a session.
+
+    Only the SHA-256 of the token is stored. A token is used once: refreshing
+    marks it revoked and issues its successor, and presenting a rotated token
+    again is treated as theft and ends every session of the user. A token
+    revoked by logout is only rejected.
+    """
+
+    __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        Index("ix_refresh_tokens_token_hash", "token_hash", unique=True),
+        Index("ix_refresh_tokens_user_expires", "user_id", "expires_at"),
+    )
+
+    id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=False)
+    token_hash = Column(String(64), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    revoked_reason = Column(String(16), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
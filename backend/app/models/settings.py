@@ -11,6 +11,10 @@ class ReadingMode(str, enum.Enum):
     SENTENCE = "sentence"
 
 
+# Settings of users who never changed them; not stored until they do
+DEFAULT_SETTINGS = {"timer_duration": 5, "reading_mode": ReadingMode.PAGE}
+
+
 class UserSettings(Base):
     """User settings model"""
 
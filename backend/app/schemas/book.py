@@ -2,6 +2,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.schemas.dictionary import DictionaryWordResponse
+
 
 class BookBase(BaseModel):
     """Base schema for Book"""
@@ -40,7 +42,52 @@ class BookResponse(BookBase):
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
+class BookSummary(BookBase):
+    """Schema for book metadata without page content"""
+
+    id: str
+    current_page: int = Field(..., ge=0, serialization_alias="currentPage")
+    total_pages: int = Field(..., gt=0, serialization_alias="totalPages")
+    file_size: int = Field(..., serialization_alias="fileSize")
+    created_at: datetime = Field(..., serialization_alias="createdAt")
+    updated_at: datetime = Field(..., serialization_alias="updatedAt")
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
 class BookListResponse(BaseModel):
     """Schema for list of books response"""
 
     books: list[BookResponse]
+
+
+class BookWordsResponse(BaseModel):
+    """Schema for the dictionary words saved from a book, in reading order"""
+
+    book_id: str = Field(..., serialization_alias="bookId")
+    words: list[DictionaryWordResponse]
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class WordAnnotation(BaseModel):
+    """Schema for a saved word found at content[start:end] of a page"""
+
+    word: str
+    word_id: str = Field(..., serialization_alias="wordId")
+    start: int = Field(..., ge=0)
+    end: int = Field(..., gt=0)
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class BookPageResponse(BaseModel):
+    """Schema for one page of a book, optionally annotated"""
+
+    book_id: str = Field(..., serialization_alias="bookId")
+    page_index: int = Field(..., ge=0, serialization_alias="pageIndex")
+    total_pages: int = Field(..., gt=0, serialization_alias="totalPages")
+    content: str
+    annotations: list[WordAnnotation] | None = None
+
+    model_config = ConfigDict(populate_by_name=True)
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.book import BookSummary
+from app.schemas.settings import UserSettingsResponse
+from app.schemas.user import UserResponse
+
+
+class DictionarySummary(BaseModel):
+    """Schema for counts of the user's saved words"""
+
+    total: int = Field(..., ge=0)
+    due_for_review: int = Field(..., ge=0, serialization_alias="dueForReview")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BootstrapResponse(BaseModel):
+    """Schema for everything the app needs on start"""
+
+    user: UserResponse
+    settings: UserSettingsResponse
+    books: list[BookSummary]
+    dictionary: DictionarySummary
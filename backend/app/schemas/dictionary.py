@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class DictionaryWordBase(BaseModel):
@@ -14,6 +14,19 @@ class DictionaryWordCreate(DictionaryWordBase):
     """Schema for creating a dictionary word"""
 
     context: str | None = Field(None, max_length=500)
+    book_id: str | None = Field(None, validation_alias="bookId")
+    page_index: int | None = Field(None, ge=0, validation_alias="pageIndex")
+    char_offset: int | None = Field(None, ge=0, validation_alias="charOffset")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @model_validator(mode="after")
+    def check_source(self):
+        if self.book_id is None and (
+            self.page_index is not None or self.char_offset is not None
+        ):
+            raise ValueError("pageIndex and charOffset require bookId")
+        return self
 
 
 class DictionaryWordResponse(DictionaryWordBase):
@@ -22,17 +35,60 @@ class DictionaryWordResponse(DictionaryWordBase):
     id: str
     context: str | None = None
     added_at: datetime = Field(..., serialization_alias="addedAt")
+    book_id: str | None = Field(None, serialization_alias="bookId")
+    page_index: int | None = Field(None, serialization_alias="pageIndex")
+    char_offset: int | None = Field(None, serialization_alias="charOffset")
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
+class ReviewCardResponse(DictionaryWordResponse):
+    """Schema for a saved word with its review schedule"""
+
+    due_at: datetime = Field(..., serialization_alias="dueAt")
+    interval_days: int = Field(..., serialization_alias="intervalDays")
+    ease: float
+    repetitions: int
+    reviewed_at: datetime | None = Field(None, serialization_alias="reviewedAt")
+
+
+class ReviewQueueResponse(BaseModel):
+    """Schema for the next due review cards, most overdue first"""
+
+    cards: list[ReviewCardResponse]
+
+
+class ReviewGrade(BaseModel):
+    """Schema for grading one review card"""
+
+    word_id: str = Field(..., validation_alias="wordId")
+    grade: int = Field(..., ge=0, le=5)
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class ReviewBatchRequest(BaseModel):
+    """Schema for grading a batch of review cards"""
+
+    grades: list[ReviewGrade] = Field(..., min_length=1, max_length=500)
+
+
+class ReviewBatchResponse(BaseModel):
+    """Schema for graded cards with their new schedule"""
+
+    cards: list[ReviewCardResponse]
+
+
 class DictionaryListResponse(BaseModel):
     """Schema for list of dictionary words response"""
 
     words: list[DictionaryWordResponse]
-    total: int
+    total: int | None = None
     limit: int
     offset: int
+    next_cursor: str | None = Field(None, serialization_alias="nextCursor")
+
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class WordExistsResponse(BaseModel):
@@ -42,6 +98,45 @@ class WordExistsResponse(BaseModel):
     word: str
 
 
+class DictionarySearchResponse(BaseModel):
+    """Schema for dictionary search results, best match first"""
+
+    query: str
+    words: list[DictionaryWordResponse]
+
+
+class DictionaryImportResponse(BaseModel):
+    """Schema for bulk import result"""
+
+    imported: int
+    duplicates: int
+    invalid: int
+    errors: list[str] = Field(default_factory=list)
+
+
+class WordsCheckRequest(BaseModel):
+    """Schema for a batch saved-words check: either words or a book page"""
+
+    words: list[str] | None = Field(None, max_length=5000)
+    book_id: str | None = Field(None, validation_alias="bookId")
+    page_index: int | None = Field(None, ge=0, validation_alias="pageIndex")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @model_validator(mode="after")
+    def check_source(self):
+        has_page = self.book_id is not None and self.page_index is not None
+        if (self.words is not None) == has_page:
+            raise ValueError("Provide either words or bookId and pageIndex")
+        return self
+
+
+class WordsCheckResponse(BaseModel):
+    """Schema for batch saved-words check response"""
+
+    saved: list[str]
+
+
 class WordDefinitionItem(BaseModel):
     """Schema for a single word definition"""
 
@@ -59,6 +154,7 @@ class WordDefinitionResponse(BaseModel):
     definitions: list[WordDefinitionItem]
     phonetic: str | None = None
     audio_url: str | None = Field(None, serialization_alias="audioUrl")
+    redirected_from: str | None = Field(None, serialization_alias="redirectedFrom")
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -68,6 +164,7 @@ class WordPronunciationResponse(BaseModel):
 
     word: str
     audio_url: str = Field(..., serialization_alias="audioUrl")
+    cached_audio_url: str | None = Field(None, serialization_alias="cachedAudioUrl")
     phonetic: str | None = None
 
     model_config = ConfigDict(populate_by_name=True)
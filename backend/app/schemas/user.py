@@ -35,6 +35,21 @@ class Token(BaseModel):
 
     access_token: str
     token_type: str = "bearer"
+    refresh_token: str | None = None
+    expires_in: int | None = None  # access token lifetime in seconds
+
+
+class RefreshRequest(BaseModel):
+    """Schema for exchanging a refresh token for a new token pair"""
+
+    refresh_token: str = Field(..., min_length=1)
+
+
+class LogoutRequest(BaseModel):
+    """Schema for ending one session, or all of them"""
+
+    refresh_token: str | None = None
+    all_sessions: bool = False
 
 
 class TokenData(BaseModel):
@@ -0,0 +1,144 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+# Pronunciation clips are a few dozen KB; anything much larger is not audio
+# we want to store
+MAX_AUDIO_SIZE = 5 * 1024 * 1024  # 5MB
+
+
+class AudioService:
+    """
+    Content-addressed on-disk store for pronunciation audio.
+
+    Clips are downloaded once and stored under ``<UPLOAD_DIR>/audio``:
+    - ``objects/<sha256 of content>.mp3`` holds the audio itself, so the same
+      clip referenced by several words or URLs is stored once
+    - ``urls/<sha256 of source URL>`` records which object a URL resolved to
+    """
+
+    def __init__(
+        self,
+        root: str | Path | None = None,
+        transport: "httpx.AsyncBaseTransport | None" = None,
+    ):
+        self.root = Path(root or Path(settings.UPLOAD_DIR) / "audio")
+        self.transport = transport
+        # Download lock per URL, and how many requests hold or await it
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._waiters: dict[str, int] = {}
+
+    @staticmethod
+    def _digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self.root / "objects" / f"{content_hash}.mp3"
+
+    def _url_path(self, url: str) -> Path:
+        return self.root / "urls" / self._digest(url.encode())
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        """Write via a temporary file so readers never see a partial file"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def get_cached(self, url: str) -> Path | None:
+        """Path of the stored clip for a source URL, if already downloaded"""
+        url_path = self._url_path(url)
+        if not url_path.is_file():
+            return None
+
+        object_path = self._object_path(url_path.read_text().strip())
+        return object_path if object_path.is_file() else None
+
+    async def get_audio(self, url: str) -> Path:
+        """
+        Return the local path of the clip at url, downloading it on first use.
+
+        Concurrent requests for the same URL share a single download.
+
+        Raises:
+            ValueError: If the audio cannot be downloaded
+        """
+        cached = self.get_cached(url)
+        if cached is not None:
+            return cached
+
+        lock = self._locks.setdefault(url, asyncio.Lock())
+        self._waiters[url] = self._waiters.get(url, 0) + 1
+        try:
+            async with lock:
+                # Another request may have finished the download meanwhile
+                cached = self.get_cached(url)
+                if cached is not None:
+                    return cached
+                return await self._download(url)
+        finally:
+            # Drop the lock only once nobody waits on it; a request arriving
+            # later would otherwise create a second lock and download again
+            self._waiters[url] -= 1
+            if not self._waiters[url]:
+                del self._waiters[url]
+                del self._locks[url]
+
+    async def _download(self, url: str) -> Path:
+        import httpx
+
+        if not url.startswith(("https://", "http://")):
+            raise ValueError("Unsupported audio URL")
+
+        chunks = []
+        size = 0
+        try:
+            async with httpx.AsyncClient(transport=self.transport) as client:
+                async with client.stream(
+                    "GET", url, timeout=10.0, follow_redirects=True
+                ) as response:
+                    response.raise_for_status()
+                    # Stop reading as soon as the clip is over the limit
+                    # instead of buffering whatever the upstream sends
+                    async for chunk in response.aiter_bytes():
+                        size += len(chunk)
+                        if size > MAX_AUDIO_SIZE:
+                            raise ValueError("Audio file is too large")
+                        chunks.append(chunk)
+        except httpx.HTTPError as e:
+            raise ValueError(f"Failed to fetch audio: {str(e)}")
+
+        data = b"".join(chunks)
+        if not data:
+            raise ValueError("Audio file is empty")
+
+        return await run_in_threadpool(self._store, url, data)
+
+    def _store(self, url: str, data: bytes) -> Path:
+        """Write a downloaded clip and its URL record; blocking file I/O"""
+        content_hash = self._digest(data)
+        object_path = self._object_path(content_hash)
+        if not object_path.is_file():
+            self._write_atomic(object_path, data)
+        self._write_atomic(self._url_path(url), content_hash.encode())
+
+        return object_path
+
+
+audio_service = AudioService()
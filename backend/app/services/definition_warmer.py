@@ -0,0 +1,177 @@
+"""
+Definition pre-warming for newly uploaded books.
+
+After a book is extracted, its vocabulary is ranked by rarity against a
+bundled frequency list and the definitions of the hardest words are fetched
+into the definition cache at a low, rate-limited pace, so the first reader
+who taps them gets a cache hit. Ranking runs in the threadpool, so a long
+book does not block the event loop.
+"""
+
+import asyncio
+import re
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.dictionary_service import (
+    DictionaryService,
+    DictionaryUnavailableError,
+    RemoteDictionaryProvider,
+    dictionary_service,
+)
+from app.services.word_normalizer import WORD_PATTERN, lemmatize, normalize_word
+
+WORD_FREQUENCY_PATH = (
+    Path(__file__).resolve().parent.parent / "data" / "word_frequency.txt"
+)
+
+# Words within this many of the most common headwords are never pre-warmed
+COMMON_WORD_CUTOFF = 3000
+
+# Shapes English words don't have: a letter three times in a row, five
+# consonants in a row, or no vowel at all
+IMPLAUSIBLE_WORD = re.compile(r"(.)\1\1|[^aeiouy]{5}|^[^aeiouy]+$")
+
+# Letters OCR commonly reads in place of others ("rn" for "m", "tbe")
+OCR_CONFUSIONS = (("rn", "m"), ("li", "h"), ("ii", "u"), ("cl", "d"), ("b", "h"))
+
+
+@lru_cache(maxsize=1)
+def load_word_ranks() -> dict[str, int]:
+    """Frequency rank of each headword in the bundled list (1 = most common)"""
+    ranks = {}
+    with WORD_FREQUENCY_PATH.open(encoding="utf-8") as word_list:
+        for line in word_list:
+            word = line.strip()
+            if word and not word.startswith("#"):
+                ranks.setdefault(word, len(ranks) + 1)
+    return ranks
+
+
+def is_plausible_word(word: str, ranks: dict[str, int]) -> bool:
+    """
+    Whether a headword missing from the frequency list looks like a rare
+    English word rather than an OCR fragment
+    """
+    if IMPLAUSIBLE_WORD.search(word):
+        return False
+    return not any(
+        word.replace(misread, letters) in ranks
+        for misread, letters in OCR_CONFUSIONS
+        if misread in word
+    )
+
+
+def rank_vocabulary(pages: list[str], top_k: int) -> list[str]:
+    """
+    Pick the rarest headwords of a book.
+
+    Words among the COMMON_WORD_CUTOFF most frequent headwords, very short
+    words, words that only ever appear capitalized (likely names) and
+    unlisted words that look like OCR errors are skipped. The rest are
+    ordered rarest first, unlisted words before listed ones, then by how
+    often they occur in the book.
+
+    Args:
+        pages: Book content, one string per page
+        top_k: Maximum number of words to return
+
+    Returns:
+        Headwords to pre-warm, most valuable first
+    """
+    ranks = load_word_ranks()
+    unknown_rank = len(ranks) + 1
+    counts: Counter[str] = Counter()
+    lowercase_seen: set[str] = set()
+
+    for page in pages:
+        for token in WORD_PATTERN.findall(page):
+            surface = normalize_word(token)
+            if len(surface) < 4 or not surface.isalpha():
+                continue
+
+            lemma = lemmatize(surface)
+            counts[lemma] += 1
+            if token[0].islower():
+                lowercase_seen.add(lemma)
+
+    candidates = [
+        lemma
+        for lemma in counts
+        if lemma in lowercase_seen
+        and ranks.get(lemma, unknown_rank) > COMMON_WORD_CUTOFF
+        and (lemma in ranks or is_plausible_word(lemma, ranks))
+    ]
+    candidates.sort(key=lambda lemma: (-ranks.get(lemma, unknown_rank), -counts[lemma]))
+    return candidates[:top_k]
+
+
+class DefinitionWarmer:
+    """Prefetches definitions into the definition cache at a limited rate"""
+
+    def __init__(self, service: DictionaryService):
+        self.service = service
+        # One book is warmed at a time so warming never competes with itself
+        self._lock = asyncio.Lock()
+        self.warmed_total = 0
+        self.failed_total = 0
+
+    async def warm_words(self, words: list[str]) -> int:
+        """
+        Look up each word unless its definition is already cached.
+
+        Upstream lookups are spaced to DEFINITION_PREWARM_RATE per second;
+        words answered by the local dictionary are not throttled. Warming
+        stops early if the upstream becomes unavailable.
+
+        Returns:
+            Number of words fetched
+        """
+        interval = 1 / settings.DEFINITION_PREWARM_RATE
+        fetched = 0
+
+        async with self._lock:
+            for word in words:
+                if word in self.service.cache:
+                    continue
+
+                upstream_lookups = self._upstream_lookups()
+                try:
+                    await self.service.get_word_definition(word)
+                    fetched += 1
+                    self.warmed_total += 1
+                except DictionaryUnavailableError:
+                    # Don't add load to an upstream that is already struggling
+                    self.failed_total += 1
+                    break
+                except ValueError:
+                    self.failed_total += 1
+
+                if self._upstream_lookups() != upstream_lookups:
+                    await asyncio.sleep(interval)
+
+        return fetched
+
+    def _upstream_lookups(self) -> int:
+        return sum(
+            provider.lookups_total
+            for provider in self.service.providers
+            if isinstance(provider, RemoteDictionaryProvider)
+        )
+
+    async def warm_book(self, pages: list[str]) -> int:
+        """Pre-warm the hardest vocabulary of a book"""
+        if not settings.DEFINITION_PREWARM_ENABLED:
+            return 0
+
+        words = await run_in_threadpool(
+            rank_vocabulary, pages, settings.DEFINITION_PREWARM_TOP_K
+        )
+        return await self.warm_words(words)
+
+
+definition_warmer = DefinitionWarmer(dictionary_service)
@@ -0,0 +1,248 @@
+"""
+Import and export formats for the personal dictionary.
+
+Readers parse an uploaded file lazily, one row at a time, so a large import
+never sits in memory as a whole; writers turn a stream of dictionary words
+into chunks of text for a streaming response. Supported formats:
+
+- ``csv``: ``word,definition,context`` with an optional header row
+- ``anki``: Anki's tab-separated notes export (front, back, optional third
+  field as context); ``#`` header lines are skipped
+- ``ndjson``: one ``{"word", "definition", "context"}`` object per line
+"""
+
+import codecs
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from dataclasses import dataclass
+from typing import BinaryIO
+
+FORMATS = ("csv", "anki", "ndjson")
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "anki": "text/tab-separated-values",
+    "ndjson": "application/x-ndjson",
+}
+
+FILE_EXTENSIONS = {"csv": "csv", "anki": "txt", "ndjson": "ndjson"}
+
+_EXTENSION_FORMATS = {
+    ".csv": "csv",
+    ".txt": "anki",
+    ".tsv": "anki",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+
+# Same limits as DictionaryWordCreate
+MAX_WORD_LENGTH = 100
+MAX_DEFINITION_LENGTH = 1000
+MAX_CONTEXT_LENGTH = 500
+
+
+@dataclass
+class ImportedWord:
+    """A valid row of an import file"""
+
+    word: str
+    definition: str
+    context: str | None = None
+
+
+class InvalidRowError(ValueError):
+    """A row of an import file that cannot be imported"""
+
+    def __init__(self, row: int, reason: str):
+        super().__init__(f"Row {row}: {reason}")
+        self.row = row
+
+
+def detect_format(filename: str | None) -> str:
+    """
+    Guess the import format from a file name.
+
+    Raises:
+        ValueError: If the extension is not a known format
+    """
+    name = (filename or "").lower()
+    for extension, file_format in _EXTENSION_FORMATS.items():
+        if name.endswith(extension):
+            return file_format
+    raise ValueError(f"Cannot detect import format. Use one of: {', '.join(FORMATS)}")
+
+
+def _text_lines(stream: BinaryIO) -> Iterator[str]:
+    """Decode a binary stream line by line (UTF-8, BOM tolerated)"""
+    reader = codecs.getreader("utf-8-sig")(stream, errors="replace")
+    yield from reader
+
+
+def _clean(row: int, word, definition, context=None) -> ImportedWord:
+    word = word.lower().strip() if isinstance(word, str) else ""
+    definition = definition.strip() if isinstance(definition, str) else ""
+    context = (context.strip() or None) if isinstance(context, str) else None
+
+    if not word:
+        raise InvalidRowError(row, "missing word")
+    if not definition:
+        raise InvalidRowError(row, "missing definition")
+    if len(word) > MAX_WORD_LENGTH:
+        raise InvalidRowError(row, "word is too long")
+    if len(definition) > MAX_DEFINITION_LENGTH:
+        raise InvalidRowError(row, "definition is too long")
+    if context and len(context) > MAX_CONTEXT_LENGTH:
+        raise InvalidRowError(row, "context is too long")
+
+    return ImportedWord(word=word, definition=definition, context=context)
+
+
+def _read_delimited(
+    stream: BinaryIO, delimiter: str, comments: bool
+) -> Iterator[ImportedWord | InvalidRowError]:
+    lines = _text_lines(stream)
+    if comments:
+        lines = (line for line in lines if not line.startswith("#"))
+
+    columns = (0, 1, 2)
+    for index, row in enumerate(csv.reader(lines, delimiter=delimiter), start=1):
+        if not any(field.strip() for field in row):
+            continue
+
+        header = [field.strip().lower() for field in row]
+        if index == 1 and "word" in header and "definition" in header:
+            columns = (
+                header.index("word"),
+                header.index("definition"),
+                header.index("context") if "context" in header else None,
+            )
+            continue
+
+        fields = [row[i] if i is not None and i < len(row) else None for i in columns]
+        try:
+            yield _clean(index, *fields)
+        except InvalidRowError as e:
+            yield e
+
+
+def _read_ndjson(stream: BinaryIO) -> Iterator[ImportedWord | InvalidRowError]:
+    for index, line in enumerate(_text_lines(stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+            if not isinstance(entry, dict):
+                raise InvalidRowError(index, "expected a JSON object")
+            yield _clean(
+                index, entry.get("word"), entry.get("definition"), entry.get("context")
+            )
+        except InvalidRowError as e:
+            yield e
+        except json.JSONDecodeError:
+            yield InvalidRowError(index, "invalid JSON")
+
+
+def read_words(
+    stream: BinaryIO, file_format: str
+) -> Iterator[ImportedWord | InvalidRowError]:
+    """
+    Parse an import file lazily.
+
+    Yields an ImportedWord for each valid row and an InvalidRowError (rather
+    than raising) for each row that cannot be imported, so one bad row does
+    not abort the whole import.
+    """
+    if file_format == "csv":
+        return _read_delimited(stream, ",", comments=False)
+    if file_format == "anki":
+        return _read_delimited(stream, "\t", comments=True)
+    if file_format == "ndjson":
+        return _read_ndjson(stream)
+    raise ValueError(f"Unsupported format. Use one of: {', '.join(FORMATS)}")
+
+
+class _WordWriter:
+    """Serializes words into an in-memory buffer, header first"""
+
+    def __init__(self, file_format: str):
+        if file_format not in FORMATS:
+            raise ValueError(f"Unsupported format. Use one of: {', '.join(FORMATS)}")
+        self.file_format = file_format
+        self.buffer = io.StringIO()
+        self.writer = None
+        if file_format == "csv":
+            self.writer = csv.writer(self.buffer)
+            self.writer.writerow(["word", "definition", "context", "added_at"])
+        elif file_format == "anki":
+            self.buffer.write("#separator:tab\n#html:false\n")
+            self.writer = csv.writer(self.buffer, delimiter="\t", lineterminator="\n")
+
+    def write(self, word) -> None:
+        if self.file_format == "csv":
+            self.writer.writerow(
+                [
+                    word.word,
+                    word.definition,
+                    word.context or "",
+                    word.added_at.isoformat(),
+                ]
+            )
+        elif self.file_format == "anki":
+            self.writer.writerow([word.word, word.definition, word.context or ""])
+        else:
+            entry = {
+                "word": word.word,
+                "definition": word.definition,
+                "context": word.context,
+                "addedAt": word.added_at.isoformat(),
+            }
+            self.buffer.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def take(self) -> str:
+        """Text written since the last take()"""
+        text = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return text
+
+
+def write_words(
+    words: Iterable, file_format: str, chunk_rows: int = 500
+) -> Iterator[str]:
+    """
+    Serialize dictionary words, yielding text in chunks of chunk_rows rows.
+
+    Args:
+        words: DictionaryWord rows (anything with word/definition/context/
+            added_at attributes), typically a streamed query
+        file_format: One of FORMATS
+        chunk_rows: Rows per yielded chunk
+    """
+    writer = _WordWriter(file_format)
+    for count, word in enumerate(words, start=1):
+        writer.write(word)
+        if count % chunk_rows == 0:
+            yield writer.take()
+
+    rest = writer.take()
+    if rest:
+        yield rest
+
+
+async def write_words_async(
+    words: AsyncIterable, file_format: str, chunk_rows: int = 500
+) -> AsyncIterator[str]:
+    """write_words() for an async stream of rows, e.g. AsyncSession.stream_scalars"""
+    writer = _WordWriter(file_format)
+    count = 0
+    async for word in words:
+        writer.write(word)
+        count += 1
+        if count % chunk_rows == 0:
+            yield writer.take()
+
+    rest = writer.take()
+    if rest:
+        yield rest
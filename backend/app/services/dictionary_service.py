@@ -1,90 +1,580 @@
-import httpx
+import asyncio
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from app.core.config import settings
+from app.core.metrics import FunctionMetric, Histogram
 from app.schemas.dictionary import (
-    WordDefinitionItem,
     WordDefinitionResponse,
     WordPronunciationResponse,
 )
+from app.services.local_dictionary import merge_definitions, parse_api_entry
+from app.services.resilience import CircuitBreaker, LatencyTracker, RetryBudget
+from app.services.word_normalizer import lookup_candidates, normalize_word
+
+if TYPE_CHECKING:
+    # Imported on the first upstream lookup, keeping it off the startup path
+    import httpx
+
+dictionary_upstream_duration_seconds = Histogram(
+    "dictionary_upstream_duration_seconds",
+    "Latency of successful requests to the upstream dictionary API",
+)
+
+
+class DictionaryProvider:
+    """
+    Base class for sources of word definitions.
+
+    Providers are chained by DictionaryService in the order configured in
+    settings.DICTIONARY_PROVIDERS; the first one to return a definition wins.
+    """
+
+    name = "base"
+
+    @property
+    def available(self) -> bool:
+        """Whether the provider can serve lookups at all"""
+        return True
+
+    async def lookup(self, word: str) -> WordDefinitionResponse | None:
+        """
+        Look up an already-normalized word.
+
+        Returns:
+            WordDefinitionResponse, or None if this provider has no entry
+
+        Raises:
+            ValueError: If the word does not exist or the provider failed
+        """
+        raise NotImplementedError
+
+
+class DictionaryUnavailableError(ValueError):
+    """The upstream dictionary is failing or its circuit breaker is open"""
+
+
+class RemoteDictionaryProvider(DictionaryProvider):
+    """
+    Fetches definitions from the external dictionary API.
+
+    Calls are guarded by a resilience layer:
+    - the timeout adapts to observed latency (p99 x multiplier, clamped)
+    - failed attempts are retried while the retry budget allows
+    - optionally, a hedged second request is sent once the first one is
+      slower than the observed p95
+    - a circuit breaker fails fast after repeated upstream failures
+    """
+
+    name = "remote"
+
+    def __init__(
+        self, api_url: str, transport: "httpx.AsyncBaseTransport | None" = None
+    ):
+        self.api_url = api_url
+        self.transport = transport
+        self.latency = LatencyTracker()
+        self.retry_budget = RetryBudget(ratio=settings.DICTIONARY_RETRY_BUDGET_RATIO)
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.DICTIONARY_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.DICTIONARY_BREAKER_RESET_TIMEOUT,
+        )
+        self.max_retries = settings.DICTIONARY_MAX_RETRIES
+        self.hedging_enabled = settings.DICTIONARY_HEDGING_ENABLED
+        self.lookups_total = 0
+        self.retries_total = 0
+        self.hedges_total = 0
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def timeout(self) -> float:
+        """Current request timeout in seconds"""
+        p99 = self.latency.percentile(99)
+        if p99 is None:
+            return settings.DICTIONARY_TIMEOUT_MAX
+
+        return min(
+            settings.DICTIONARY_TIMEOUT_MAX,
+            max(
+                settings.DICTIONARY_TIMEOUT_MIN,
+                p99 * settings.DICTIONARY_TIMEOUT_P99_MULTIPLIER,
+            ),
+        )
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        import httpx
+
+        # A pooled client keeps upstream connections alive between lookups.
+        # Clients are bound to the event loop they were created on.
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(transport=self.transport)
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get(self, url: str, timeout: float) -> "httpx.Response":
+        import httpx
+
+        started = time.perf_counter()
+        try:
+            response = await self._get_client().get(url, timeout=timeout)
+        except httpx.TimeoutException:
+            # The upstream took at least this long; without the sample a
+            # slowing upstream would never raise the adaptive timeout
+            self.latency.observe(timeout)
+            raise
+        elapsed = time.perf_counter() - started
+        self.latency.observe(elapsed)
+        dictionary_upstream_duration_seconds.observe(elapsed)
+        return response
+
+    async def _get_hedged(self, url: str, timeout: float) -> "httpx.Response":
+        """GET url, sending a second request if the first is slower than p95"""
+        first = asyncio.create_task(self._get(url, timeout))
+        hedge_delay = self.latency.percentile(95) if self.hedging_enabled else None
+        if hedge_delay is None:
+            return await first
+
+        done, _ = await asyncio.wait({first}, timeout=hedge_delay)
+        if done or not self.retry_budget.try_spend():
+            return await first
+
+        self.hedges_total += 1
+        pending = {first, asyncio.create_task(self._get(url, timeout))}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def lookup(self, word: str) -> WordDefinitionResponse | None:
+        import httpx
+
+        self.lookups_total += 1
+        self.retry_budget.deposit()
+        attempt = 0
+
+        while True:
+            if not self.breaker.allow_request():
+                raise DictionaryUnavailableError(
+                    "Dictionary service is temporarily unavailable"
+                )
+
+            try:
+                response = await self._get_hedged(
+                    f"{self.api_url}/{word}", self.timeout
+                )
+            except httpx.HTTPError as e:
+                self.breaker.record_failure()
+                error = DictionaryUnavailableError(
+                    f"Failed to fetch definition: {str(e)}"
+                )
+            except BaseException:
+                # Cancelled (client gone, losing hedge) or failed unexpectedly:
+                # no outcome to record, but a half-open probe must not stay
+                # in flight forever
+                self.breaker.release()
+                raise
+            else:
+                if response.status_code >= 500 or response.status_code == 429:
+                    self.breaker.record_failure()
+                    error = DictionaryUnavailableError(
+                        "Failed to fetch definition: "
+                        f"upstream returned {response.status_code}"
+                    )
+                else:
+                    self.breaker.record_success()
+                    return self._parse_response(word, response)
+
+            if attempt >= self.max_retries or not self.retry_budget.try_spend():
+                raise error
+            attempt += 1
+            self.retries_total += 1
+
+    @staticmethod
+    def _parse_response(
+        word: str, response: "httpx.Response"
+    ) -> WordDefinitionResponse:
+        if response.status_code == 404:
+            raise ValueError(f"Definition not found for the word '{word}'")
+
+        if response.is_error:
+            raise ValueError(
+                f"Failed to fetch definition: upstream returned {response.status_code}"
+            )
+
+        data = response.json()
+
+        if not data or len(data) == 0:
+            raise ValueError(f"No definitions found for '{word}'")
+
+        # Parse the API response
+        definition = parse_api_entry(data[0])
+        if definition is None:
+            raise ValueError(f"No definitions found for '{word}'")
+
+        definition.word = word
+        return definition
+
+    def metrics(self) -> dict:
+        return {
+            "breaker_state": self.breaker.state.value,
+            "breaker_consecutive_failures": self.breaker.consecutive_failures,
+            "breaker_opened_total": self.breaker.opened_total,
+            "latency_samples": len(self.latency),
+            "latency_p50_seconds": self.latency.percentile(50),
+            "latency_p95_seconds": self.latency.percentile(95),
+            "latency_p99_seconds": self.latency.percentile(99),
+            "timeout_seconds": self.timeout,
+            "lookups_total": self.lookups_total,
+            "retries_total": self.retries_total,
+            "retry_budget_tokens": self.retry_budget.balance,
+            "hedges_total": self.hedges_total,
+        }
+
+
+class LocalDictionaryProvider(DictionaryProvider):
+    """
+    Serves definitions from a prebuilt SQLite index.
+
+    Build the index with ``python -m app.services.local_dictionary``.
+    """
+
+    name = "local"
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = Path(db_path)
+        self._connection = None
+
+    @property
+    def available(self) -> bool:
+        return self.db_path.is_file()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            # The index is never written while serving, so open it read-only
+            # and immutable to skip file locking on every query
+            self._connection = sqlite3.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro&immutable=1",
+                uri=True,
+                check_same_thread=False,
+            )
+        return self._connection
+
+    async def lookup(self, word: str) -> WordDefinitionResponse | None:
+        # Queries hit a local index and take microseconds, so they run
+        # inline on the event loop
+        if not self.available:
+            return None
+
+        rows = (
+            self._connect()
+            .execute("SELECT data FROM entries WHERE word = ?", (word,))
+            .fetchall()
+        )
+        return merge_definitions(
+            WordDefinitionResponse.model_validate_json(data) for (data,) in rows
+        )
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class DefinitionCache(DictionaryProvider):
+    """
+    In-process LRU cache of definitions.
+
+    Entries are fresh for ``ttl`` seconds. After that they may still be served
+    for up to ``max_stale`` more seconds while DictionaryService refreshes
+    them in the background (stale-while-revalidate).
+
+    Besides definitions keyed by headword, it remembers redirects from
+    inflected forms to the headword that resolved them ("running" -> "run").
+    """
+
+    name = "cache"
+
+    def __init__(self, max_size: int, ttl: float, max_stale: float = 0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, WordDefinitionResponse]] = (
+            OrderedDict()
+        )
+        self._redirects: OrderedDict[str, str] = OrderedDict()
+
+    async def lookup(self, word: str) -> WordDefinitionResponse | None:
+        return self.get(word)
+
+    def get(self, word: str) -> WordDefinitionResponse | None:
+        """Return a fresh entry"""
+        entry = self.get_entry(word)
+        if entry is None or not entry[1]:
+            return None
+        return entry[0]
+
+    def get_entry(self, word: str) -> tuple[WordDefinitionResponse, bool] | None:
+        """
+        Return ``(definition, is_fresh)`` for an entry that may still be served.
+
+        Entries older than ``ttl + max_stale`` count as misses.
+        """
+        entry = self._entries.get(word)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, definition = entry
+        age = time.monotonic() - stored_at
+        if age >= self.ttl + self.max_stale:
+            # Expired entries stay until evicted so they can still be served
+            # while the upstream is unavailable
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(word)
+        return definition, age < self.ttl
+
+    def __contains__(self, word: str) -> bool:
+        """Whether a fresh entry exists, without touching LRU order or stats"""
+        entry = self._entries.get(word)
+        return entry is not None and time.monotonic() - entry[0] < self.ttl
+
+    def get_stale(self, word: str) -> WordDefinitionResponse | None:
+        """Return an entry however old it is (used when upstream is down)"""
+        entry = self._entries.get(word)
+        return entry[1] if entry is not None else None
+
+    def set(self, word: str, definition: WordDefinitionResponse) -> None:
+        self._entries[word] = (time.monotonic(), definition)
+        self._entries.move_to_end(word)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get_redirect(self, word: str) -> str | None:
+        """Headword previously resolved for an inflected form"""
+        target = self._redirects.get(word)
+        if target is not None:
+            self._redirects.move_to_end(word)
+        return target
+
+    def set_redirect(self, word: str, target: str) -> None:
+        self._redirects[word] = target
+        self._redirects.move_to_end(word)
+
+        while len(self._redirects) > self.max_size:
+            self._redirects.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._redirects.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class DictionaryService:
-    """Service for interacting with external dictionary API"""
+    """
+    Service for looking up word definitions.
 
-    def __init__(self):
-        self.api_url = settings.DICTIONARY_API_URL
+    Definitions are resolved through a configurable chain of providers
+    (settings.DICTIONARY_PROVIDERS), e.g. ``["local", "cache", "remote"]``.
+    Definitions found by providers after the cache are stored in it. Cache
+    entries past their TTL are served immediately while a background task
+    refreshes them from the providers after the cache.
+    """
+
+    def __init__(self, provider_names: list[str] | None = None):
+        self.cache = DefinitionCache(
+            max_size=settings.DEFINITION_CACHE_SIZE,
+            ttl=settings.DEFINITION_CACHE_TTL,
+            max_stale=settings.DEFINITION_CACHE_MAX_STALE,
+        )
+        self.providers = self._build_providers(
+            provider_names or settings.DICTIONARY_PROVIDERS
+        )
+        self._cache_index = (
+            self.providers.index(self.cache) if self.cache in self.providers else None
+        )
+        self.refresh_concurrency = settings.DEFINITION_REFRESH_CONCURRENCY
+        self.stale_served_total = 0
+        self.refreshes_total = 0
+        self.refreshes_skipped_total = 0
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    def _build_providers(self, provider_names: list[str]) -> list[DictionaryProvider]:
+        factories = {
+            "local": lambda: LocalDictionaryProvider(settings.LOCAL_DICTIONARY_PATH),
+            "cache": lambda: self.cache,
+            "remote": lambda: RemoteDictionaryProvider(settings.DICTIONARY_API_URL),
+        }
+
+        providers = []
+        for name in provider_names:
+            if name not in factories:
+                raise ValueError(
+                    f"Unknown dictionary provider '{name}'. "
+                    f"Expected one of: {', '.join(factories)}"
+                )
+            providers.append(factories[name]())
+
+        return providers
 
     async def get_word_definition(self, word: str) -> WordDefinitionResponse:
         """
-        Get definition of a word from external dictionary API.
+        Get definition of a word from the configured providers.
+
+        The word is normalized and lemmatized first, so "Running," and "ran"
+        are served from the entry for "run". If the headword is unknown, the
+        surface form is tried before giving up.
 
         Args:
             word: Word to look up
 
         Returns:
-            WordDefinitionResponse with definitions
+            WordDefinitionResponse with definitions; redirected_from is set
+            when the definition belongs to a different headword
 
         Raises:
             ValueError: If word not found or API error
         """
-        clean_word = word.lower().strip()
+        surface = normalize_word(word)
+        if not surface:
+            raise ValueError(f"Definition not found for the word '{word.strip()}'")
+
+        target = self.cache.get_redirect(surface)
+        candidates = [target] if target else lookup_candidates(surface)
+        error = None
+
+        for candidate in candidates:
+            try:
+                definition = await self._lookup(candidate)
+            except ValueError as e:
+                error = e
+                continue
 
+            if candidate != candidates[0] or candidate != surface:
+                # Remember which form resolved so later lookups go straight there
+                self.cache.set_redirect(surface, candidate)
+            if candidate != surface:
+                definition = definition.model_copy(update={"redirected_from": surface})
+            return definition
+
+        raise error
+
+    async def _lookup(self, clean_word: str) -> WordDefinitionResponse:
+        """Resolve an exact headword through the provider chain"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_url}/{clean_word}", timeout=10.0
-                )
+            return await self._resolve(clean_word)
+        except DictionaryUnavailableError:
+            stale = self.cache.get_stale(clean_word)
+            if stale is None:
+                raise
+            self.stale_served_total += 1
+            return stale
 
-                if response.status_code == 404:
-                    raise ValueError(
-                        f"Definition not found for the word '{clean_word}'"
-                    )
+    async def _resolve(self, clean_word: str, start: int = 0) -> WordDefinitionResponse:
+        """Try providers from index ``start`` onwards"""
+        error = None
 
-                response.raise_for_status()
-                data = response.json()
-
-                if not data or len(data) == 0:
-                    raise ValueError(f"No definitions found for '{clean_word}'")
-
-                # Parse the API response
-                word_data = data[0]
-                definitions = []
-                phonetic = word_data.get("phonetic", None)
-                audio_url = None
-
-                # Extract audio URL from phonetics
-                if "phonetics" in word_data:
-                    for phonetic_entry in word_data["phonetics"]:
-                        if "audio" in phonetic_entry and phonetic_entry["audio"]:
-                            audio_url = phonetic_entry["audio"]
-                            break
-
-                # Extract definitions
-                if "meanings" in word_data:
-                    for meaning in word_data["meanings"]:
-                        part_of_speech = meaning.get("partOfSpeech", "")
-
-                        for definition in meaning.get("definitions", []):
-                            definitions.append(
-                                WordDefinitionItem(
-                                    part_of_speech=part_of_speech,
-                                    definition=definition.get("definition", ""),
-                                    example=definition.get("example", None),
-                                )
-                            )
-
-                if not definitions:
-                    raise ValueError(f"No definitions found for '{clean_word}'")
-
-                return WordDefinitionResponse(
-                    word=clean_word,
-                    definitions=definitions,
-                    phonetic=phonetic,
-                    audio_url=audio_url,
-                )
+        for index in range(start, len(self.providers)):
+            provider = self.providers[index]
+
+            if provider is self.cache:
+                entry = self.cache.get_entry(clean_word)
+                if entry is None:
+                    continue
+                definition, is_fresh = entry
+                if not is_fresh:
+                    self._schedule_refresh(clean_word)
+                return definition
+
+            if not provider.available:
+                continue
 
-        except httpx.HTTPError as e:
-            raise ValueError(f"Failed to fetch definition: {str(e)}")
+            try:
+                definition = await provider.lookup(clean_word)
+            except ValueError as e:
+                # Remember the failure but give later providers a chance
+                error = e
+                continue
+
+            if definition is not None:
+                if self._cache_index is not None and index > self._cache_index:
+                    self.cache.set(clean_word, definition)
+                return definition
+
+        raise error or ValueError(f"Definition not found for the word '{clean_word}'")
+
+    def _schedule_refresh(self, clean_word: str) -> None:
+        """Refresh a stale cache entry in the background, at most once per word"""
+        if clean_word in self._refreshing:
+            return
+        if len(self._refreshing) >= self.refresh_concurrency:
+            # The next reader of this word will try again
+            self.refreshes_skipped_total += 1
+            return
+
+        self.refreshes_total += 1
+        self._refreshing[clean_word] = asyncio.create_task(self._refresh(clean_word))
+
+    async def _refresh(self, clean_word: str) -> None:
+        try:
+            await self._resolve(clean_word, start=self._cache_index + 1)
+        except ValueError:
+            # Keep serving the stale entry until it passes max-stale
+            pass
+        finally:
+            del self._refreshing[clean_word]
+
+    def metrics(self) -> dict:
+        """Counters and gauges describing lookups and upstream health"""
+        metrics = {
+            "providers": [provider.name for provider in self.providers],
+            "cache_entries": len(self.cache),
+            "cache_hits_total": self.cache.hits,
+            "cache_misses_total": self.cache.misses,
+            "stale_served_total": self.stale_served_total,
+            "refreshes_total": self.refreshes_total,
+            "refreshes_skipped_total": self.refreshes_skipped_total,
+            "refreshes_in_flight": len(self._refreshing),
+        }
+        for provider in self.providers:
+            if isinstance(provider, RemoteDictionaryProvider):
+                metrics["upstream"] = provider.metrics()
+        return metrics
+
+    async def aclose(self) -> None:
+        """Release the upstream HTTP client and the local index connection"""
+        for provider in self.providers:
+            if isinstance(provider, RemoteDictionaryProvider):
+                await provider.aclose()
+            elif isinstance(provider, LocalDictionaryProvider):
+                provider.close()
 
     async def get_word_pronunciation(
         self, word: str, voice: str = "us"
@@ -116,3 +606,29 @@ class DictionaryService:
 
 
 dictionary_service = DictionaryService()
+
+
+def _cache_hit_ratio() -> float:
+    cache = dictionary_service.cache
+    lookups = cache.hits + cache.misses
+    return cache.hits / lookups if lookups else 0.0
+
+
+# The cache already counts hits and misses; they are read at scrape time
+FunctionMetric(
+    "dictionary_cache_hits_total",
+    "Definition cache lookups answered from the cache",
+    lambda: dictionary_service.cache.hits,
+    kind="counter",
+)
+FunctionMetric(
+    "dictionary_cache_misses_total",
+    "Definition cache lookups that went to the providers",
+    lambda: dictionary_service.cache.misses,
+    kind="counter",
+)
+FunctionMetric(
+    "dictionary_cache_hit_ratio",
+    "Share of definition cache lookups answered from the cache",
+    _cache_hit_ratio,
+)
@@ -0,0 +1,224 @@
+"""
+Builder for the offline dictionary index used by LocalDictionaryProvider.
+
+A dictionary dump is converted once into an indexed SQLite file:
+
+    uv run python -m app.services.local_dictionary dump.jsonl data/dictionary.sqlite
+
+Two JSON Lines dump formats are understood:
+- dictionaryapi.dev entries (``word``, ``phonetics``, ``meanings``), the same
+  shape the remote API returns
+- Wiktextract / kaikki.org entries (``word``, ``pos``, ``senses``, ``sounds``)
+
+Several lines may describe the same word (one per part of speech); they are
+merged at lookup time.
+"""
+
+import argparse
+import json
+import sqlite3
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from app.schemas.dictionary import WordDefinitionItem, WordDefinitionResponse
+
+# Number of rows written per executemany() call while building the index
+BUILD_BATCH_SIZE = 5000
+
+
+def parse_api_entry(entry: dict) -> WordDefinitionResponse | None:
+    """
+    Convert a dictionaryapi.dev entry into a WordDefinitionResponse.
+
+    Args:
+        entry: One entry as returned by the dictionary API
+
+    Returns:
+        WordDefinitionResponse, or None if the entry has no definitions
+    """
+    definitions = []
+    phonetic = entry.get("phonetic", None)
+    audio_url = None
+
+    # Extract audio URL from phonetics
+    for phonetic_entry in entry.get("phonetics", []):
+        if phonetic_entry.get("audio"):
+            audio_url = phonetic_entry["audio"]
+            break
+
+    # Extract definitions
+    for meaning in entry.get("meanings", []):
+        part_of_speech = meaning.get("partOfSpeech", "")
+
+        for definition in meaning.get("definitions", []):
+            definitions.append(
+                WordDefinitionItem(
+                    part_of_speech=part_of_speech,
+                    definition=definition.get("definition", ""),
+                    example=definition.get("example", None),
+                )
+            )
+
+    if not definitions:
+        return None
+
+    return WordDefinitionResponse(
+        word=entry["word"].lower().strip(),
+        definitions=definitions,
+        phonetic=phonetic,
+        audio_url=audio_url,
+    )
+
+
+def parse_wiktextract_entry(entry: dict) -> WordDefinitionResponse | None:
+    """
+    Convert a Wiktextract (kaikki.org) entry into a WordDefinitionResponse.
+
+    Args:
+        entry: One JSON line from a Wiktextract dump
+
+    Returns:
+        WordDefinitionResponse, or None if the entry has no glosses
+    """
+    part_of_speech = entry.get("pos", "")
+    definitions = []
+
+    for sense in entry.get("senses", []):
+        glosses = sense.get("glosses") or []
+        if not glosses:
+            continue
+
+        examples = sense.get("examples") or []
+        definitions.append(
+            WordDefinitionItem(
+                part_of_speech=part_of_speech,
+                definition=glosses[-1],
+                example=examples[0].get("text") if examples else None,
+            )
+        )
+
+    if not definitions:
+        return None
+
+    phonetic = None
+    audio_url = None
+    for sound in entry.get("sounds", []):
+        if phonetic is None and sound.get("ipa"):
+            phonetic = sound["ipa"]
+        if audio_url is None and sound.get("mp3_url"):
+            audio_url = sound["mp3_url"]
+
+    return WordDefinitionResponse(
+        word=entry["word"].lower().strip(),
+        definitions=definitions,
+        phonetic=phonetic,
+        audio_url=audio_url,
+    )
+
+
+def parse_dump_entry(entry: dict) -> WordDefinitionResponse | None:
+    """Parse a dump entry in whichever supported format it is written in"""
+    if not entry.get("word"):
+        return None
+    if "senses" in entry:
+        return parse_wiktextract_entry(entry)
+    return parse_api_entry(entry)
+
+
+def merge_definitions(
+    entries: Iterable[WordDefinitionResponse],
+) -> WordDefinitionResponse | None:
+    """Merge several entries for the same word into one response"""
+    merged = None
+
+    for entry in entries:
+        if merged is None:
+            merged = entry.model_copy(deep=True)
+            continue
+
+        merged.definitions.extend(entry.definitions)
+        merged.phonetic = merged.phonetic or entry.phonetic
+        merged.audio_url = merged.audio_url or entry.audio_url
+
+    return merged
+
+
+def _read_dump(dump_path: Path) -> Iterator[WordDefinitionResponse]:
+    """Stream parsed entries from a JSON Lines dump"""
+    with dump_path.open(encoding="utf-8") as dump:
+        for line in dump:
+            line = line.strip()
+            if not line:
+                continue
+
+            parsed = parse_dump_entry(json.loads(line))
+            if parsed is not None:
+                yield parsed
+
+
+def build_local_dictionary(dump_path: str | Path, db_path: str | Path) -> int:
+    """
+    Build the SQLite index used by LocalDictionaryProvider.
+
+    The index is written to a temporary file and moved into place once
+    complete, so a running server never sees a half-built file.
+
+    Args:
+        dump_path: Path to a JSON Lines dictionary dump
+        db_path: Destination path of the SQLite index
+
+    Returns:
+        Number of entries written
+    """
+    dump_path = Path(dump_path)
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_suffix(db_path.suffix + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    connection = sqlite3.connect(tmp_path)
+    count = 0
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute(
+            "CREATE TABLE entries (word TEXT NOT NULL, data TEXT NOT NULL)"
+        )
+
+        batch = []
+        for entry in _read_dump(dump_path):
+            batch.append((entry.word, entry.model_dump_json()))
+            if len(batch) >= BUILD_BATCH_SIZE:
+                connection.executemany("INSERT INTO entries VALUES (?, ?)", batch)
+                count += len(batch)
+                batch = []
+
+        if batch:
+            connection.executemany("INSERT INTO entries VALUES (?, ?)", batch)
+            count += len(batch)
+
+        # Building the index after the bulk load is much faster than
+        # maintaining it row by row
+        connection.execute("CREATE INDEX ix_entries_word ON entries (word)")
+        connection.commit()
+    finally:
+        connection.close()
+
+    tmp_path.replace(db_path)
+    return count
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Build the offline dictionary index from a JSON Lines dump"
+    )
+    parser.add_argument("dump", help="Path to the JSON Lines dictionary dump")
+    parser.add_argument("output", help="Path of the SQLite index to write")
+    args = parser.parse_args(argv)
+
+    count = build_local_dictionary(args.dump, args.output)
+    print(f"Wrote {count} entries to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Resilience primitives for calls to upstream services.
+
+These are small in-process building blocks used by the remote dictionary
+provider: a latency tracker that drives adaptive timeouts and hedging, a
+retry budget that caps retries to a fraction of traffic, and a circuit
+breaker that stops calling an upstream that keeps failing.
+"""
+
+import enum
+import time
+from collections import deque
+
+
+class LatencyTracker:
+    """Rolling window of recent latencies with percentile queries"""
+
+    def __init__(self, window: int = 512, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, percent: float) -> float | None:
+        """
+        Latency at the given percentile, in seconds.
+
+        Returns None until enough samples have been collected to be meaningful.
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of regular requests.
+
+    Every request deposits ``ratio`` tokens (up to ``max_tokens``); each retry
+    or hedged request spends a whole token. During an outage retries quickly
+    run out instead of multiplying load on the upstream.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.balance = max_tokens
+
+    def deposit(self) -> None:
+        self.balance = min(self.max_tokens, self.balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
+
+
+class BreakerState(str, enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the breaker opens and
+    rejects calls for ``reset_timeout`` seconds. It then lets a single probe
+    through (half-open); success closes it, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = BreakerState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_total = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        if self.state == BreakerState.CLOSED:
+            return True
+
+        if self.state == BreakerState.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = BreakerState.HALF_OPEN
+
+        # Half-open: let exactly one probe through
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def release(self) -> None:
+        """
+        A call let through ended without an outcome (e.g. it was cancelled).
+
+        Frees the half-open probe slot so the next call can probe instead.
+        """
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = BreakerState.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+
+        if (
+            self.state == BreakerState.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state != BreakerState.OPEN:
+                self.opened_total += 1
+            self.state = BreakerState.OPEN
+            self._opened_at = time.monotonic()
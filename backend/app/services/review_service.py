@@ -0,0 +1,65 @@
+"""
+SM-2 spaced-repetition scheduling for saved words.
+
+Each saved word is a review card with a due date, an interval in days, an
+ease factor and a count of consecutive successful reviews. Grades follow
+SM-2: 0-2 are failed recalls, 3-5 successful ones (3 = hard, 5 = easy).
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+MIN_EASE = 1.3
+PASSING_GRADE = 3
+
+
+@dataclass
+class ReviewState:
+    """Scheduling state of one card"""
+
+    interval_days: int
+    ease: float
+    repetitions: int
+    due_at: datetime
+
+
+def schedule_review(state: ReviewState, grade: int, now: datetime) -> ReviewState:
+    """
+    Next review state of a card after grading it.
+
+    Args:
+        state: Current state of the card
+        grade: Recall quality from 0 (blackout) to 5 (perfect)
+        now: Review time
+
+    Returns:
+        New state; the card is due interval_days after now
+
+    Raises:
+        ValueError: If grade is outside 0-5
+    """
+    if not 0 <= grade <= 5:
+        raise ValueError("Grade must be between 0 and 5")
+
+    if grade < PASSING_GRADE:
+        # Failed recall: relearn from the start, ease is kept
+        repetitions = 0
+        interval_days = 1
+        ease = state.ease
+    else:
+        repetitions = state.repetitions + 1
+        if repetitions == 1:
+            interval_days = 1
+        elif repetitions == 2:
+            interval_days = 6
+        else:
+            interval_days = max(1, round(state.interval_days * state.ease))
+        penalty = 5 - grade
+        ease = max(MIN_EASE, state.ease + 0.1 - penalty * (0.08 + penalty * 0.02))
+
+    return ReviewState(
+        interval_days=interval_days,
+        ease=round(ease, 4),
+        repetitions=repetitions,
+        due_at=now + timedelta(days=interval_days),
+    )
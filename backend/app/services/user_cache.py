@@ -0,0 +1,129 @@
+"""
+LRU of per-user structures derived from a user's saved words.
+
+The saved-word index, the trigram search index and the annotation automata
+all follow the same pattern: load a user's rows with one query, build an
+in-memory structure from them, keep it for the most recently active users
+and drop it whenever the user's words change. UserCache implements that
+pattern once.
+
+Building is CPU-bound (a Bloom filter, trigram postings or an Aho–Corasick
+trie over every saved word), so it runs in a worker thread; only the query
+is awaited on the event loop.
+
+Invalidation only reaches the process that handled the write, while other
+worker processes serve the same users. Each entry therefore records a cheap
+version of the user's rows when it is built, and once it is older than the
+TTL that version is queried again before the entry is trusted: unchanged,
+the entry is kept for another TTL; changed, it is rebuilt.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from anyio import to_thread
+from sqlalchemy import Row, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Entry(Generic[T]):
+    value: T
+    version: tuple
+    checked_at: float
+
+
+class UserCache(Generic[T]):
+    """
+    LRU of one structure per user, built from the rows of a per-user query.
+
+    Args:
+        max_users: Users kept before the least recently used is evicted
+        query: Returns the statement loading a user's rows
+        build: Builds the structure from those rows; run in a worker thread
+        version: Returns a statement whose single row changes whenever the
+            user's rows do
+        ttl: Seconds an entry is used before its version is checked again
+    """
+
+    def __init__(
+        self,
+        max_users: int,
+        query: Callable[[str], Select],
+        build: Callable[[Sequence[Row[Any]]], T],
+        version: Callable[[str], Select],
+        ttl: float,
+    ):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._query = query
+        self._build = build
+        self._version = version
+        self._entries: OrderedDict[str, _Entry[T]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Token of each user's build in flight; invalidating the user drops
+        # it, so a build that raced with a write of that user is not cached
+        self._building: dict[str, object] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, db: AsyncSession, user_id: str) -> T:
+        """The user's structure, loaded and built on a miss"""
+        token = object()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+                if time.monotonic() - entry.checked_at < self.ttl:
+                    self.hits += 1
+                    return entry.value
+            self._building[user_id] = token
+
+        try:
+            version = tuple((await db.execute(self._version(user_id))).one())
+            if entry is not None and version == entry.version:
+                with self._lock:
+                    # Written to by this process meanwhile: rebuild instead
+                    if self._building.get(user_id) is token:
+                        entry.checked_at = time.monotonic()
+                        self.hits += 1
+                        return entry.value
+
+            with self._lock:
+                self.misses += 1
+            rows = (await db.execute(self._query(user_id))).all()
+            value = await to_thread.run_sync(self._build, rows)
+
+            with self._lock:
+                if self._building.get(user_id) is token:
+                    self._entries[user_id] = _Entry(value, version, time.monotonic())
+                    self._entries.move_to_end(user_id)
+                    while len(self._entries) > self.max_users:
+                        self._entries.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                if self._building.get(user_id) is token:
+                    del self._building[user_id]
+
+    def invalidate(self, user_id: str | None) -> None:
+        """Drop a user's structure (all structures if user_id is None)"""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+                self._building.clear()
+            else:
+                self._entries.pop(user_id, None)
+                self._building.pop(user_id, None)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
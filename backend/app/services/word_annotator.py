@@ -0,0 +1,153 @@
+"""
+Saved-word annotation of page text with an Aho–Corasick automaton.
+
+The automaton is built once from all of a user's saved words (phrases
+included) and finds every occurrence of any of them in a single pass over
+the page, so annotating costs time linear in the page length plus the
+number of matches, however large the dictionary. Automata are kept in an
+LRU of users and dropped whenever the saved-word index is invalidated.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.dictionary import DictionaryWord
+from app.services.user_cache import UserCache
+from app.services.word_index import saved_words_version, word_index
+
+
+@dataclass
+class WordMatch:
+    """Occurrence of a saved word at text[start:end]"""
+
+    word: str
+    word_id: str
+    start: int
+    end: int
+
+
+def _fold(char: str) -> str:
+    """Lowercase a character without changing the text length"""
+    lower = char.lower()
+    return lower if len(lower) == 1 else char
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class AhoCorasick:
+    """Multi-pattern string matcher over lowercase patterns"""
+
+    def __init__(self, patterns: dict[str, str]):
+        # Node 0 is the root. For each node: outgoing edges, failure link,
+        # the pattern ending here (if any) and the nearest pattern-ending
+        # node on its failure chain, so all matches are reported in O(1) each.
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._pattern: list[str | None] = [None]
+        self._output_link: list[int] = [0]
+        self.patterns = patterns
+
+        for pattern in patterns:
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._pattern.append(None)
+                    self._output_link.append(0)
+                node = next_node
+            self._pattern[node] = pattern
+
+        # Breadth-first so every failure link points to an already-done node
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output_link[child] = (
+                    target if self._pattern[target] else self._output_link[target]
+                )
+                queue.append(child)
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def find_all(self, text: str) -> list[WordMatch]:
+        """
+        Whole-word occurrences of the patterns in text, case-insensitively.
+
+        Overlapping matches are resolved leftmost-longest, so a saved phrase
+        wins over a saved word inside it.
+        """
+        matches = []
+        node = 0
+        for index, char in enumerate(text):
+            char = _fold(char)
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+
+            found = node if self._pattern[node] else self._output_link[node]
+            while found:
+                pattern = self._pattern[found]
+                start = index + 1 - len(pattern)
+                end = index + 1
+                if (start == 0 or not _is_word_char(text[start - 1])) and (
+                    end == len(text) or not _is_word_char(text[end])
+                ):
+                    matches.append(
+                        WordMatch(pattern, self.patterns[pattern], start, end)
+                    )
+                found = self._output_link[found]
+
+        matches.sort(key=lambda match: (match.start, -match.end))
+        selected = []
+        covered_until = 0
+        for match in matches:
+            if match.start >= covered_until:
+                selected.append(match)
+                covered_until = match.end
+        return selected
+
+
+class WordAnnotator:
+    """Per-user cache of saved-word automata"""
+
+    def __init__(self, max_users: int | None = None):
+        self._automata: UserCache[AhoCorasick] = UserCache(
+            max_users or settings.WORD_ANNOTATION_MAX_USERS,
+            lambda user_id: select(DictionaryWord.word, DictionaryWord.id).where(
+                DictionaryWord.user_id == user_id
+            ),
+            lambda rows: AhoCorasick({word.lower(): word_id for word, word_id in rows}),
+            saved_words_version,
+            settings.WORD_CACHE_TTL,
+        )
+        word_index.add_listener(self.invalidate)
+
+    async def annotate(
+        self, db: AsyncSession, user_id: str, text: str
+    ) -> list[WordMatch]:
+        """Occurrences of the user's saved words in text, in order"""
+        automaton = await self._automata.get(db, user_id)
+        return automaton.find_all(text)
+
+    def invalidate(self, user_id: str | None) -> None:
+        """Drop a user's automaton (all automata if user_id is None)"""
+        self._automata.invalidate(user_id)
+
+
+word_annotator = WordAnnotator()
@@ -0,0 +1,162 @@
+"""
+In-memory index of the words each user has saved.
+
+Existence checks while reading ("is this word in my dictionary?") are by
+far the most frequent dictionary queries, while a user's saved words change
+rarely. The first check for a user loads their words with one query into a
+membership structure kept in an LRU of active users; later checks are
+memory lookups. Every write to a user's dictionary must call
+``word_index.invalidate(user_id)`` after committing; other worker processes
+notice the change through saved_words_version within WORD_CACHE_TTL.
+
+Small dictionaries are held as a frozenset. Past WORD_INDEX_BLOOM_THRESHOLD
+words a Bloom filter is kept instead: a miss is still answered from memory,
+and only possible hits are confirmed against the database.
+"""
+
+import hashlib
+import math
+from collections.abc import Callable
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.dictionary import DictionaryWord
+from app.services.user_cache import UserCache
+
+# Upper bound on bound parameters per IN (...) query, well below SQLite's limit
+CHECK_CHUNK_SIZE = 900
+
+
+def saved_words_version(user_id: str) -> Select:
+    """
+    Version of a user's saved words: their count and the newest save time.
+    Saving a word moves the newest time and deleting one lowers the count.
+    """
+    return select(func.count(), func.max(DictionaryWord.added_at)).where(
+        DictionaryWord.user_id == user_id
+    )
+
+
+def find_saved_words(db: Session, user_id: str, words: set[str]) -> set[str]:
+    """Which of the given (clean) words the user has saved, from the database"""
+    if not words:
+        return set()
+
+    candidates = sorted(words)
+    saved = set()
+    for start in range(0, len(candidates), CHECK_CHUNK_SIZE):
+        chunk = candidates[start : start + CHECK_CHUNK_SIZE]
+        rows = db.query(DictionaryWord.word).filter(
+            DictionaryWord.user_id == user_id, DictionaryWord.word.in_(chunk)
+        )
+        saved.update(word for (word,) in rows)
+    return saved
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class WordMembershipIndex:
+    """LRU of per-user saved-word sets (or Bloom filters for large ones)"""
+
+    def __init__(
+        self, max_users: int | None = None, bloom_threshold: int | None = None
+    ):
+        self.bloom_threshold = bloom_threshold or settings.WORD_INDEX_BLOOM_THRESHOLD
+        self._cache: UserCache[frozenset[str] | BloomFilter] = UserCache(
+            max_users or settings.WORD_INDEX_MAX_USERS,
+            lambda user_id: select(DictionaryWord.word).where(
+                DictionaryWord.user_id == user_id
+            ),
+            self._build,
+            saved_words_version,
+            settings.WORD_CACHE_TTL,
+        )
+        self._listeners: list[Callable[[str | None], None]] = []
+
+    @property
+    def hits(self) -> int:
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self._cache.misses
+
+    def add_listener(self, listener: Callable[[str | None], None]) -> None:
+        """
+        Register a callback run on every invalidation, for caches derived
+        from a user's saved words. It receives the user id, or None when
+        everything is cleared.
+        """
+        self._listeners.append(listener)
+
+    def _build(self, rows) -> frozenset[str] | BloomFilter:
+        if len(rows) <= self.bloom_threshold:
+            return frozenset(word for (word,) in rows)
+        entry = BloomFilter(len(rows))
+        for (word,) in rows:
+            entry.add(word)
+        return entry
+
+    async def contains(self, db: AsyncSession, user_id: str, word: str) -> bool:
+        """Whether the user has saved a (clean) word"""
+        entry = await self._cache.get(db, user_id)
+        if word not in entry:
+            return False
+        if isinstance(entry, BloomFilter):
+            return bool(await db.run_sync(find_saved_words, user_id, {word}))
+        return True
+
+    async def saved_subset(
+        self, db: AsyncSession, user_id: str, words: set[str]
+    ) -> set[str]:
+        """Which of the given (clean) words the user has saved"""
+        entry = await self._cache.get(db, user_id)
+        candidates = {word for word in words if word in entry}
+        if isinstance(entry, BloomFilter):
+            return await db.run_sync(find_saved_words, user_id, candidates)
+        return candidates
+
+    def invalidate(self, user_id: str) -> None:
+        """Forget a user's words; call after committing any change to them"""
+        self._cache.invalidate(user_id)
+        for listener in self._listeners:
+            listener(user_id)
+
+    def clear(self) -> None:
+        self._cache.invalidate(None)
+        for listener in self._listeners:
+            listener(None)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+word_index = WordMembershipIndex()
@@ -0,0 +1,329 @@
+"""
+Word normalization for definition lookups.
+
+Text selected in the reader arrives with punctuation, curly apostrophes,
+possessives and inflections ("Running,", "children's", "walked"). These
+helpers reduce it to a surface form and a dictionary headword (lemma) using
+a small rule-based English lemmatizer with an exception table, so different
+forms of a word share one cache entry and one upstream request.
+"""
+
+import re
+import unicodedata
+
+# Characters allowed inside a word; everything else is trimmed from the ends
+_EDGE_PUNCTUATION = re.compile(r"^[^\w]+|[^\w]+$")
+_APOSTROPHES = str.maketrans({"’": "'", "‘": "'", "ʼ": "'"})
+_VOWELS = frozenset("aeiou")
+
+# A word token in running text, apostrophes and hyphens included
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'’-]*")
+
+# Irregular inflections mapped to their headword. Ambiguous forms that are
+# common words in their own right ("left", "rose", "lay", "bit") are omitted.
+IRREGULAR_LEMMAS = {
+    # be, have, do, go
+    "am": "be",
+    "is": "be",
+    "are": "be",
+    "was": "be",
+    "were": "be",
+    "been": "be",
+    "being": "be",
+    "has": "have",
+    "had": "have",
+    "having": "have",
+    "does": "do",
+    "did": "do",
+    "done": "do",
+    "goes": "go",
+    "went": "go",
+    "gone": "go",
+    # irregular verbs
+    "said": "say",
+    "made": "make",
+    "took": "take",
+    "taken": "take",
+    "came": "come",
+    "saw": "see",
+    "seen": "see",
+    "knew": "know",
+    "known": "know",
+    "got": "get",
+    "gotten": "get",
+    "gave": "give",
+    "given": "give",
+    "found": "find",
+    "thought": "think",
+    "told": "tell",
+    "became": "become",
+    "felt": "feel",
+    "brought": "bring",
+    "began": "begin",
+    "begun": "begin",
+    "kept": "keep",
+    "held": "hold",
+    "wrote": "write",
+    "written": "write",
+    "stood": "stand",
+    "heard": "hear",
+    "meant": "mean",
+    "met": "meet",
+    "ran": "run",
+    "paid": "pay",
+    "sat": "sit",
+    "spoke": "speak",
+    "spoken": "speak",
+    "led": "lead",
+    "grew": "grow",
+    "grown": "grow",
+    "lost": "lose",
+    "fallen": "fall",
+    "sent": "send",
+    "built": "build",
+    "understood": "understand",
+    "drew": "draw",
+    "drawn": "draw",
+    "broke": "break",
+    "broken": "break",
+    "spent": "spend",
+    "risen": "rise",
+    "drove": "drive",
+    "driven": "drive",
+    "bought": "buy",
+    "wore": "wear",
+    "worn": "wear",
+    "chose": "choose",
+    "chosen": "choose",
+    "sought": "seek",
+    "threw": "throw",
+    "thrown": "throw",
+    "caught": "catch",
+    "dealt": "deal",
+    "won": "win",
+    "forgot": "forget",
+    "forgotten": "forget",
+    "taught": "teach",
+    "sold": "sell",
+    "fought": "fight",
+    "ate": "eat",
+    "eaten": "eat",
+    "sang": "sing",
+    "sung": "sing",
+    "swam": "swim",
+    "swum": "swim",
+    "flew": "fly",
+    "flown": "fly",
+    "drank": "drink",
+    "drunk": "drink",
+    "rode": "ride",
+    "ridden": "ride",
+    "shook": "shake",
+    "shaken": "shake",
+    "stole": "steal",
+    "stolen": "steal",
+    "hid": "hide",
+    "hidden": "hide",
+    "bitten": "bite",
+    "fed": "feed",
+    "fled": "flee",
+    "slept": "sleep",
+    "wept": "weep",
+    "swept": "sweep",
+    "crept": "creep",
+    "lent": "lend",
+    "bent": "bend",
+    "shot": "shoot",
+    "struck": "strike",
+    "stuck": "stick",
+    "hung": "hang",
+    "dug": "dig",
+    "swung": "swing",
+    "borne": "bear",
+    "tore": "tear",
+    "torn": "tear",
+    "swore": "swear",
+    "sworn": "swear",
+    "froze": "freeze",
+    "frozen": "freeze",
+    "woke": "wake",
+    "woken": "wake",
+    "forgave": "forgive",
+    "forgiven": "forgive",
+    "shone": "shine",
+    "slid": "slide",
+    "dying": "die",
+    "lying": "lie",
+    "tying": "tie",
+    # irregular plurals
+    "men": "man",
+    "women": "woman",
+    "children": "child",
+    "feet": "foot",
+    "teeth": "tooth",
+    "geese": "goose",
+    "mice": "mouse",
+    "lives": "life",
+    "wives": "wife",
+    "knives": "knife",
+    "wolves": "wolf",
+    "halves": "half",
+    "shelves": "shelf",
+    "thieves": "thief",
+    "phenomena": "phenomenon",
+    "criteria": "criterion",
+    "analyses": "analysis",
+    "crises": "crisis",
+    "theses": "thesis",
+    "hypotheses": "hypothesis",
+}
+
+# Words that look inflected but are headwords themselves
+UNINFLECTED_WORDS = frozenset(
+    {
+        "always",
+        "perhaps",
+        "news",
+        "series",
+        "species",
+        "whereas",
+        "towards",
+        "afterwards",
+        "sometimes",
+        "besides",
+        "yes",
+        "its",
+        "his",
+        "this",
+        "thus",
+        "bias",
+        "gas",
+        "atlas",
+        "canvas",
+        "lens",
+        "chaos",
+        "ethos",
+        "cosmos",
+        "nothing",
+        "something",
+        "anything",
+        "everything",
+        "morning",
+        "evening",
+        "during",
+        "ceiling",
+        "wedding",
+        "pudding",
+        "indeed",
+        "hundred",
+        "kindred",
+        "sacred",
+        "naked",
+        "wicked",
+        "wretched",
+        "rugged",
+    }
+)
+
+
+def normalize_word(text: str) -> str:
+    """
+    Reduce selected text to a lowercase surface form.
+
+    Strips surrounding punctuation, normalizes curly apostrophes and drops
+    possessive endings: ``"Children's,"`` -> ``"children"``.
+    """
+    word = unicodedata.normalize("NFKC", text).translate(_APOSTROPHES)
+    word = _EDGE_PUNCTUATION.sub("", word.strip().lower())
+
+    if word.endswith("'s"):
+        word = word[:-2]
+    elif word.endswith("s'"):
+        word = word[:-1]
+
+    return word.strip("'")
+
+
+def extract_words(text: str) -> list[str]:
+    """Normalized surface forms of the words in a piece of text, in order"""
+    words = (normalize_word(token) for token in WORD_PATTERN.findall(text))
+    return [word for word in words if word]
+
+
+def _has_vowel(stem: str) -> bool:
+    return any(char in _VOWELS for char in stem)
+
+
+def _ends_cvc(stem: str) -> bool:
+    """Consonant-vowel-consonant ending, as in "hop" or "mak" (Porter's *o)"""
+    if len(stem) < 3:
+        return False
+    c1, v, c2 = stem[-3:]
+    return c1 not in _VOWELS and v in _VOWELS and c2 not in _VOWELS and c2 not in "wxy"
+
+
+def _measure(stem: str) -> int:
+    """Number of vowel-consonant sequences in a stem (Porter's m)"""
+    pattern = "".join("v" if char in _VOWELS else "c" for char in stem)
+    return len(re.findall(r"v+c+", pattern))
+
+
+def _restore_stem(stem: str) -> str:
+    """Undo spelling changes made when adding -ing/-ed ("runn", "mak")"""
+    if len(stem) >= 2 and stem[-1] == stem[-2] and stem[-1] not in "lsz":
+        return stem[:-1]
+    if _measure(stem) == 1 and _ends_cvc(stem):
+        return stem + "e"
+    return stem
+
+
+def lemmatize(word: str) -> str:
+    """
+    Return the headword for a normalized surface form.
+
+    Rule-based: irregular forms come from IRREGULAR_LEMMAS, regular plurals,
+    third-person -s, -ing and -ed endings are stripped. Comparatives and
+    adverbs are left alone since they are headwords in most dictionaries.
+    """
+    if word in IRREGULAR_LEMMAS:
+        return IRREGULAR_LEMMAS[word]
+    if word in UNINFLECTED_WORDS or len(word) <= 3 or not word.isalpha():
+        return word
+
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("sses", "ches", "shes", "xes", "zzes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is", "'s")):
+        return word[:-1]
+
+    if word.endswith("ing") and len(word) > 5:
+        stem = word[:-3]
+        if _has_vowel(stem):
+            return _restore_stem(stem)
+
+    if word.endswith("ied") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("eed"):
+        return word
+    if word.endswith("ed") and len(word) > 4:
+        stem = word[:-2]
+        if _has_vowel(stem):
+            return _restore_stem(stem)
+
+    return word
+
+
+def lookup_candidates(text: str) -> list[str]:
+    """
+    Forms to try, in order, when looking up selected text.
+
+    The lemma comes first so inflections share its cache entry; the surface
+    form follows in case the rules over-stripped a word.
+    """
+    surface = normalize_word(text)
+    if not surface:
+        return []
+
+    lemma = lemmatize(surface)
+    return [lemma, surface] if lemma != surface else [surface]
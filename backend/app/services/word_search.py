@@ -0,0 +1,188 @@
+"""
+Prefix and fuzzy search over a user's saved words.
+
+Prefix matches come from a range scan on the (user_id, word) index; saved
+words are stored lowercased, so the scan is case-insensitive. Typo-tolerant
+matches use trigram similarity: pg_trgm (``%`` operator, GIN index) on
+PostgreSQL and, elsewhere, an in-process trigram index per user kept in an
+LRU and dropped whenever the saved-word index is invalidated.
+
+Similarity follows pg_trgm: words are padded with two leading spaces and one
+trailing space, and the score is shared trigrams over distinct trigrams in
+either word.
+"""
+
+from collections import Counter
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.dictionary import DictionaryWord
+from app.services.user_cache import UserCache
+from app.services.word_index import saved_words_version, word_index
+
+
+def trigrams(word: str) -> set[str]:
+    """pg_trgm-style trigrams of a word"""
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    """pg_trgm similarity of two words, between 0 and 1"""
+    first, second = trigrams(a), trigrams(b)
+    shared = len(first & second)
+    return shared / (len(first) + len(second) - shared) if shared else 0.0
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with prefix"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class TrigramIndex:
+    """Inverted trigram index over one user's words"""
+
+    def __init__(self, words: dict[str, str]):
+        # word -> DictionaryWord id
+        self.words = words
+        self._trigram_counts = {word: len(trigrams(word)) for word in words}
+        self._postings: dict[str, list[str]] = {}
+        for word in words:
+            for trigram in trigrams(word):
+                self._postings.setdefault(trigram, []).append(word)
+
+    def search(
+        self, query: str, threshold: float, limit: int
+    ) -> list[tuple[str, float]]:
+        """Words at least threshold-similar to query, best first"""
+        query_trigrams = trigrams(query)
+        shared: Counter[str] = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._postings.get(trigram, ()))
+
+        scored = []
+        for word, count in shared.items():
+            score = count / (len(query_trigrams) + self._trigram_counts[word] - count)
+            if score >= threshold:
+                scored.append((word, score))
+
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+
+class WordSearchService:
+    """Ranked prefix + fuzzy search over saved words"""
+
+    def __init__(self, max_users: int | None = None):
+        self._indexes: UserCache[TrigramIndex] = UserCache(
+            max_users or settings.WORD_SEARCH_MAX_USERS,
+            lambda user_id: select(DictionaryWord.word, DictionaryWord.id).where(
+                DictionaryWord.user_id == user_id
+            ),
+            lambda rows: TrigramIndex({word: word_id for word, word_id in rows}),
+            saved_words_version,
+            settings.WORD_CACHE_TTL,
+        )
+        word_index.add_listener(self.invalidate)
+
+    async def _fuzzy_postgresql(
+        self, db: AsyncSession, user_id: str, query: str, threshold: float, limit: int
+    ) -> list[tuple[DictionaryWord, float]]:
+        score = func.similarity(DictionaryWord.word, query)
+        rows = await db.execute(
+            select(DictionaryWord, score)
+            .where(
+                DictionaryWord.user_id == user_id,
+                DictionaryWord.word.op("%")(query),
+                score >= threshold,
+            )
+            .order_by(score.desc(), DictionaryWord.word)
+            .limit(limit)
+        )
+        return [(word, float(value)) for word, value in rows]
+
+    async def _fuzzy_in_process(
+        self, db: AsyncSession, user_id: str, query: str, threshold: float, limit: int
+    ) -> list[tuple[DictionaryWord, float]]:
+        index = await self._indexes.get(db, user_id)
+        matches = index.search(query, threshold, limit)
+        if not matches:
+            return []
+
+        # Fetch by primary key alone: with user_id in the WHERE clause SQLite
+        # prefers the (user_id, ...) indexes and scans all of the user's rows
+        ids = [index.words[word] for word, _ in matches]
+        rows = {
+            row.id: row
+            for row in await db.scalars(
+                select(DictionaryWord).where(DictionaryWord.id.in_(ids))
+            )
+            if row.user_id == user_id
+        }
+        return [
+            (rows[word_id], score)
+            for word_id, (_, score) in zip(ids, matches)
+            if word_id in rows
+        ]
+
+    async def search(
+        self, db: AsyncSession, user_id: str, query: str, limit: int = 20
+    ) -> list[DictionaryWord]:
+        """
+        Search saved words.
+
+        Words starting with the query come first (exact match, then
+        alphabetical); remaining slots are filled with fuzzy matches ranked
+        by similarity.
+        """
+        query = query.lower().strip()
+        if not query:
+            return []
+
+        prefix_matches = list(
+            await db.scalars(
+                select(DictionaryWord)
+                .where(
+                    DictionaryWord.user_id == user_id,
+                    DictionaryWord.word >= query,
+                    DictionaryWord.word < _prefix_upper_bound(query),
+                )
+                .order_by(DictionaryWord.word)
+                .limit(limit)
+            )
+        )
+        if len(prefix_matches) >= limit:
+            return prefix_matches
+
+        # Ask for extra fuzzy matches since prefix matches are among them
+        fuzzy = (
+            self._fuzzy_postgresql
+            if db.get_bind().dialect.name == "postgresql"
+            else self._fuzzy_in_process
+        )
+        fuzzy_matches = await fuzzy(
+            db,
+            user_id,
+            query,
+            settings.WORD_SEARCH_SIMILARITY,
+            limit + len(prefix_matches),
+        )
+
+        results = prefix_matches
+        seen = {word.id for word in prefix_matches}
+        for word, _ in fuzzy_matches:
+            if len(results) >= limit:
+                break
+            if word.id not in seen:
+                results.append(word)
+                seen.add(word.id)
+        return results
+
+    def invalidate(self, user_id: str | None) -> None:
+        """Drop a user's trigram index (all indexes if user_id is None)"""
+        self._indexes.invalidate(user_id)
+
+
+word_search_service = WordSearchService()
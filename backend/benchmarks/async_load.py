@@ -0,0 +1,177 @@
+"""
+Load test the sync and async database paths of a request handler.
+
+Serves the same library listing from a sync handler (Session from get_db,
+run by Starlette on its threadpool) and an async one (AsyncSession from
+get_async_db, awaited on the event loop), then fires rising numbers of
+concurrent requests at each through one worker and reports throughput and
+latency. Every request spends --latency ms waiting inside the database
+(a SQLite function that sleeps), standing in for a slow PostgreSQL query.
+Sync requests level off once every threadpool thread (40 by default) is
+waiting; async ones keep scaling with the connection pool.
+
+Usage:
+    uv run python -m benchmarks.async_load [--latency 100] [--requests 400]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.database import (
+    Base,
+    create_async_db_engine,
+    create_db_engine,
+    get_async_db,
+    get_db,
+)
+from app.models.book import Book
+
+USER_ID = "benchmark-user"
+BOOKS = 20
+CONCURRENCY = (10, 40, 100, 200)
+
+
+def _wait_ms(ms: int) -> int:
+    time.sleep(ms / 1000)
+    return ms
+
+
+def _add_wait_function(engine) -> None:
+    @event.listens_for(engine, "connect")
+    def add_wait_function(dbapi_connection, connection_record):
+        dbapi_connection.create_function("wait_ms", 1, _wait_ms)
+
+
+def _app(latency_ms: int) -> FastAPI:
+    app = FastAPI()
+    listing = select(Book.id, Book.name, Book.current_page).where(
+        Book.user_id == USER_ID
+    )
+    wait = select(func.wait_ms(latency_ms))
+
+    @app.get("/sync")
+    def list_books_sync(db: Session = Depends(get_db)):
+        db.execute(wait)
+        return [book.id for book in db.execute(listing)]
+
+    @app.get("/async")
+    async def list_books_async(db: AsyncSession = Depends(get_async_db)):
+        await db.execute(wait)
+        return [book.id for book in await db.execute(listing)]
+
+    return app
+
+
+async def _load(app: FastAPI, path: str, concurrency: int, total: int) -> dict:
+    samples: list[float] = []
+    queue = iter(range(total))
+
+    async def user(client: httpx.AsyncClient) -> None:
+        for _ in queue:
+            start = time.perf_counter()
+            response = await client.get(path)
+            samples.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.text
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(user(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    ordered = sorted(samples)
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--latency", type=int, default=100, help="ms spent in the database"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=400, help="requests per concurrency level"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{Path(directory) / 'bench.db'}"
+        pool = {"pool_size": max(CONCURRENCY), "max_overflow": 0}
+        engine = create_db_engine(url, **pool)
+        async_engine = create_async_db_engine(url, **pool)
+        _add_wait_function(engine)
+        _add_wait_function(async_engine.sync_engine)
+
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(bind=engine)
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+        with SessionLocal() as db:
+            db.execute(
+                insert(Book),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "user_id": USER_ID,
+                        "name": f"Book {index}",
+                        "content": ["page"],
+                        "current_page": 0,
+                        "total_pages": 1,
+                        "file_size": 4,
+                    }
+                    for index in range(BOOKS)
+                ],
+            )
+            db.commit()
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        async def override_get_async_db():
+            async with AsyncSessionLocal() as db:
+                yield db
+
+        app = _app(args.latency)
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_async_db] = override_get_async_db
+
+        async def run() -> None:
+            print(
+                f"{args.latency} ms in the database per request, "
+                f"{args.requests} requests per level, one worker"
+            )
+            for concurrency in CONCURRENCY:
+                for label, path in (("sync", "/sync"), ("async", "/async")):
+                    result = await _load(app, path, concurrency, args.requests)
+                    print(
+                        f"{concurrency:>4} concurrent  {label:<6}"
+                        f"{result['rps']:8.0f} req/s   "
+                        f"p50 {result['p50']:8.1f} ms   p95 {result['p95']:8.1f} ms"
+                    )
+            await async_engine.dispose()
+
+        asyncio.run(run())
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Benchmark the batch saved-words check at page scale.
+
+Fills a temporary SQLite database with a user's saved words, then times
+POST /api/v1/dictionary/check for a 400-word page, both with an explicit
+word list and by book page, against the per-word GET /check/{word} calls it
+replaces, and the in-memory word index lookup behind the checks.
+
+Usage:
+    uv run python -m benchmarks.check_words [--saved 5000] [--rounds 50]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import string
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.security import create_access_token, get_password_hash
+from app.db.database import (
+    Base,
+    create_async_db_engine,
+    create_db_engine,
+    get_async_db,
+)
+from app.main import app
+from app.models.book import Book
+from app.models.dictionary import DictionaryWord
+from app.models.user import User
+from app.services.word_index import find_saved_words, word_index
+
+PAGE_WORDS = 400
+
+
+def _random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+
+
+def _timed(call, rounds: int) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        response = call()
+        samples.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{label:<32} p50 {statistics.median(ordered):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--saved", type=int, default=5000, help="saved words")
+    parser.add_argument("--rounds", type=int, default=50, help="timed requests")
+    args = parser.parse_args()
+
+    # A file, so the sync session used for seeding and the app's async
+    # session see the same data
+    url = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    engine = create_db_engine(url)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    # Outside a with block, TestClient runs each request on a new event loop,
+    # so async connections are not pooled
+    AsyncSessionLocal = async_sessionmaker(
+        create_async_db_engine(url, poolclass=NullPool), expire_on_commit=False
+    )
+
+    rng = random.Random(42)
+    saved = sorted({_random_word(rng) for _ in range(args.saved)})
+    # A page mixing saved words with words that are not in the dictionary
+    page_words = [
+        rng.choice(saved) if rng.random() < 0.1 else _random_word(rng)
+        for _ in range(PAGE_WORDS)
+    ]
+
+    with SessionLocal() as db:
+        user = User(
+            id=str(uuid.uuid4()),
+            email="bench@example.com",
+            password_hash=get_password_hash("benchmark"),
+        )
+        db.add(user)
+        db.add_all(
+            DictionaryWord(
+                id=str(uuid.uuid4()), user_id=user.id, word=word, definition="-"
+            )
+            for word in saved
+        )
+        book = Book(
+            id=str(uuid.uuid4()),
+            user_id=user.id,
+            name="Benchmark",
+            content=[" ".join(page_words)],
+            total_pages=1,
+            file_size=1,
+        )
+        db.add(book)
+        db.commit()
+        user_id, book_id = user.id, book.id
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    client = TestClient(app)
+    client.headers["Authorization"] = f"Bearer {create_access_token(user_id)}"
+
+    words = set(page_words)
+    with SessionLocal() as db:
+        query_samples = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            find_saved_words(db, user_id, words)
+            query_samples.append((time.perf_counter() - start) * 1000)
+
+    async def time_lookups() -> float:
+        async with AsyncSessionLocal() as db:
+            await word_index.contains(db, user_id, page_words[0])
+            start = time.perf_counter()
+            for word in page_words:
+                await word_index.contains(db, user_id, word)
+            return (time.perf_counter() - start) / len(page_words) * 1e6
+
+    per_lookup_us = asyncio.run(time_lookups())
+
+    print(f"{len(saved)} saved words, {PAGE_WORDS}-word page, {args.rounds} rounds")
+    _report("find_saved_words (query only)", query_samples)
+    print(f"{'word_index.contains':<32} {per_lookup_us:8.3f} us per word")
+    _report(
+        "POST /check (words)",
+        _timed(
+            lambda: client.post("/api/v1/dictionary/check", json={"words": page_words}),
+            args.rounds,
+        ),
+    )
+    _report(
+        "POST /check (book page)",
+        _timed(
+            lambda: client.post(
+                "/api/v1/dictionary/check", json={"bookId": book_id, "pageIndex": 0}
+            ),
+            args.rounds,
+        ),
+    )
+
+    per_word = []
+    for _ in range(max(1, args.rounds // 10)):
+        start = time.perf_counter()
+        for word in page_words:
+            client.get(f"/api/v1/dictionary/check/{word}")
+        per_word.append((time.perf_counter() - start) * 1000)
+    _report(f"{PAGE_WORDS} x GET /check/{{word}}", per_word)
+
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark concurrent reads and writes on SQLite per engine configuration.
+
+Runs reader threads (library listing plus a book fetch) alongside writer
+threads (reading-progress updates) against a temporary database file, once
+with SQLite's default rollback journal and once with the pragmas from
+settings (WAL, synchronous=NORMAL, mmap), and reports throughput, read
+latency and "database is locked" errors.
+
+Usage:
+    uv run python -m benchmarks.db_concurrency [--readers 8] [--writers 2] [--seconds 5]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, create_db_engine, sqlite_pragmas
+from app.models.book import Book
+
+USER_ID = "benchmark-user"
+BOOKS = 20
+PAGES = 50
+
+CONFIGURATIONS = {
+    "rollback journal (defaults)": {
+        "journal_mode": "delete",
+        "synchronous": "full",
+        "busy_timeout": 5000,
+    },
+    "tuned (settings)": sqlite_pragmas(),
+}
+
+
+def _seed(SessionLocal, rng: random.Random) -> list[str]:
+    page = " ".join("word" * rng.randint(1, 3) for _ in range(300))
+    book_ids = [str(uuid.uuid4()) for _ in range(BOOKS)]
+    with SessionLocal() as db:
+        db.execute(
+            insert(Book),
+            [
+                {
+                    "id": book_id,
+                    "user_id": USER_ID,
+                    "name": f"Book {index}",
+                    "content": [page] * PAGES,
+                    "current_page": 0,
+                    "total_pages": PAGES,
+                    "file_size": len(page) * PAGES,
+                }
+                for index, book_id in enumerate(book_ids)
+            ],
+        )
+        db.commit()
+    return book_ids
+
+
+def _run(pragmas: dict, args) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_db_engine(
+            f"sqlite:///{Path(directory) / 'bench.db'}",
+            pragmas=pragmas,
+            pool_size=args.readers + args.writers,
+        )
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(bind=engine)
+        book_ids = _seed(SessionLocal, random.Random(42))
+
+        stop = threading.Event()
+        lock = threading.Lock()
+        totals = {"reads": 0, "writes": 0, "locked": 0}
+        read_ms: list[float] = []
+
+        def reader(seed: int) -> None:
+            rng = random.Random(seed)
+            reads, samples, locked = 0, [], 0
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    with SessionLocal() as db:
+                        db.execute(
+                            select(Book.id, Book.name, Book.current_page).where(
+                                Book.user_id == USER_ID
+                            )
+                        ).all()
+                        db.get(Book, rng.choice(book_ids))
+                except OperationalError:
+                    locked += 1
+                    continue
+                samples.append((time.perf_counter() - start) * 1000)
+                reads += 1
+            with lock:
+                totals["reads"] += reads
+                totals["locked"] += locked
+                read_ms.extend(samples)
+
+        def writer(seed: int) -> None:
+            rng = random.Random(seed)
+            writes, locked = 0, 0
+            while not stop.is_set():
+                try:
+                    with SessionLocal() as db:
+                        db.execute(
+                            update(Book)
+                            .where(Book.id == rng.choice(book_ids))
+                            .values(current_page=rng.randrange(PAGES))
+                        )
+                        db.commit()
+                except OperationalError:
+                    locked += 1
+                    continue
+                writes += 1
+            with lock:
+                totals["writes"] += writes
+                totals["locked"] += locked
+
+        threads = [
+            threading.Thread(target=reader, args=(i,)) for i in range(args.readers)
+        ] + [
+            threading.Thread(target=writer, args=(1000 + i,))
+            for i in range(args.writers)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    ordered = sorted(read_ms) or [0.0]
+    return {
+        **totals,
+        "read_p50": statistics.median(ordered),
+        "read_p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=8, help="reader threads")
+    parser.add_argument("--writers", type=int, default=2, help="writer threads")
+    parser.add_argument("--seconds", type=float, default=5, help="run time per config")
+    args = parser.parse_args()
+
+    print(
+        f"{args.readers} readers, {args.writers} writers, "
+        f"{args.seconds:g} s per configuration"
+    )
+    for label, pragmas in CONFIGURATIONS.items():
+        result = _run(pragmas, args)
+        print(
+            f"{label:<28} reads {result['reads'] / args.seconds:8.0f}/s   "
+            f"writes {result['writes'] / args.seconds:7.0f}/s   "
+            f"read p50 {result['read_p50']:6.2f} ms  p95 {result['read_p95']:6.2f} ms   "
+            f"locked {result['locked']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
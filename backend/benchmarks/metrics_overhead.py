@@ -0,0 +1,170 @@
+"""
+Benchmark the cost of request and query instrumentation.
+
+Times the two pieces of instrumentation on every request in isolation:
+MetricsMiddleware around an ASGI app that does nothing, and the engine
+listeners around "SELECT 1" on in-memory SQLite, each against the same
+call without it. Then times a typical request, GET /api/v1/dictionary with
+--saved words on a temporary SQLite database, and reports what the
+middleware plus one timed query per statement of that request add to it.
+
+Usage:
+    uv run python -m benchmarks.metrics_overhead [--calls 100000] [--rounds 200]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.core.metrics import MetricsMiddleware, instrument_engine
+from app.core.security import create_access_token, get_password_hash
+from app.db.database import (
+    Base,
+    create_async_db_engine,
+    create_db_engine,
+    get_async_db,
+)
+from app.main import app
+from app.models.dictionary import DictionaryWord
+from app.models.user import User
+
+
+async def _empty_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _noop(message):
+    pass
+
+
+def _per_call_us(app, calls: int) -> float:
+    # A matched route, as the router leaves it in the scope
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/books/abc",
+        "path_params": {"book_id": "abc"},
+        "route": SimpleNamespace(path_format="/{book_id}"),
+    }
+
+    async def run():
+        start = time.perf_counter()
+        for _ in range(calls):
+            await app(scope, None, _noop)
+        return time.perf_counter() - start
+
+    return asyncio.run(run()) / calls * 1e6
+
+
+def middleware_us(calls: int) -> float:
+    """Microseconds MetricsMiddleware adds to one request"""
+    bare = min(_per_call_us(_empty_app, calls) for _ in range(3))
+    wrapped = min(_per_call_us(MetricsMiddleware(_empty_app), calls) for _ in range(3))
+    return wrapped - bare
+
+
+def _per_statement_us(engine, calls: int) -> float:
+    with engine.connect() as connection:
+        start = time.perf_counter()
+        for _ in range(calls):
+            connection.exec_driver_sql("SELECT 1")
+        return (time.perf_counter() - start) / calls * 1e6
+
+
+def query_us(calls: int) -> float:
+    """Microseconds the engine listeners add to one statement"""
+    plain = create_engine("sqlite://")
+    instrumented = create_engine("sqlite://")
+    instrument_engine(instrumented)
+    bare = min(_per_statement_us(plain, calls) for _ in range(3))
+    timed = min(_per_statement_us(instrumented, calls) for _ in range(3))
+    return timed - bare
+
+
+def dictionary_request(saved: int, rounds: int) -> tuple[float, float]:
+    """Median microseconds and statements of GET /api/v1/dictionary"""
+    url = f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"
+    engine = create_db_engine(url)
+    Base.metadata.create_all(bind=engine)
+    async_engine = create_async_db_engine(url)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    with sessionmaker(bind=engine)() as db:
+        user = User(
+            id=str(uuid.uuid4()),
+            email="bench@example.com",
+            password_hash=get_password_hash("benchmark"),
+        )
+        db.add(user)
+        db.add_all(
+            DictionaryWord(
+                id=str(uuid.uuid4()), user_id=user.id, word=f"word{i}", definition="-"
+            )
+            for i in range(saved)
+        )
+        db.commit()
+        user_id = user.id
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    statements = 0
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        statements += 1
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    headers = {"Authorization": f"Bearer {create_access_token(user_id)}"}
+    samples = []
+    with TestClient(app) as client:
+        client.get("/api/v1/dictionary", headers=headers)
+        statements = 0
+        for _ in range(rounds):
+            start = time.perf_counter()
+            response = client.get("/api/v1/dictionary", headers=headers)
+            samples.append((time.perf_counter() - start) * 1e6)
+            assert response.status_code == 200, response.text
+    app.dependency_overrides.clear()
+    return statistics.median(samples), statements / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=100_000, help="timed calls")
+    parser.add_argument("--rounds", type=int, default=200, help="timed requests")
+    parser.add_argument("--saved", type=int, default=50, help="saved words")
+    args = parser.parse_args()
+
+    per_request = middleware_us(args.calls)
+    per_query = query_us(args.calls)
+    request, statements = dictionary_request(args.saved, args.rounds)
+    overhead = per_request + statements * per_query
+
+    print(f"{'middleware':<28} {per_request:7.2f} us per request")
+    print(f"{'query timing':<28} {per_query:7.2f} us per statement")
+    print(
+        f"{'GET /api/v1/dictionary':<28} {request:7.0f} us median, "
+        f"{statements:.0f} statements"
+    )
+    print(
+        f"{'instrumentation':<28} {overhead:7.2f} us per request "
+        f"({overhead / request:.2%} of request time)"
+    )
+
+
+if __name__ == "__main__":
+    main()
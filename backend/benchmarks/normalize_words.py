@@ -0,0 +1,82 @@
+"""
+Measure what word normalization saves on the lookups of a real book.
+
+Splits a book's text on whitespace, as a reader selects words (punctuation
+and possessives attached), and compares two cache keys for each selection:
+the lowercased text the service used before normalization, and the first
+candidate of lookup_candidates (the lemma). Reports the distinct lookups
+and the hit ratio of a cache that sees every word of the book once, plus
+how many distinct keys are not plausible headwords ("word,", "children's")
+and so would miss upstream.
+
+Upstream 404s are estimated from the shape of the keys, not requested.
+
+Usage:
+    uv run python -m benchmarks.normalize_words [--pdf book.pdf | --text book.txt]
+"""
+
+import argparse
+import re
+from pathlib import Path
+
+from app.services.sample_book import SAMPLE_BOOK_CONTENT
+from app.services.word_normalizer import lookup_candidates
+
+# Letters with inner apostrophes or hyphens: what a dictionary can have
+HEADWORD = re.compile(r"[a-z]+(?:['-][a-z]+)*")
+
+
+def load_pages(pdf: Path | None, text: Path | None) -> list[str]:
+    if pdf is not None:
+        from app.services.pdf_service import pdf_service
+
+        return pdf_service.extract_text_from_pdf(pdf.read_bytes())
+    if text is not None:
+        return [text.read_text(encoding="utf-8")]
+    return list(SAMPLE_BOOK_CONTENT)
+
+
+def measure(pages: list[str]) -> dict:
+    selections = [token for page in pages for token in page.split()]
+    before = [token.lower().strip() for token in selections]
+    after = [
+        candidates[0] for candidates in map(lookup_candidates, selections) if candidates
+    ]
+
+    def summary(keys: list[str]) -> dict:
+        distinct = set(keys)
+        return {
+            "lookups": len(keys),
+            "distinct": len(distinct),
+            "hit_ratio": 1 - len(distinct) / len(keys) if keys else 0.0,
+            "not_headword": sum(1 for key in distinct if not HEADWORD.fullmatch(key)),
+        }
+
+    return {"before": summary(before), "after": summary(after)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--pdf", type=Path, help="book to extract with pdf_service")
+    source.add_argument("--text", type=Path, help="plain-text book")
+    args = parser.parse_args()
+
+    result = measure(load_pages(args.pdf, args.text))
+    before, after = result["before"], result["after"]
+
+    print(f"{'selections':<28} {before['lookups']:>8}")
+    for label, row in (("lowercased text", before), ("normalized lemma", after)):
+        print(
+            f"{label:<28} {row['distinct']:>8} distinct, "
+            f"{row['hit_ratio']:6.1%} cache hits, "
+            f"{row['not_headword']:>6} not headwords"
+        )
+    print(
+        f"{'distinct lookups saved':<28} "
+        f"{1 - after['distinct'] / max(before['distinct'], 1):8.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark dictionary search on a large personal dictionary.
+
+Fills an in-memory SQLite database with one user's saved words and times
+prefix queries (index range scan) and misspelled queries (in-process
+trigram index) through WordSearchService.
+
+Usage:
+    uv run python -m benchmarks.search_words [--saved 50000] [--rounds 200]
+"""
+
+import argparse
+import random
+import statistics
+import string
+import time
+import uuid
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.dictionary import DictionaryWord
+from app.services.word_search import WordSearchService
+
+USER_ID = "benchmark-user"
+
+
+def _random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12)))
+
+
+def _misspell(rng: random.Random, word: str) -> str:
+    position = rng.randrange(len(word))
+    return word[:position] + rng.choice(string.ascii_lowercase) + word[position + 1 :]
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{label:<28} p50 {statistics.median(ordered):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def _timed(service, db, queries: list[str]) -> list[float]:
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        service.search(db, USER_ID, query)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--saved", type=int, default=50_000, help="saved words")
+    parser.add_argument("--rounds", type=int, default=200, help="queries per kind")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    rng = random.Random(42)
+    saved = sorted({_random_word(rng) for _ in range(args.saved)})
+
+    with SessionLocal() as db:
+        db.execute(
+            insert(DictionaryWord),
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": USER_ID,
+                    "word": word,
+                    "definition": "-",
+                }
+                for word in saved
+            ],
+        )
+        db.commit()
+
+        service = WordSearchService(max_users=1)
+        start = time.perf_counter()
+        service.search(db, USER_ID, "zzzzzz")
+        build_ms = (time.perf_counter() - start) * 1000
+
+        prefixes = [rng.choice(saved)[:3] for _ in range(args.rounds)]
+        typos = [_misspell(rng, rng.choice(saved)) for _ in range(args.rounds)]
+
+        print(f"{len(saved)} saved words, {args.rounds} queries per kind")
+        print(f"{'trigram index build':<28} {build_ms:8.2f} ms (once per user)")
+        _report("prefix query", _timed(service, db, prefixes))
+        _report("misspelled query", _timed(service, db, typos))
+
+
+if __name__ == "__main__":
+    main()
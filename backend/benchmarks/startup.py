@@ -0,0 +1,127 @@
+"""
+Benchmark cold start: import time of app.main and time to first response.
+
+Each run uses a fresh interpreter. Import time is measured around
+``import app.main``; time to first response from spawning uvicorn until
+GET /health first answers 200. Both are compared with the budgets below, and
+the script exits non-zero when a median is over budget, so it can gate CI.
+Also reports heavy modules that were imported eagerly although they are only
+needed by some requests.
+
+Usage:
+    uv run python -m benchmarks.startup [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Medians on a small instance, with bytecode already compiled
+IMPORT_BUDGET_MS = 1500
+FIRST_RESPONSE_BUDGET_MS = 3000
+
+# Only needed by uploads (pypdf) and dictionary lookups (httpx)
+LAZY_MODULES = ("pypdf", "httpx")
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({"import_ms": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+
+def measure_import() -> dict:
+    """Import app.main in a fresh interpreter: {"import_ms", "loaded"}"""
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT % (LAZY_MODULES,)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(timeout: float = 30) -> float:
+    """Milliseconds from spawning uvicorn until GET /health answers 200"""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except OSError:
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited before serving a request")
+                time.sleep(0.005)
+        raise TimeoutError(f"No response from {url} within {timeout} s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _report(label: str, samples: list[float], budget: float) -> bool:
+    median = statistics.median(samples)
+    within = median <= budget
+    print(
+        f"{label:<20} median {median:7.0f} ms   min {min(samples):7.0f} ms   "
+        f"max {max(samples):7.0f} ms   budget {budget:5d} ms   "
+        f"{'ok' if within else 'OVER BUDGET'}"
+    )
+    return within
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="cold starts per metric")
+    args = parser.parse_args()
+
+    # The first interpreter may compile bytecode; do not count it
+    measure_import()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    first_responses = [measure_first_response() for _ in range(args.runs)]
+
+    print(f"{args.runs} cold starts each")
+    within = _report(
+        "import app.main", [run["import_ms"] for run in imports], IMPORT_BUDGET_MS
+    )
+    within &= _report("first response", first_responses, FIRST_RESPONSE_BUDGET_MS)
+
+    loaded = sorted({module for run in imports for module in run["loaded"]})
+    if loaded:
+        print(f"imported eagerly: {', '.join(loaded)}")
+        within = False
+
+    sys.exit(0 if within else 1)
+
+
+if __name__ == "__main__":
+    main()
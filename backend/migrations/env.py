@@ -0,0 +1,87 @@
+"""Alembic environment: migrates the database of settings.DATABASE_URL"""
+
+import logging
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import inspect
+from sqlalchemy.pool import NullPool
+
+import app.models  # noqa: F401 - registers every table on Base.metadata
+from app.core.config import settings
+from app.db.database import Base, create_db_engine
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+logger = logging.getLogger("alembic.env")
+
+
+def _database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+
+def _adopt_unversioned_database(connection) -> None:
+    """
+    Stamp a database created by the app's create_all, before migrations
+    existed, with the revision its schema matches.
+
+    Such a database has the app's tables but no alembic_version table, so
+    upgrading would try to create the tables again. Its schema is the
+    initial one (0001), or includes 0002 if refresh_tokens was created too;
+    0003 and 0004 only add or drop what is missing or present, so they
+    apply to either.
+    """
+    migration_context = context.get_context()
+    if migration_context.opts.get("dont_mutate"):
+        return
+    tables = set(inspect(connection).get_table_names())
+    if "alembic_version" in tables or "users" not in tables:
+        return
+    revision = "0002" if "refresh_tokens" in tables else "0001"
+    logger.warning("Database has tables but no alembic_version; stamping %s", revision)
+    migration_context.stamp(context.script, revision)
+
+
+def run_migrations_offline() -> None:
+    """Emit the migrations as SQL instead of running them"""
+    url = _database_url()
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run the migrations on a connection of the app's engine setup"""
+    engine = create_db_engine(_database_url(), poolclass=NullPool)
+
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite cannot alter columns in place; batch mode copies the table
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+
+        with context.begin_transaction():
+            _adopt_unversioned_database(connection)
+            context.run_migrations()
+
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,154 @@
+"""Word sources, review scheduling, sessions and the upserts' unique indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+
+import logging
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Check-then-insert could race before the upserts; keep the first saved copy
+# of a word and the latest upload of a book
+DUPLICATE_WORDS = (
+    "FROM dictionary_words w JOIN dictionary_words older "
+    "ON older.user_id = w.user_id AND older.word = w.word "
+    "AND (older.added_at < w.added_at "
+    "OR (older.added_at = w.added_at AND older.id < w.id))"
+)
+DUPLICATE_BOOKS = (
+    "FROM books b JOIN books newer "
+    "ON newer.user_id = b.user_id AND newer.name = b.name "
+    "AND (newer.updated_at > b.updated_at "
+    "OR (newer.updated_at = b.updated_at AND newer.id > b.id))"
+)
+
+
+def _log_duplicates() -> None:
+    """Log each row deleted to make way for the unique indexes"""
+    if context.is_offline_mode():
+        return
+    connection = op.get_bind()
+    for row in connection.execute(
+        sa.text(f"SELECT DISTINCT w.id, w.user_id, w.word {DUPLICATE_WORDS}")
+    ):
+        logger.warning(
+            "Deleting duplicate saved word %r of user %s (id %s)",
+            row.word,
+            row.user_id,
+            row.id,
+        )
+    for row in connection.execute(
+        sa.text(f"SELECT DISTINCT b.id, b.user_id, b.name {DUPLICATE_BOOKS}")
+    ):
+        logger.warning(
+            "Deleting older upload of book %r of user %s (id %s)",
+            row.name,
+            row.user_id,
+            row.id,
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # New NOT NULL columns are added nullable, filled, then tightened, which
+    # works the same on PostgreSQL and on SQLite (no non-constant defaults)
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("token_version", sa.Integer(), nullable=True))
+    op.execute("UPDATE users SET token_version = 0")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.alter_column(
+            "token_version", existing_type=sa.Integer(), nullable=False
+        )
+
+    with op.batch_alter_table("dictionary_words") as batch_op:
+        batch_op.add_column(sa.Column("book_id", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("page_index", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("char_offset", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("due_at", sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column("interval_days", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("ease", sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column("repetitions", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("reviewed_at", sa.DateTime(), nullable=True))
+    # Saved words become due for review from the moment they were saved
+    op.execute(
+        "UPDATE dictionary_words "
+        "SET due_at = added_at, interval_days = 0, ease = 2.5, repetitions = 0"
+    )
+    with op.batch_alter_table("dictionary_words") as batch_op:
+        batch_op.alter_column("due_at", existing_type=sa.DateTime(), nullable=False)
+        batch_op.alter_column(
+            "interval_days", existing_type=sa.Integer(), nullable=False
+        )
+        batch_op.alter_column("ease", existing_type=sa.Float(), nullable=False)
+        batch_op.alter_column("repetitions", existing_type=sa.Integer(), nullable=False)
+
+    _log_duplicates()
+    op.execute(
+        f"DELETE FROM dictionary_words WHERE id IN (SELECT w.id {DUPLICATE_WORDS})"
+    )
+    op.execute(f"DELETE FROM books WHERE id IN (SELECT b.id {DUPLICATE_BOOKS})")
+    op.create_index(
+        "ix_dictionary_words_user_word",
+        "dictionary_words",
+        ["user_id", "word"],
+        unique=True,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_books_user_name",
+        "books",
+        ["user_id", "name"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "refresh_tokens",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("token_hash", sa.String(length=64), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_refresh_tokens_token_hash", "refresh_tokens", ["token_hash"], unique=True
+    )
+    op.create_index(
+        "ix_refresh_tokens_user_expires", "refresh_tokens", ["user_id", "expires_at"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("refresh_tokens")
+    op.drop_index("ix_books_user_name", table_name="books")
+    op.drop_index("ix_dictionary_words_user_word", table_name="dictionary_words")
+    with op.batch_alter_table("dictionary_words") as batch_op:
+        for column in (
+            "reviewed_at",
+            "repetitions",
+            "ease",
+            "interval_days",
+            "due_at",
+            "char_offset",
+            "page_index",
+            "book_id",
+        ):
+            batch_op.drop_column(column)
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("token_version")
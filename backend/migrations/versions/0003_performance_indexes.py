@@ -0,0 +1,95 @@
+"""Performance indexes on books and dictionary_words
+
+Replaces the single-column indexes of the initial schema with composite
+indexes matching the queries: keyset pages by date, words of a book in
+reading order, the review queue and trigram search (PostgreSQL). Drops the
+indexes that duplicate a primary key or the leading column of another index,
+which every insert had to maintain for nothing.
+
+On PostgreSQL the indexes are built CONCURRENTLY so a deploy does not block
+writes to a large table while they build.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 09:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DICTIONARY_WORDS_INDEXES = {
+    "ix_dictionary_words_user_added": ["user_id", "added_at", "id"],
+    "ix_dictionary_words_user_book": [
+        "user_id",
+        "book_id",
+        "page_index",
+        "char_offset",
+    ],
+    "ix_dictionary_words_user_due": ["user_id", "due_at"],
+}
+
+# Covered by the primary key or by ix_books_user_name / ix_dictionary_words_*
+REDUNDANT_INDEXES = {
+    "ix_books_id": ("books", ["id"]),
+    "ix_books_user_id": ("books", ["user_id"]),
+    "ix_dictionary_words_id": ("dictionary_words", ["id"]),
+    "ix_dictionary_words_user_id": ("dictionary_words", ["user_id"]),
+    "ix_dictionary_words_word": ("dictionary_words", ["word"]),
+}
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def _create_index(name: str, columns: list[str], **kwargs) -> None:
+    # Databases created by create_all may already have the newer indexes
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            op.create_index(
+                name,
+                "dictionary_words",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+    else:
+        op.create_index(name, "dictionary_words", columns, if_not_exists=True, **kwargs)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, columns in DICTIONARY_WORDS_INDEXES.items():
+        _create_index(name, columns)
+
+    if _is_postgresql():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        _create_index(
+            "ix_dictionary_words_word_trgm",
+            ["word"],
+            postgresql_using="gin",
+            postgresql_ops={"word": "gin_trgm_ops"},
+        )
+
+    for name, (table, _) in REDUNDANT_INDEXES.items():
+        op.drop_index(name, table_name=table, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, (table, columns) in REDUNDANT_INDEXES.items():
+        op.create_index(name, table, columns)
+
+    if _is_postgresql():
+        op.drop_index("ix_dictionary_words_word_trgm", table_name="dictionary_words")
+    for name in DICTIONARY_WORDS_INDEXES:
+        op.drop_index(name, table_name="dictionary_words")
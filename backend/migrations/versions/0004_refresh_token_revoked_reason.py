@@ -0,0 +1,46 @@
+"""Reason a refresh token was revoked
+
+Tokens revoked by rotation and tokens revoked by logout were both marked
+only with revoked_at, so a client retrying a refresh after logging out was
+taken for a thief and every session of the user ended. revoked_reason tells
+the two apart; tokens revoked before this revision keep a NULL reason and
+are rejected without ending other sessions.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_revoked_reason() -> bool:
+    columns = sa.inspect(op.get_bind()).get_columns("refresh_tokens")
+    return any(column["name"] == "revoked_reason" for column in columns)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by create_all may already have the column
+    if _has_revoked_reason():
+        return
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.add_column(
+            sa.Column("revoked_reason", sa.String(length=16), nullable=True)
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.drop_column("revoked_reason")
@@ -1,32 +1,78 @@
 """Pytest configuration and fixtures for tests"""
 
+import tempfile
 import uuid
+from contextlib import contextmanager
+from pathlib import Path
 
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-
-from app.core.security import create_access_token, get_password_hash
-from app.db.database import Base, get_db
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.passwords import email_throttle, ip_throttle
+from app.core.rate_limit import get_rate_limit_backend
+from app.core.security import (
+    create_access_token,
+    get_password_hash,
+    principal_cache,
+    token_versions,
+)
+from app.db.database import (
+    Base,
+    create_async_db_engine,
+    create_db_engine,
+    get_async_db,
+    get_db,
+)
 from app.main import app
+from app.services.word_index import word_index
 
 # Import models to ensure they are registered with Base.metadata
 from app.models.book import Book
 from app.models.dictionary import DictionaryWord
+from app.models.refresh_token import RefreshToken
 from app.models.settings import UserSettings
 from app.models.user import User
 
-# Use in-memory SQLite database for tests with StaticPool
-# StaticPool ensures the same connection is reused, keeping the in-memory DB alive
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,  # Use StaticPool to maintain single connection
+# Temporary SQLite file shared by the sync engine (fixtures, sync routes) and
+# the async engine (async routes); an in-memory database could not be seen
+# from both. Durability is irrelevant here, so fsync is off.
+TEST_DATABASE_PATH = Path(tempfile.mkdtemp(prefix="greatreading-tests-")) / "test.db"
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{TEST_DATABASE_PATH}"
+TEST_PRAGMAS = {"journal_mode": "wal", "synchronous": "off", "busy_timeout": 5000}
+
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL, pragmas=TEST_PRAGMAS)
+# Each TestClient runs its own event loop, so async connections are not pooled
+async_engine = create_async_db_engine(
+    SQLALCHEMY_DATABASE_URL, pragmas=TEST_PRAGMAS, poolclass=NullPool
 )
+AsyncTestingSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+@contextmanager
+def record_statements():
+    """Collect the SQL sent through either engine while the block runs"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = [engine, async_engine.sync_engine]
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", record)
+
 
 # Test user credentials
 TEST_USER_EMAIL = "test@example.com"
@@ -41,18 +87,58 @@ def setup_db():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="function", autouse=True)
+def disable_definition_prewarm(monkeypatch):
+    """Keep book uploads from looking up definitions in the background"""
+    monkeypatch.setattr(settings, "DEFINITION_PREWARM_ENABLED", False)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def reset_principal_cache():
+    """Start every test with no cached access tokens"""
+    principal_cache.clear()
+    token_versions.clear()
+    yield
+    principal_cache.clear()
+    token_versions.clear()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def reset_login_throttles():
+    """Forget failed sign-in attempts of earlier tests"""
+    ip_throttle.clear()
+    email_throttle.clear()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def reset_rate_limits():
+    """Start every test with full rate-limit buckets"""
+    get_rate_limit_backend().clear()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def reset_word_index():
+    """Start every test with an empty saved-word index"""
+    word_index.clear()
+    yield
+    word_index.clear()
+
+
 @pytest.fixture(scope="function")
 def db_session():
-    """Create a database session for each test"""
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = sessionmaker(autocommit=False, autoflush=False, bind=connection)()
+    """Create a database session for each test (the tables are dropped after it)"""
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
 
     yield session
 
     session.close()
-    transaction.rollback()
-    connection.close()
+
+
+@pytest_asyncio.fixture(scope="function")
+async def async_db_session():
+    """Create an async database session, for services called by async routes"""
+    async with AsyncTestingSessionLocal() as session:
+        yield session
 
 
 @pytest.fixture(scope="function")
@@ -86,7 +172,12 @@ def client(db_session):
         finally:
             pass
 
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
 
     with TestClient(app) as test_client:
         yield test_client
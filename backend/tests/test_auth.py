@@ -0,0 +1,288 @@
+"""Tests for authentication endpoints and password hashing"""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core import passwords
+from app.core.passwords import (
+    MIN_ROUNDS,
+    AttemptThrottle,
+    PasswordHasher,
+    PasswordHasherBusyError,
+    calibrate_rounds,
+    email_throttle,
+    password_hasher,
+)
+from app.core.security import hash_refresh_token
+from app.db.database import get_db
+from app.main import app
+from app.models.refresh_token import RefreshToken
+from tests.conftest import TEST_USER_EMAIL, TEST_USER_PASSWORD, record_statements
+
+
+def _login(client, password=TEST_USER_PASSWORD, email=TEST_USER_EMAIL):
+    return client.post(
+        "/api/v1/auth/login", data={"username": email, "password": password}
+    )
+
+
+def test_signup_and_login(client):
+    response = client.post(
+        "/api/v1/auth/signup",
+        json={"email": "new@example.com", "password": "secret123"},
+    )
+    assert response.status_code == 201
+    assert response.json()["email"] == "new@example.com"
+
+    response = _login(client, "secret123", "new@example.com")
+    assert response.status_code == 200
+    token = response.json()["access_token"]
+
+    response = client.get(
+        "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.json()["email"] == "new@example.com"
+
+
+def test_auth_does_not_use_the_sync_session(client):
+    """Handlers that await the hasher must not block the loop on the sync session"""
+
+    def no_sync_session():
+        raise AssertionError("sync session used")
+
+    app.dependency_overrides[get_db] = no_sync_session
+    response = client.post(
+        "/api/v1/auth/signup",
+        json={"email": "new@example.com", "password": "secret123"},
+    )
+    assert response.status_code == 201
+
+    response = _login(client, "secret123", "new@example.com")
+    assert response.status_code == 200
+
+    response = _refresh(client, response.json()["refresh_token"])
+    assert response.status_code == 200
+
+
+def test_signup_duplicate_email(client, test_user):
+    response = client.post(
+        "/api/v1/auth/signup",
+        json={"email": TEST_USER_EMAIL, "password": "secret123"},
+    )
+    assert response.status_code == 400
+
+
+def _bearer(tokens):
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+def _refresh(client, refresh_token):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_login_returns_token_pair(client, test_user, db_session):
+    tokens = _login(client).json()
+
+    assert tokens["token_type"] == "bearer"
+    assert tokens["expires_in"] == 15 * 60
+    stored = db_session.query(RefreshToken).one()
+    assert stored.user_id == test_user.id
+    assert stored.token_hash == hash_refresh_token(tokens["refresh_token"])
+
+
+def test_refresh_rotates_tokens(client, test_user):
+    tokens = _login(client).json()
+
+    response = _refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert client.get("/api/v1/auth/me", headers=_bearer(rotated)).status_code == 200
+
+    # The new refresh token works once more
+    assert _refresh(client, rotated["refresh_token"]).status_code == 200
+
+
+def test_refresh_token_reuse_ends_all_sessions(client, test_user):
+    tokens = _login(client).json()
+    rotated = _refresh(client, tokens["refresh_token"]).json()
+
+    assert _refresh(client, tokens["refresh_token"]).status_code == 401
+
+    assert _refresh(client, rotated["refresh_token"]).status_code == 401
+    assert client.get("/api/v1/auth/me", headers=_bearer(rotated)).status_code == 401
+
+
+def test_refresh_rejects_unknown_and_expired(client, test_user, db_session):
+    assert _refresh(client, "not-a-token").status_code == 401
+
+    tokens = _login(client).json()
+    db_session.execute(
+        update(RefreshToken).values(expires_at=datetime.utcnow() - timedelta(days=1))
+    )
+    db_session.commit()
+
+    assert _refresh(client, tokens["refresh_token"]).status_code == 401
+
+
+def test_logout_revokes_refresh_token(client, test_user):
+    tokens = _login(client).json()
+
+    response = client.post(
+        "/api/v1/auth/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=_bearer(tokens),
+    )
+
+    assert response.status_code == 204
+    assert _refresh(client, tokens["refresh_token"]).status_code == 401
+
+
+def test_refresh_after_logout_keeps_other_sessions(client, test_user):
+    """A client retrying a refresh after logging out is not taken for a thief"""
+    tokens = _login(client).json()
+    other = _login(client).json()
+    client.post(
+        "/api/v1/auth/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=_bearer(tokens),
+    )
+
+    assert _refresh(client, tokens["refresh_token"]).status_code == 401
+
+    assert client.get("/api/v1/auth/me", headers=_bearer(other)).status_code == 200
+    assert _refresh(client, other["refresh_token"]).status_code == 200
+
+
+def test_logout_with_refresh_token_alone(client, test_user, db_session):
+    tokens = _login(client).json()
+    other = _login(client).json()
+
+    # No access token, as when it has already expired
+    response = client.post(
+        "/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 204
+    revoked = db_session.scalars(
+        select(RefreshToken.token_hash).where(RefreshToken.revoked_at.is_not(None))
+    ).all()
+    assert revoked == [hash_refresh_token(tokens["refresh_token"])]
+
+    response = client.post(
+        "/api/v1/auth/logout",
+        json={"refresh_token": other["refresh_token"], "all_sessions": True},
+    )
+    assert response.status_code == 204
+    assert client.get("/api/v1/books", headers=_bearer(other)).status_code == 401
+
+
+def test_logout_requires_a_token(client, test_user):
+    response = client.post("/api/v1/auth/logout", json={"all_sessions": True})
+    assert response.status_code == 401
+
+    response = client.post(
+        "/api/v1/auth/logout",
+        json={"refresh_token": "not-a-token", "all_sessions": True},
+    )
+    assert response.status_code == 401
+
+
+def test_logout_all_sessions_rejects_access_tokens(client, test_user):
+    first = _login(client).json()
+    second = _login(client).json()
+    assert client.get("/api/v1/books", headers=_bearer(second)).status_code == 200
+
+    response = client.post(
+        "/api/v1/auth/logout", json={"all_sessions": True}, headers=_bearer(first)
+    )
+    assert response.status_code == 204
+
+    with record_statements() as statements:
+        response = client.get("/api/v1/books", headers=_bearer(second))
+
+    # Rejected from the in-memory token version, without touching the database
+    assert response.status_code == 401
+    assert statements == []
+    assert _refresh(client, second["refresh_token"]).status_code == 401
+
+    # Fresh logins work again
+    third = _login(client).json()
+    assert client.get("/api/v1/books", headers=_bearer(third)).status_code == 200
+
+
+def test_failed_logins_are_throttled(client, test_user, monkeypatch):
+    monkeypatch.setattr(email_throttle, "limit", 2)
+
+    assert _login(client, "wrong").status_code == 401
+    assert _login(client, "wrong").status_code == 401
+
+    response = _login(client)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+    # Other accounts are unaffected
+    assert _login(client, email="other@example.com").status_code == 401
+
+
+def test_successful_login_resets_email_throttle(client, test_user, monkeypatch):
+    monkeypatch.setattr(email_throttle, "limit", 2)
+
+    _login(client, "wrong")
+    assert _login(client).status_code == 200
+    _login(client, "wrong")
+
+    assert _login(client).status_code == 200
+
+
+def test_login_sheds_load_when_hasher_is_full(client, test_user, monkeypatch):
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+
+    response = _login(client)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_hasher_rejects_beyond_queue():
+    hasher = PasswordHasher(workers=1, queue_size=1)
+    release = threading.Event()
+    try:
+        running = [asyncio.ensure_future(hasher._run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert hasher.pending == 2
+
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher.verify("password", "hash")
+
+        release.set()
+        await asyncio.gather(*running)
+        assert hasher.pending == 0
+    finally:
+        release.set()
+        hasher.shutdown()
+
+
+def test_attempt_throttle_window(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(passwords.time, "monotonic", lambda: now[0])
+    throttle = AttemptThrottle(limit=2, window=60)
+
+    throttle.record_failure("ip:1")
+    assert throttle.retry_after("ip:1") is None
+    throttle.record_failure("ip:1")
+    assert throttle.retry_after("ip:1") == 60
+
+    now[0] += 45
+    assert throttle.retry_after("ip:1") == 15
+    now[0] += 15
+    assert throttle.retry_after("ip:1") is None
+
+
+def test_calibrate_rounds():
+    rounds, _ = calibrate_rounds(target_ms=0, samples=1)
+    assert rounds == MIN_ROUNDS
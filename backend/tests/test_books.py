@@ -2,20 +2,24 @@
 
 import io
 import uuid
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
+from sqlalchemy import text
 
 from app.models.book import Book
+from app.services.sample_book import SAMPLE_BOOK_ID
+from tests.conftest import record_statements
 
 
-def create_test_pdf() -> bytes:
+def create_test_pdf(page_text: str = "Page 1 content") -> bytes:
     """Create a simple test PDF file with text"""
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     c.drawString(100, 750, "This is a test PDF document")
-    c.drawString(100, 730, "Page 1 content")
+    c.drawString(100, 730, page_text)
     c.showPage()
     c.save()
 
@@ -87,6 +91,23 @@ def test_upload_book_success(authenticated_client, test_user):
     assert data["currentPage"] == 0
 
 
+def test_upload_book_prewarms_definitions(authenticated_client, test_user):
+    """Test upload schedules definition pre-warming for the extracted pages"""
+    pdf_content = create_test_pdf()
+
+    with patch(
+        "app.services.definition_warmer.definition_warmer.warm_book",
+        new_callable=AsyncMock,
+    ) as mock_warm:
+        response = authenticated_client.post(
+            "/api/v1/books",
+            files={"file": ("test_book.pdf", pdf_content, "application/pdf")},
+        )
+
+    assert response.status_code == 201
+    mock_warm.assert_called_once_with(response.json()["content"])
+
+
 def test_upload_book_invalid_file_type(authenticated_client, test_user):
     """Test uploading non-PDF file"""
     response = authenticated_client.post(
@@ -231,3 +252,143 @@ def test_delete_book_not_found(authenticated_client, test_user):
     fake_id = str(uuid.uuid4())
     response = authenticated_client.delete(f"/api/v1/books/{fake_id}")
     assert response.status_code == 404
+
+
+def _save_book_word(client, book_id, word, page_index, char_offset):
+    return client.post(
+        "/api/v1/dictionary",
+        json={
+            "word": word,
+            "definition": f"Definition of {word}",
+            "bookId": book_id,
+            "pageIndex": page_index,
+            "charOffset": char_offset,
+        },
+    )
+
+
+def _add_book(db_session, user_id, pages=3):
+    book = Book(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        name=f"Linked Book {uuid.uuid4()}",
+        content=[f"Page {i}" for i in range(pages)],
+        total_pages=pages,
+        file_size=100,
+    )
+    db_session.add(book)
+    db_session.commit()
+    return book.id
+
+
+def test_get_book_words_in_reading_order(authenticated_client, db_session, test_user):
+    """Words saved from a book come back ordered by page and offset"""
+    book_id = _add_book(db_session, test_user.id)
+    other_book_id = _add_book(db_session, test_user.id)
+    _save_book_word(authenticated_client, book_id, "later", 2, 5)
+    _save_book_word(authenticated_client, book_id, "second", 0, 40)
+    _save_book_word(authenticated_client, book_id, "first", 0, 3)
+    _save_book_word(authenticated_client, other_book_id, "elsewhere", 0, 0)
+    authenticated_client.post(
+        "/api/v1/dictionary", json={"word": "unlinked", "definition": "No book"}
+    )
+
+    response = authenticated_client.get(f"/api/v1/books/{book_id}/words")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["bookId"] == book_id
+    assert [w["word"] for w in data["words"]] == ["first", "second", "later"]
+    assert data["words"][0]["pageIndex"] == 0
+    assert data["words"][0]["charOffset"] == 3
+
+    response = authenticated_client.get(f"/api/v1/books/{book_id}/words?page=2")
+    assert [w["word"] for w in response.json()["words"]] == ["later"]
+
+
+def test_get_book_words_sample_book(authenticated_client, test_user):
+    response = _save_book_word(authenticated_client, SAMPLE_BOOK_ID, "welcome", 0, 0)
+    assert response.status_code == 201
+
+    response = authenticated_client.get(f"/api/v1/books/{SAMPLE_BOOK_ID}/words")
+    assert [w["word"] for w in response.json()["words"]] == ["welcome"]
+
+
+def test_get_book_words_not_found(authenticated_client, test_user):
+    response = authenticated_client.get("/api/v1/books/missing/words")
+    assert response.status_code == 404
+
+
+def test_save_word_validates_book(authenticated_client, db_session, test_user):
+    book_id = _add_book(db_session, test_user.id, pages=2)
+
+    assert (
+        _save_book_word(authenticated_client, "missing", "a", 0, 0).status_code == 404
+    )
+    assert _save_book_word(authenticated_client, book_id, "b", 2, 0).status_code == 400
+
+    response = authenticated_client.post(
+        "/api/v1/dictionary",
+        json={"word": "c", "definition": "No book", "pageIndex": 1},
+    )
+    assert response.status_code == 422
+
+
+def test_delete_book_removes_its_words(authenticated_client, db_session, test_user):
+    """Deleting a book removes the words saved from it in one DELETE"""
+    book_id = _add_book(db_session, test_user.id)
+    for offset, word in enumerate(["alpha", "beta", "gamma"]):
+        _save_book_word(authenticated_client, book_id, word, 0, offset)
+    authenticated_client.post(
+        "/api/v1/dictionary", json={"word": "kept", "definition": "No book"}
+    )
+    assert authenticated_client.get("/api/v1/dictionary/check/alpha").json()["exists"]
+
+    with record_statements() as statements:
+        response = authenticated_client.delete(f"/api/v1/books/{book_id}")
+
+    assert response.status_code == 204
+    assert (
+        len([s for s in statements if s.startswith("DELETE FROM dictionary_words")])
+        == 1
+    )
+
+    words = authenticated_client.get("/api/v1/dictionary").json()["words"]
+    assert [w["word"] for w in words] == ["kept"]
+    assert not authenticated_client.get("/api/v1/dictionary/check/alpha").json()[
+        "exists"
+    ]
+
+
+def test_reupload_with_new_text_clears_word_positions(authenticated_client, test_user):
+    """Positions of saved words are kept only while the book's text is unchanged"""
+
+    def upload(pdf):
+        return authenticated_client.post(
+            "/api/v1/books", files={"file": ("revised.pdf", pdf, "application/pdf")}
+        ).json()
+
+    def positions():
+        words = authenticated_client.get(f"/api/v1/books/{book_id}/words").json()
+        return [(w["pageIndex"], w["charOffset"]) for w in words["words"]]
+
+    book_id = upload(create_test_pdf())["id"]
+    _save_book_word(authenticated_client, book_id, "content", 0, 35)
+
+    assert upload(create_test_pdf())["id"] == book_id
+    assert positions() == [(0, 35)]
+
+    assert upload(create_test_pdf("Page 1 was rewritten"))["id"] == book_id
+    assert positions() == [(None, None)]
+
+
+def test_get_book_words_uses_index(db_session):
+    plan = db_session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT * FROM dictionary_words "
+            "WHERE user_id = 'u' AND book_id = 'b' ORDER BY page_index, char_offset"
+        )
+    ).fetchall()
+    details = " ".join(row[-1] for row in plan)
+
+    assert "ix_dictionary_words_user_book" in details
+    assert "TEMP B-TREE" not in details
@@ -0,0 +1,94 @@
+"""Tests for the app start endpoint"""
+
+import uuid
+from datetime import datetime, timedelta
+
+from app.db.database import get_db
+from app.main import app
+from app.models.book import Book
+from app.models.dictionary import DictionaryWord
+from app.models.settings import ReadingMode, UserSettings
+from app.services.sample_book import SAMPLE_BOOK_ID
+from tests.conftest import TEST_USER_EMAIL, record_statements
+
+
+def _get_bootstrap(authenticated_client):
+    with record_statements() as statements:
+        response = authenticated_client.get("/api/v1/bootstrap")
+    return response, statements
+
+
+def test_bootstrap_new_user(authenticated_client, test_user, db_session):
+    response, _ = _get_bootstrap(authenticated_client)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["user"]["email"] == TEST_USER_EMAIL
+    assert data["settings"]["timerDuration"] == 5
+    assert data["settings"]["readingMode"] == "page"
+    assert [book["id"] for book in data["books"]] == [SAMPLE_BOOK_ID]
+    assert data["dictionary"] == {"total": 0, "dueForReview": 0}
+
+    # Reading defaults does not create a settings row
+    assert db_session.query(UserSettings).count() == 0
+
+
+def test_bootstrap_existing_user(authenticated_client, test_user, db_session):
+    db_session.add(
+        UserSettings(
+            user_id=test_user.id, timer_duration=20, reading_mode=ReadingMode.SENTENCE
+        )
+    )
+    db_session.add(
+        Book(
+            id=str(uuid.uuid4()),
+            user_id=test_user.id,
+            name="Novel",
+            content=["page one", "page two"],
+            total_pages=2,
+            current_page=1,
+            file_size=1234,
+        )
+    )
+    for word, due_in in [("due", -1), ("later", 3), ("overdue", -5)]:
+        db_session.add(
+            DictionaryWord(
+                id=str(uuid.uuid4()),
+                user_id=test_user.id,
+                word=word,
+                definition="-",
+                due_at=datetime.utcnow() + timedelta(days=due_in),
+            )
+        )
+    db_session.commit()
+    authenticated_client.get("/api/v1/auth/me")  # warm the token cache
+
+    response, statements = _get_bootstrap(authenticated_client)
+
+    data = response.json()
+    assert data["settings"]["timerDuration"] == 20
+    assert data["settings"]["readingMode"] == "sentence"
+    novel = data["books"][1]
+    assert novel["name"] == "Novel"
+    assert novel["currentPage"] == 1
+    assert novel["totalPages"] == 2
+    assert "content" not in novel
+    assert data["dictionary"] == {"total": 3, "dueForReview": 2}
+
+    assert len(statements) == 2
+    assert not any("content" in s for s in statements)
+
+
+def test_bootstrap_cold_token_cache(authenticated_client, test_user):
+    """One async session: authentication, then the two bootstrap queries"""
+
+    def no_sync_session():
+        raise AssertionError("sync session used")
+
+    app.dependency_overrides[get_db] = no_sync_session
+
+    response, statements = _get_bootstrap(authenticated_client)
+
+    assert response.status_code == 200
+    assert len(statements) == 3
+    assert "FROM users" in statements[0]
@@ -0,0 +1,148 @@
+"""
+Concurrency tests for upsert-based writes.
+
+These run against their own temporary SQLite file (not the shared test
+database) so every request gets its own connection, and fire the same
+write from many threads at once.
+"""
+
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.db.database import Base, create_async_db_engine, get_async_db, get_db
+from app.main import app
+from app.models.book import Book
+from app.models.dictionary import DictionaryWord
+from app.models.settings import UserSettings
+from app.models.user import User
+from tests.test_books import create_test_pdf
+
+THREADS = 16
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """Session factory for a temporary SQLite file, wired into the app"""
+    url = f"sqlite:///{tmp_path / 'concurrency.db'}"
+    engine = create_engine(
+        url, connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    # Every TestClient thread runs its own event loop, so nothing is pooled
+    async_engine = create_async_db_engine(
+        url, pragmas={"busy_timeout": 30000}, poolclass=NullPool
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def first_connect():
+        async with async_engine.connect():
+            pass
+
+    # The engine initialises its dialect on the first connection, behind a
+    # lock bound to one event loop; do that here, before threads race for it
+    asyncio.run(first_connect())
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    yield SessionLocal
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+@pytest.fixture
+def headers(file_db):
+    with file_db() as db:
+        user = User(
+            id=str(uuid.uuid4()),
+            email="concurrent@example.com",
+            password_hash=get_password_hash("password"),
+        )
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    return {"Authorization": f"Bearer {create_access_token(subject=user_id)}"}
+
+
+def _hammer(request, times=THREADS):
+    """Run request(client) from THREADS threads at once"""
+
+    def run(_):
+        client = TestClient(app)
+        return request(client)
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        return list(pool.map(run, range(times)))
+
+
+def _count(file_db, model):
+    with file_db() as db:
+        return db.scalar(select(func.count()).select_from(model))
+
+
+def test_concurrent_add_word(file_db, headers):
+    responses = _hammer(
+        lambda client: client.post(
+            "/api/v1/dictionary",
+            json={"word": "Ephemeral", "definition": "Lasting a short time"},
+            headers=headers,
+        )
+    )
+
+    codes = sorted(response.status_code for response in responses)
+    assert codes == [201] + [409] * (THREADS - 1)
+    assert _count(file_db, DictionaryWord) == 1
+
+
+def test_concurrent_upload_same_book(file_db, headers, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    pdf = create_test_pdf()
+
+    responses = _hammer(
+        lambda client: client.post(
+            "/api/v1/books",
+            files={"file": ("novel.pdf", pdf, "application/pdf")},
+            headers=headers,
+        )
+    )
+
+    assert {response.status_code for response in responses} == {201}
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert _count(file_db, Book) == 1
+
+
+def test_concurrent_settings(file_db, headers):
+    responses = _hammer(lambda client: client.get("/api/v1/settings", headers=headers))
+    assert {response.status_code for response in responses} == {200}
+
+    responses = _hammer(
+        lambda client: client.patch(
+            "/api/v1/settings", json={"timerDuration": 10}, headers=headers
+        )
+    )
+    assert {response.status_code for response in responses} == {200}
+    assert {response.json()["timerDuration"] for response in responses} == {10}
+    assert _count(file_db, UserSettings) == 1
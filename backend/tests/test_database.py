@@ -0,0 +1,46 @@
+"""Tests for engine configuration"""
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.database import create_db_engine
+
+
+def _pragma(engine, name):
+    with engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_sqlite_file_engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    try:
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "synchronous") == 1  # NORMAL
+        assert _pragma(engine, "mmap_size") == settings.SQLITE_MMAP_SIZE
+        assert _pragma(engine, "busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+
+        assert engine.pool.size() == settings.DB_POOL_SIZE
+        assert engine.pool._max_overflow == settings.DB_MAX_OVERFLOW
+        assert engine.pool._recycle == settings.DB_POOL_RECYCLE
+        assert engine.pool._pre_ping is settings.DB_POOL_PRE_PING
+    finally:
+        engine.dispose()
+
+
+def test_sqlite_pragmas_can_be_overridden(tmp_path):
+    engine = create_db_engine(
+        f"sqlite:///{tmp_path / 'app.db'}", pragmas={"journal_mode": "delete"}
+    )
+    try:
+        assert _pragma(engine, "journal_mode") == "delete"
+    finally:
+        engine.dispose()
+
+
+def test_in_memory_engine_keeps_default_pool():
+    engine = create_db_engine("sqlite:///:memory:")
+    try:
+        assert _pragma(engine, "busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert _pragma(engine, "journal_mode") == "memory"
+    finally:
+        engine.dispose()
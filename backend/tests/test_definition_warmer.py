@@ -0,0 +1,169 @@
+"""Tests for definition pre-warming"""
+
+import threading
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.dictionary import WordDefinitionItem, WordDefinitionResponse
+from app.services import definition_warmer as definition_warmer_module
+from app.services.definition_warmer import (
+    DefinitionWarmer,
+    load_word_ranks,
+    rank_vocabulary,
+)
+from app.services.dictionary_service import (
+    DictionaryService,
+    DictionaryUnavailableError,
+    LocalDictionaryProvider,
+    RemoteDictionaryProvider,
+)
+
+
+def make_definition(word: str) -> WordDefinitionResponse:
+    return WordDefinitionResponse(
+        word=word,
+        definitions=[
+            WordDefinitionItem(part_of_speech="noun", definition=f"Meaning of {word}")
+        ],
+    )
+
+
+@pytest.fixture
+def fast_warmer(monkeypatch):
+    monkeypatch.setattr(settings, "DEFINITION_PREWARM_RATE", 10_000)
+    monkeypatch.setattr(settings, "DEFINITION_PREWARM_ENABLED", True)
+    return DefinitionWarmer(DictionaryService(["cache", "remote"]))
+
+
+def test_word_ranks_loaded():
+    ranks = load_word_ranks()
+    assert ranks["the"] == 1
+    assert ranks["house"] < ranks["garden"] < ranks["pillow"]
+    assert "ineffable" not in ranks
+
+
+def test_rank_vocabulary_prefers_rare_words():
+    pages = [
+        "The ephemeral beauty of the house was obvious. Ephemeral things pass.",
+        "Alice walked through the garden, pondering the ineffable quietude.",
+    ]
+
+    words = rank_vocabulary(pages, top_k=10)
+
+    assert "ephemeral" in words
+    assert "ineffable" in words
+    assert "quietude" in words
+    # Common words and capitalized-only names are skipped
+    assert "house" not in words
+    assert "garden" not in words
+    assert "alice" not in words
+
+
+def test_rank_vocabulary_skips_ocr_errors():
+    """Unlisted words that are misreads of listed ones are not "rare" words"""
+    pages = ["tlie rnanner wbich xqzrtk the ineffable manner"]
+
+    assert rank_vocabulary(pages, top_k=10) == ["ineffable"]
+
+
+def test_rank_vocabulary_respects_top_k():
+    pages = ["ephemeral ineffable quietude perspicacious obsequious"]
+    assert len(rank_vocabulary(pages, top_k=2)) == 2
+
+
+@pytest.mark.asyncio
+async def test_warm_book_fills_cache(monkeypatch, fast_warmer):
+    remote_lookup = AsyncMock(side_effect=lambda word: make_definition(word))
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", remote_lookup)
+
+    fetched = await fast_warmer.warm_book(["The ineffable quietude of ephemeral"])
+
+    assert fetched == 3
+    for word in ["ineffable", "quietude", "ephemeral"]:
+        assert word in fast_warmer.service.cache
+
+
+@pytest.mark.asyncio
+async def test_warm_skips_cached_words(monkeypatch, fast_warmer):
+    fast_warmer.service.cache.set("quietude", make_definition("quietude"))
+    remote_lookup = AsyncMock(side_effect=lambda word: make_definition(word))
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", remote_lookup)
+
+    fetched = await fast_warmer.warm_words(["quietude", "ineffable"])
+
+    assert fetched == 1
+    remote_lookup.assert_called_once_with("ineffable")
+
+
+@pytest.mark.asyncio
+async def test_warm_stops_when_upstream_unavailable(monkeypatch, fast_warmer):
+    remote_lookup = AsyncMock(side_effect=DictionaryUnavailableError("down"))
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", remote_lookup)
+
+    fetched = await fast_warmer.warm_words(["quietude", "ineffable", "ephemeral"])
+
+    assert fetched == 0
+    remote_lookup.assert_called_once_with("quietude")
+
+
+@pytest.mark.asyncio
+async def test_warm_book_disabled(monkeypatch, fast_warmer):
+    monkeypatch.setattr(settings, "DEFINITION_PREWARM_ENABLED", False)
+    remote_lookup = AsyncMock()
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", remote_lookup)
+
+    assert await fast_warmer.warm_book(["ineffable quietude"]) == 0
+    remote_lookup.assert_not_called()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Intervals the warmer paced itself with"""
+    intervals = []
+
+    async def sleep(interval):
+        intervals.append(interval)
+
+    monkeypatch.setattr(definition_warmer_module.asyncio, "sleep", sleep)
+    return intervals
+
+
+@pytest.mark.asyncio
+async def test_warm_paces_only_upstream_lookups(monkeypatch, sleeps):
+    monkeypatch.setattr(settings, "DEFINITION_PREWARM_RATE", 2)
+    warmer = DefinitionWarmer(DictionaryService(["local", "cache", "remote"]))
+    local, _, remote = warmer.service.providers
+    local_words = {"ephemeral", "ineffable"}
+
+    async def local_lookup(word):
+        return make_definition(word) if word in local_words else None
+
+    async def remote_lookup(word):
+        remote.lookups_total += 1
+        return make_definition(word)
+
+    monkeypatch.setattr(LocalDictionaryProvider, "available", True)
+    monkeypatch.setattr(local, "lookup", local_lookup)
+    monkeypatch.setattr(remote, "lookup", remote_lookup)
+
+    fetched = await warmer.warm_words(["ephemeral", "ineffable", "quietude"])
+
+    assert fetched == 3
+    # Only "quietude" went upstream
+    assert sleeps == [0.5]
+
+
+@pytest.mark.asyncio
+async def test_warm_book_ranks_off_the_event_loop(monkeypatch, fast_warmer):
+    threads = []
+
+    def rank(pages, top_k):
+        threads.append(threading.get_ident())
+        return []
+
+    monkeypatch.setattr(definition_warmer_module, "rank_vocabulary", rank)
+
+    assert await fast_warmer.warm_book(["ineffable quietude"]) == 0
+    assert threads and threads[0] != threading.get_ident()
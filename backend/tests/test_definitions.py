@@ -1,7 +1,9 @@
 """Tests for definitions endpoints"""
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 
 from app.schemas.dictionary import (
@@ -9,6 +11,8 @@ from app.schemas.dictionary import (
     WordDefinitionResponse,
     WordPronunciationResponse,
 )
+from app.services import audio_service as audio_service_module
+from app.services.audio_service import audio_service
 
 
 @pytest.fixture
@@ -145,3 +149,138 @@ def test_get_word_pronunciation_default_voice(client, mock_pronunciation_respons
         assert response.status_code == 200
         # Verify default voice parameter is 'us'
         mock_get.assert_called_once_with("test", "us")
+
+
+@pytest.fixture
+def audio_store(tmp_path, monkeypatch):
+    """Point the audio cache at a temp dir and serve a fake clip upstream"""
+    downloads = []
+
+    def handler(request):
+        downloads.append(str(request.url))
+        return httpx.Response(200, content=b"ID3fake-mp3-audio-data")
+
+    monkeypatch.setattr(audio_service, "root", tmp_path / "audio")
+    monkeypatch.setattr(audio_service, "transport", httpx.MockTransport(handler))
+    return downloads
+
+
+def test_get_word_audio_downloads_once(client, mock_definition_response, audio_store):
+    """Test audio is fetched once and then served from disk"""
+    with patch(
+        "app.services.dictionary_service.dictionary_service.get_word_definition",
+        new_callable=AsyncMock,
+    ) as mock_get:
+        mock_get.return_value = mock_definition_response
+
+        for _ in range(2):
+            response = client.get("/api/v1/definitions/test/audio")
+            assert response.status_code == 200
+            assert response.content == b"ID3fake-mp3-audio-data"
+            assert response.headers["content-type"] == "audio/mpeg"
+            assert response.headers["cache-control"] == "public, max-age=86400"
+
+        assert audio_store == ["https://example.com/test.mp3"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_audio_requests_share_one_download(tmp_path, monkeypatch):
+    """A request arriving while a waiter retries a failed download joins it"""
+    downloads = []
+
+    async def handler(request):
+        downloads.append(str(request.url))
+        await asyncio.sleep(0.05)
+        if len(downloads) == 1:
+            return httpx.Response(500)
+        return httpx.Response(200, content=b"ID3fake-mp3-audio-data")
+
+    monkeypatch.setattr(audio_service, "root", tmp_path / "audio")
+    monkeypatch.setattr(audio_service, "transport", httpx.MockTransport(handler))
+    url = "https://example.com/test.mp3"
+
+    first = asyncio.create_task(audio_service.get_audio(url))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(audio_service.get_audio(url))
+    # The first download has failed and the second request is retrying it
+    await asyncio.sleep(0.06)
+    third = asyncio.create_task(audio_service.get_audio(url))
+
+    with pytest.raises(ValueError):
+        await first
+    assert await second == await third
+    assert len(downloads) == 2
+    assert audio_service._locks == {}
+
+
+@pytest.mark.asyncio
+async def test_oversized_audio_stops_downloading(tmp_path, monkeypatch):
+    """The download is abandoned once the clip exceeds MAX_AUDIO_SIZE"""
+    sent = []
+
+    async def body():
+        for _ in range(100):
+            sent.append(1024)
+            yield b"x" * 1024
+
+    def handler(request):
+        return httpx.Response(200, content=body())
+
+    monkeypatch.setattr(audio_service_module, "MAX_AUDIO_SIZE", 4 * 1024)
+    monkeypatch.setattr(audio_service, "root", tmp_path / "audio")
+    monkeypatch.setattr(audio_service, "transport", httpx.MockTransport(handler))
+
+    with pytest.raises(ValueError, match="too large"):
+        await audio_service.get_audio("https://example.com/huge.mp3")
+    assert len(sent) == 5
+    assert not (tmp_path / "audio").exists()
+
+
+def test_get_word_audio_range_request(client, mock_definition_response, audio_store):
+    """Test partial content is served for Range requests"""
+    with patch(
+        "app.services.dictionary_service.dictionary_service.get_word_definition",
+        new_callable=AsyncMock,
+    ) as mock_get:
+        mock_get.return_value = mock_definition_response
+
+        response = client.get(
+            "/api/v1/definitions/test/audio", headers={"Range": "bytes=0-3"}
+        )
+        assert response.status_code == 206
+        assert response.content == b"ID3f"
+        assert response.headers["content-range"].startswith("bytes 0-3/")
+
+
+def test_get_word_audio_not_available(client, audio_store):
+    """Test 404 when the word has no audio"""
+    definition = WordDefinitionResponse(
+        word="test",
+        definitions=[WordDefinitionItem(part_of_speech="noun", definition="A test")],
+    )
+    with patch(
+        "app.services.dictionary_service.dictionary_service.get_word_definition",
+        new_callable=AsyncMock,
+    ) as mock_get:
+        mock_get.return_value = definition
+
+        response = client.get("/api/v1/definitions/test/audio")
+        assert response.status_code == 404
+        assert audio_store == []
+
+
+def test_get_word_pronunciation_includes_cached_audio_url(
+    client, mock_pronunciation_response
+):
+    """Test pronunciation points at the local audio endpoint"""
+    with patch(
+        "app.services.dictionary_service.dictionary_service.get_word_pronunciation",
+        new_callable=AsyncMock,
+    ) as mock_get:
+        mock_get.return_value = mock_pronunciation_response
+
+        response = client.get("/api/v1/definitions/test/pronounce")
+        assert response.status_code == 200
+        assert response.json()["cachedAudioUrl"].endswith(
+            "/api/v1/definitions/test/audio"
+        )
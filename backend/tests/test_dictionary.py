@@ -1,10 +1,15 @@
 """Tests for dictionary endpoints"""
 
 import uuid
+from datetime import datetime, timedelta
 
 import pytest
+from sqlalchemy import text
 
+from app.models.book import Book
 from app.models.dictionary import DictionaryWord
+from app.services.sample_book import SAMPLE_BOOK_ID
+from tests.conftest import record_statements
 
 
 def test_get_dictionary_empty(authenticated_client):
@@ -68,6 +73,126 @@ def test_get_dictionary_with_pagination(authenticated_client, test_user, db_sess
     assert data["offset"] == 1
 
 
+def _add_words(db_session, user_id, count, same_timestamp=False):
+    added_at = datetime(2024, 1, 1)
+    for i in range(count):
+        db_session.add(
+            DictionaryWord(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                word=f"word{i:02d}",
+                definition=f"Definition {i}",
+                added_at=added_at if same_timestamp else added_at + timedelta(hours=i),
+            )
+        )
+    db_session.commit()
+
+
+@pytest.mark.parametrize(
+    "sort", ["addedAt_desc", "addedAt_asc", "word_asc", "word_desc"]
+)
+def test_get_dictionary_cursor_pagination(
+    authenticated_client, test_user, db_session, sort
+):
+    """Following nextCursor walks every word exactly once, in order"""
+    _add_words(db_session, test_user.id, 7)
+
+    full = authenticated_client.get(f"/api/v1/dictionary?sort={sort}&limit=100")
+    expected = [w["word"] for w in full.json()["words"]]
+    assert full.json()["nextCursor"] is None
+
+    seen = []
+    url = f"/api/v1/dictionary?sort={sort}&limit=3"
+    while True:
+        data = authenticated_client.get(url).json()
+        seen.extend(w["word"] for w in data["words"])
+        if data["nextCursor"] is None:
+            break
+        url = f"/api/v1/dictionary?sort={sort}&limit=3&cursor={data['nextCursor']}"
+
+    assert seen == expected
+    assert len(seen) == 7
+
+
+def test_get_dictionary_cursor_breaks_timestamp_ties(
+    authenticated_client, test_user, db_session
+):
+    """Words added at the same instant are neither skipped nor repeated"""
+    _add_words(db_session, test_user.id, 5, same_timestamp=True)
+
+    first = authenticated_client.get("/api/v1/dictionary?limit=2").json()
+    cursor = first["nextCursor"]
+    rest = authenticated_client.get(f"/api/v1/dictionary?limit=10&cursor={cursor}")
+
+    words = [w["word"] for w in first["words"] + rest.json()["words"]]
+    assert sorted(words) == [f"word{i:02d}" for i in range(5)]
+
+
+def test_get_dictionary_without_total(authenticated_client, test_user, db_session):
+    """includeTotal=false skips the count query"""
+    _add_words(db_session, test_user.id, 3)
+
+    response = authenticated_client.get("/api/v1/dictionary?includeTotal=false")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] is None
+    assert len(data["words"]) == 3
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "eyJzIjoid29yZF9hc2MifQ"])
+def test_get_dictionary_invalid_cursor(authenticated_client, cursor):
+    """Malformed cursors are rejected"""
+    response = authenticated_client.get(f"/api/v1/dictionary?cursor={cursor}")
+    assert response.status_code == 400
+
+
+def test_get_dictionary_cursor_sort_mismatch(
+    authenticated_client, test_user, db_session
+):
+    """A cursor only continues the sort order it was issued for"""
+    _add_words(db_session, test_user.id, 3)
+    data = authenticated_client.get("/api/v1/dictionary?sort=word_asc&limit=1").json()
+
+    response = authenticated_client.get(
+        f"/api/v1/dictionary?sort=addedAt_desc&cursor={data['nextCursor']}"
+    )
+    assert response.status_code == 400
+
+
+def test_get_dictionary_cursor_with_offset(authenticated_client):
+    """Cursor and offset pagination cannot be combined"""
+    response = authenticated_client.get("/api/v1/dictionary?cursor=abc&offset=2")
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "sort, index_name",
+    [
+        ("addedAt_desc", "ix_dictionary_words_user_added"),
+        ("word_asc", "ix_dictionary_words_user_word"),
+    ],
+)
+def test_get_dictionary_keyset_uses_index(db_session, sort, index_name):
+    """Keyset pages are served by the composite index, without a sort step"""
+    if sort.startswith("addedAt"):
+        where = "user_id = 'u' AND (added_at, id) < ('2024-01-01', 'x')"
+        order = "added_at DESC, id DESC"
+    else:
+        where = "user_id = 'u' AND word > 'm'"
+        order = "word ASC"
+
+    plan = db_session.execute(
+        text(
+            f"EXPLAIN QUERY PLAN SELECT * FROM dictionary_words "
+            f"WHERE {where} ORDER BY {order} LIMIT 10"
+        )
+    ).fetchall()
+    details = " ".join(row[-1] for row in plan)
+
+    assert index_name in details
+    assert "TEMP B-TREE" not in details
+
+
 def test_get_dictionary_sorted_by_word_asc(authenticated_client, test_user, db_session):
     """Test dictionary sorting by word ascending"""
     words = ["zebra", "apple", "moon"]
@@ -249,3 +374,97 @@ def test_check_word_case_insensitive(authenticated_client, test_user, db_session
         data = response.json()
         assert data["exists"] is True
         assert data["word"] == "test"
+
+
+def _save_words(db_session, user_id, words):
+    for word in words:
+        db_session.add(
+            DictionaryWord(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                word=word,
+                definition=f"Definition of {word}",
+            )
+        )
+    db_session.commit()
+
+
+def test_check_words_batch(authenticated_client, test_user, db_session):
+    """Batch check returns the saved subset of the given words"""
+    _save_words(db_session, test_user.id, ["ephemeral", "serendipity", "quixotic"])
+    _save_words(db_session, "another-user", ["lucid"])
+
+    response = authenticated_client.post(
+        "/api/v1/dictionary/check",
+        json={"words": ["Ephemeral,", "lucid", "quixotic", "table", "“Serendipity”"]},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"saved": ["ephemeral", "quixotic", "serendipity"]}
+
+
+def test_check_words_book_page(authenticated_client, test_user, db_session):
+    """A book page is tokenized server-side and checked in one go"""
+    book = Book(
+        id=str(uuid.uuid4()),
+        user_id=test_user.id,
+        name="Test Book",
+        content=["The ephemeral glow.", "A quixotic, lucid plan."],
+        total_pages=2,
+        file_size=100,
+    )
+    db_session.add(book)
+    _save_words(db_session, test_user.id, ["ephemeral", "quixotic", "lucid"])
+
+    response = authenticated_client.post(
+        "/api/v1/dictionary/check", json={"bookId": book.id, "pageIndex": 1}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"saved": ["lucid", "quixotic"]}
+
+    response = authenticated_client.post(
+        "/api/v1/dictionary/check", json={"bookId": book.id, "pageIndex": 2}
+    )
+    assert response.status_code == 400
+
+
+def test_check_words_sample_book(authenticated_client, test_user, db_session):
+    """The sample book's pages can be checked too"""
+    _save_words(db_session, test_user.id, ["welcome"])
+
+    response = authenticated_client.post(
+        "/api/v1/dictionary/check",
+        json={"bookId": SAMPLE_BOOK_ID, "pageIndex": 0},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"saved": ["welcome"]}
+
+
+def test_check_words_book_not_found(authenticated_client):
+    response = authenticated_client.post(
+        "/api/v1/dictionary/check", json={"bookId": "missing", "pageIndex": 0}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [{}, {"bookId": "abc"}, {"words": ["a"], "bookId": "abc", "pageIndex": 0}],
+)
+def test_check_words_requires_one_source(authenticated_client, payload):
+    response = authenticated_client.post("/api/v1/dictionary/check", json=payload)
+    assert response.status_code == 422
+
+
+def test_check_words_single_load(authenticated_client, test_user, db_session):
+    """A page worth of words is answered by loading the dictionary once"""
+    _save_words(db_session, test_user.id, [f"word{i}" for i in range(50)])
+    with record_statements() as statements:
+        response = authenticated_client.post(
+            "/api/v1/dictionary/check",
+            json={"words": [f"word{i}" for i in range(0, 400, 2)]},
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()["saved"]) == 25
+    # The version of the user's words, then the words themselves
+    assert len([s for s in statements if "FROM dictionary_words" in s]) == 2
@@ -0,0 +1,199 @@
+"""Tests for dictionary bulk import and export"""
+
+import io
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.models.dictionary import DictionaryWord
+from app.services.dictionary_io import (
+    ImportedWord,
+    InvalidRowError,
+    detect_format,
+    read_words,
+    write_words,
+)
+
+
+def _read(text: str, file_format: str) -> list:
+    return list(read_words(io.BytesIO(text.encode("utf-8")), file_format))
+
+
+def test_read_csv_with_header():
+    rows = _read(
+        "﻿Context,Word,Definition\n"
+        '"She said ""hi""",Ephemeral,Lasting a short time\n'
+        ",lucid,Clear\n",
+        "csv",
+    )
+    assert rows == [
+        ImportedWord("ephemeral", "Lasting a short time", 'She said "hi"'),
+        ImportedWord("lucid", "Clear", None),
+    ]
+
+
+def test_read_csv_without_header_and_multiline_field():
+    rows = _read('ephemeral,"Lasting\na short time"\n\nlucid,Clear,In context\n', "csv")
+    assert rows == [
+        ImportedWord("ephemeral", "Lasting\na short time"),
+        ImportedWord("lucid", "Clear", "In context"),
+    ]
+
+
+def test_read_anki_skips_header_lines():
+    rows = _read(
+        "#separator:tab\n#html:false\nephemeral\tLasting a short time\n", "anki"
+    )
+    assert rows == [ImportedWord("ephemeral", "Lasting a short time")]
+
+
+def test_read_reports_invalid_rows():
+    rows = _read(
+        '{"word": "ephemeral", "definition": "Short"}\n'
+        "not json\n"
+        '{"word": "lucid"}\n'
+        '["a", "b"]\n'
+        f'{{"word": "{"x" * 101}", "definition": "Long"}}\n',
+        "ndjson",
+    )
+    assert rows[0] == ImportedWord("ephemeral", "Short")
+    assert [str(row) for row in rows[1:]] == [
+        "Row 2: invalid JSON",
+        "Row 3: missing definition",
+        "Row 4: expected a JSON object",
+        "Row 5: word is too long",
+    ]
+    assert all(isinstance(row, InvalidRowError) for row in rows[1:])
+
+
+def test_detect_format():
+    assert detect_format("words.CSV") == "csv"
+    assert detect_format("deck.txt") == "anki"
+    assert detect_format("export.jsonl") == "ndjson"
+    with pytest.raises(ValueError):
+        detect_format("words.xlsx")
+
+
+def test_write_words_in_chunks():
+    words = [
+        DictionaryWord(
+            word=f"word{i}",
+            definition="A definition",
+            context=None,
+            added_at=datetime(2024, 1, 1),
+        )
+        for i in range(5)
+    ]
+
+    chunks = list(write_words(iter(words), "ndjson", chunk_rows=2))
+
+    assert len(chunks) == 3
+    lines = "".join(chunks).splitlines()
+    assert [json.loads(line)["word"] for line in lines] == [
+        f"word{i}" for i in range(5)
+    ]
+
+
+def _upload(client, content: str, filename: str, **params):
+    return client.post(
+        "/api/v1/dictionary/import",
+        files={"file": (filename, content.encode("utf-8"), "text/plain")},
+        params=params,
+    )
+
+
+def test_import_dictionary(authenticated_client, test_user, db_session):
+    """Existing words and repeats within the file are skipped"""
+    db_session.add(
+        DictionaryWord(
+            id=str(uuid.uuid4()),
+            user_id=test_user.id,
+            word="lucid",
+            definition="Clear",
+        )
+    )
+    db_session.commit()
+
+    response = _upload(
+        authenticated_client,
+        "word,definition,context\n"
+        "Ephemeral,Lasting a short time,An ephemeral glow\n"
+        "lucid,Clear\n"
+        "ephemeral,Again\n"
+        "quixotic,\n"
+        "serendipity,Happy accident\n",
+        "words.csv",
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "imported": 2,
+        "duplicates": 2,
+        "invalid": 1,
+        "errors": ["Row 5: missing definition"],
+    }
+
+    words = authenticated_client.get("/api/v1/dictionary?sort=word_asc").json()
+    assert [w["word"] for w in words["words"]] == ["ephemeral", "lucid", "serendipity"]
+    assert words["words"][0]["context"] == "An ephemeral glow"
+
+
+def test_import_dictionary_in_batches(authenticated_client, monkeypatch):
+    monkeypatch.setattr("app.api.v1.dictionary.IMPORT_BATCH_SIZE", 3)
+    lines = "".join(
+        json.dumps({"word": f"word{i}", "definition": "d"}) + "\n" for i in range(10)
+    )
+
+    response = _upload(authenticated_client, lines, "words.jsonl")
+    assert response.json()["imported"] == 10
+
+    response = _upload(authenticated_client, lines, "words.jsonl")
+    assert response.json() == {
+        "imported": 0,
+        "duplicates": 10,
+        "invalid": 0,
+        "errors": [],
+    }
+
+
+def test_import_dictionary_explicit_format(authenticated_client):
+    response = _upload(
+        authenticated_client, "ephemeral\tShort\n", "upload.bin", format="anki"
+    )
+    assert response.status_code == 200
+    assert response.json()["imported"] == 1
+
+
+def test_import_dictionary_unknown_format(authenticated_client):
+    response = _upload(authenticated_client, "ephemeral,Short\n", "words.xlsx")
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("file_format", ["csv", "anki", "ndjson"])
+def test_export_round_trip(authenticated_client, test_user, db_session, file_format):
+    """An export can be imported back unchanged"""
+    for word, context in [("ephemeral", 'A, "quoted"\tcontext'), ("lucid", None)]:
+        db_session.add(
+            DictionaryWord(
+                id=str(uuid.uuid4()),
+                user_id=test_user.id,
+                word=word,
+                definition=f"Definition of {word}",
+                context=context,
+            )
+        )
+    db_session.commit()
+
+    response = authenticated_client.get(
+        "/api/v1/dictionary/export", params={"format": file_format}
+    )
+    assert response.status_code == 200
+    assert "attachment" in response.headers["content-disposition"]
+
+    rows = _read(response.text, file_format)
+    assert sorted(rows, key=lambda row: row.word) == [
+        ImportedWord("ephemeral", "Definition of ephemeral", 'A, "quoted"\tcontext'),
+        ImportedWord("lucid", "Definition of lucid", None),
+    ]
@@ -0,0 +1,522 @@
+"""Tests for the dictionary service and its providers"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.schemas.dictionary import WordDefinitionItem, WordDefinitionResponse
+from app.services.dictionary_service import (
+    DefinitionCache,
+    DictionaryService,
+    DictionaryUnavailableError,
+    LocalDictionaryProvider,
+    RemoteDictionaryProvider,
+)
+from app.services.local_dictionary import build_local_dictionary
+
+
+def make_definition(word: str) -> WordDefinitionResponse:
+    return WordDefinitionResponse(
+        word=word,
+        definitions=[
+            WordDefinitionItem(part_of_speech="noun", definition=f"Meaning of {word}")
+        ],
+    )
+
+
+@pytest.fixture
+def dictionary_dump(tmp_path):
+    """A small JSON Lines dump mixing both supported formats"""
+    entries = [
+        {
+            "word": "Ephemeral",
+            "phonetic": "/ɪˈfɛm(ə)rəl/",
+            "phonetics": [{"audio": "https://example.com/ephemeral.mp3"}],
+            "meanings": [
+                {
+                    "partOfSpeech": "adjective",
+                    "definitions": [{"definition": "Lasting for a very short time"}],
+                }
+            ],
+        },
+        {
+            "word": "run",
+            "pos": "verb",
+            "senses": [
+                {
+                    "glosses": ["To move swiftly on foot"],
+                    "examples": [{"text": "She runs every morning"}],
+                }
+            ],
+            "sounds": [{"ipa": "/ɹʌn/"}],
+        },
+        {
+            "word": "run",
+            "pos": "noun",
+            "senses": [{"glosses": ["An act of running"]}],
+        },
+        {"word": "empty", "meanings": []},
+    ]
+    dump_path = tmp_path / "dump.jsonl"
+    dump_path.write_text("\n".join(json.dumps(entry) for entry in entries))
+    return dump_path
+
+
+@pytest.fixture
+def local_index(tmp_path, dictionary_dump):
+    db_path = tmp_path / "dictionary.sqlite"
+    build_local_dictionary(dictionary_dump, db_path)
+    return db_path
+
+
+def test_build_local_dictionary_counts_entries(tmp_path, dictionary_dump):
+    """Entries without definitions are skipped"""
+    count = build_local_dictionary(dictionary_dump, tmp_path / "out.sqlite")
+    assert count == 3
+    assert not (tmp_path / "out.sqlite.tmp").exists()
+
+
+@pytest.mark.asyncio
+async def test_local_provider_lookup(local_index):
+    provider = LocalDictionaryProvider(local_index)
+
+    definition = await provider.lookup("ephemeral")
+    assert definition.word == "ephemeral"
+    assert definition.definitions[0].definition == "Lasting for a very short time"
+    assert definition.audio_url == "https://example.com/ephemeral.mp3"
+
+    assert await provider.lookup("missing") is None
+    provider.close()
+
+
+@pytest.mark.asyncio
+async def test_local_provider_merges_parts_of_speech(local_index):
+    provider = LocalDictionaryProvider(local_index)
+
+    definition = await provider.lookup("run")
+    parts_of_speech = [item.part_of_speech for item in definition.definitions]
+    assert sorted(parts_of_speech) == ["noun", "verb"]
+    assert definition.phonetic == "/ɹʌn/"
+    provider.close()
+
+
+@pytest.mark.asyncio
+async def test_local_provider_missing_file_is_unavailable(tmp_path):
+    provider = LocalDictionaryProvider(tmp_path / "missing.sqlite")
+    assert provider.available is False
+    assert await provider.lookup("run") is None
+
+
+def test_definition_cache_evicts_least_recently_used():
+    cache = DefinitionCache(max_size=2, ttl=60)
+    cache.set("a", make_definition("a"))
+    cache.set("b", make_definition("b"))
+    cache.get("a")
+    cache.set("c", make_definition("c"))
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_definition_cache_expires_entries():
+    cache = DefinitionCache(max_size=10, ttl=0)
+    cache.set("a", make_definition("a"))
+    assert cache.get("a") is None
+
+
+def test_unknown_provider_rejected():
+    with pytest.raises(ValueError, match="Unknown dictionary provider"):
+        DictionaryService(["local", "thesaurus"])
+
+
+@pytest.mark.asyncio
+async def test_chain_prefers_local_provider(monkeypatch, local_index):
+    monkeypatch.setattr(settings, "LOCAL_DICTIONARY_PATH", str(local_index))
+    service = DictionaryService(["local", "cache", "remote"])
+    remote_lookup = AsyncMock()
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", remote_lookup)
+
+    definition = await service.get_word_definition("  Ephemeral ")
+
+    assert definition.word == "ephemeral"
+    remote_lookup.assert_not_called()
+    # Local hits are not copied into the cache
+    assert len(service.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_chain_caches_remote_results(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        settings, "LOCAL_DICTIONARY_PATH", str(tmp_path / "missing.sqlite")
+    )
+    service = DictionaryService(["local", "cache", "remote"])
+    remote_lookup = AsyncMock(return_value=make_definition("serendipity"))
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", remote_lookup)
+
+    first = await service.get_word_definition("serendipity")
+    second = await service.get_word_definition("Serendipity")
+
+    assert first == second
+    remote_lookup.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_chain_reports_remote_error(monkeypatch):
+    service = DictionaryService(["cache", "remote"])
+    remote_lookup = AsyncMock(
+        side_effect=ValueError("Definition not found for the word 'xyzabc'")
+    )
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", remote_lookup)
+
+    with pytest.raises(ValueError, match="not found"):
+        await service.get_word_definition("xyzabc")
+    assert len(service.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_inflected_forms_share_one_lookup(monkeypatch):
+    service = DictionaryService(["cache", "remote"])
+    remote_lookup = AsyncMock(return_value=make_definition("run"))
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", remote_lookup)
+
+    for form in ["run", "Running,", "ran", "runs"]:
+        definition = await service.get_word_definition(form)
+        assert definition.word == "run"
+
+    remote_lookup.assert_called_once_with("run")
+    assert (await service.get_word_definition("ran")).redirected_from == "ran"
+    assert (await service.get_word_definition("run")).redirected_from is None
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_surface_form(monkeypatch):
+    """An over-stripped lemma falls back to the surface form and is remembered"""
+    service = DictionaryService(["cache", "remote"])
+    calls = []
+
+    async def lookup(self, word):
+        calls.append(word)
+        if word == "tidings":
+            return make_definition("tidings")
+        raise ValueError(f"Definition not found for the word '{word}'")
+
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", lookup)
+
+    definition = await service.get_word_definition("Tidings.")
+    assert definition.word == "tidings"
+    assert definition.redirected_from is None
+
+    await service.get_word_definition("tidings")
+    assert calls == ["tiding", "tidings"]
+
+
+@pytest.mark.asyncio
+async def test_punctuation_only_selection_not_found():
+    service = DictionaryService(["cache"])
+    with pytest.raises(ValueError, match="not found"):
+        await service.get_word_definition("—")
+
+
+def api_payload(word: str) -> list[dict]:
+    return [
+        {
+            "word": word,
+            "meanings": [
+                {
+                    "partOfSpeech": "noun",
+                    "definitions": [{"definition": f"Meaning of {word}"}],
+                }
+            ],
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_remote_provider_retries_server_errors():
+    responses = iter([503, 200])
+
+    def handler(request):
+        status_code = next(responses)
+        if status_code == 200:
+            return httpx.Response(200, json=api_payload("test"))
+        return httpx.Response(status_code)
+
+    provider = RemoteDictionaryProvider(
+        "https://dictionary.test", transport=httpx.MockTransport(handler)
+    )
+
+    definition = await provider.lookup("test")
+    assert definition.word == "test"
+    assert provider.retries_total == 1
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remote_provider_not_found_is_not_a_failure():
+    provider = RemoteDictionaryProvider(
+        "https://dictionary.test",
+        transport=httpx.MockTransport(lambda request: httpx.Response(404)),
+    )
+
+    with pytest.raises(ValueError, match="not found") as exc_info:
+        await provider.lookup("xyzabc")
+    assert not isinstance(exc_info.value, DictionaryUnavailableError)
+    assert provider.breaker.consecutive_failures == 0
+    assert provider.retries_total == 0
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remote_provider_breaker_fails_fast(monkeypatch):
+    monkeypatch.setattr(settings, "DICTIONARY_BREAKER_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "DICTIONARY_MAX_RETRIES", 0)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("connection refused")
+
+    provider = RemoteDictionaryProvider(
+        "https://dictionary.test", transport=httpx.MockTransport(handler)
+    )
+
+    for _ in range(2):
+        with pytest.raises(DictionaryUnavailableError):
+            await provider.lookup("test")
+
+    with pytest.raises(DictionaryUnavailableError, match="temporarily unavailable"):
+        await provider.lookup("test")
+    assert len(calls) == 2
+    assert provider.metrics()["breaker_state"] == "open"
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remote_provider_cancelled_probe_releases_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "DICTIONARY_BREAKER_FAILURE_THRESHOLD", 1)
+    monkeypatch.setattr(settings, "DICTIONARY_BREAKER_RESET_TIMEOUT", 0)
+    monkeypatch.setattr(settings, "DICTIONARY_MAX_RETRIES", 0)
+
+    async def handler(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200, json=api_payload("test"))
+
+    provider = RemoteDictionaryProvider(
+        "https://dictionary.test", transport=httpx.MockTransport(handler)
+    )
+    provider.breaker.record_failure()
+
+    # The probe is cancelled, e.g. because the client disconnected
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(provider.lookup("test"), timeout=0.05)
+
+    assert provider.breaker.allow_request() is True
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remote_provider_records_timeouts_as_latency(monkeypatch):
+    monkeypatch.setattr(settings, "DICTIONARY_MAX_RETRIES", 0)
+
+    def handler(request):
+        raise httpx.ReadTimeout("timed out")
+
+    provider = RemoteDictionaryProvider(
+        "https://dictionary.test", transport=httpx.MockTransport(handler)
+    )
+
+    with pytest.raises(DictionaryUnavailableError):
+        await provider.lookup("test")
+
+    provider.latency.min_samples = 1
+    assert provider.latency.percentile(50) == settings.DICTIONARY_TIMEOUT_MAX
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remote_provider_adaptive_timeout(monkeypatch):
+    monkeypatch.setattr(settings, "DICTIONARY_TIMEOUT_MIN", 0.5)
+    provider = RemoteDictionaryProvider("https://dictionary.test")
+    assert provider.timeout == settings.DICTIONARY_TIMEOUT_MAX
+
+    for _ in range(50):
+        provider.latency.observe(0.05)
+    assert provider.timeout == 0.5
+
+    for _ in range(50):
+        provider.latency.observe(2.0)
+    assert 0.5 < provider.timeout <= settings.DICTIONARY_TIMEOUT_MAX
+
+
+@pytest.mark.asyncio
+async def test_remote_provider_hedges_slow_requests(monkeypatch):
+    monkeypatch.setattr(settings, "DICTIONARY_HEDGING_ENABLED", True)
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+        return httpx.Response(200, json=api_payload("test"))
+
+    provider = RemoteDictionaryProvider(
+        "https://dictionary.test", transport=httpx.MockTransport(handler)
+    )
+    for _ in range(50):
+        provider.latency.observe(0.01)
+
+    definition = await asyncio.wait_for(provider.lookup("test"), timeout=0.5)
+    assert definition.word == "test"
+    assert provider.hedges_total == 1
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stale_definition_served_when_upstream_unavailable(monkeypatch):
+    monkeypatch.setattr(settings, "DEFINITION_CACHE_TTL", 0)
+    monkeypatch.setattr(settings, "DEFINITION_CACHE_MAX_STALE", 0)
+    service = DictionaryService(["cache", "remote"])
+    service.cache.set("test", make_definition("test"))
+
+    remote_lookup = AsyncMock(
+        side_effect=DictionaryUnavailableError("Dictionary service is down")
+    )
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", remote_lookup)
+
+    definition = await service.get_word_definition("test")
+    assert definition.word == "test"
+    assert service.metrics()["stale_served_total"] == 1
+
+
+def test_unavailable_dictionary_returns_503(client):
+    with patch(
+        "app.services.dictionary_service.dictionary_service.get_word_definition",
+        new_callable=AsyncMock,
+    ) as mock_get:
+        mock_get.side_effect = DictionaryUnavailableError(
+            "Dictionary service is temporarily unavailable"
+        )
+
+        response = client.get("/api/v1/definitions/test")
+        assert response.status_code == 503
+
+
+def test_dictionary_health_metrics(client):
+    response = client.get("/health/dictionary")
+    assert response.status_code == 200
+    data = response.json()
+    assert "cache_entries" in data
+    assert data["upstream"]["breaker_state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_pronunciation_reuses_cached_definition(monkeypatch):
+    service = DictionaryService(["cache", "remote"])
+    definition = make_definition("test")
+    definition.audio_url = "https://example.com/test.mp3"
+    remote_lookup = AsyncMock(return_value=definition)
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", remote_lookup)
+
+    await service.get_word_definition("test")
+    pronunciation = await service.get_word_pronunciation("test")
+
+    assert pronunciation.audio_url == "https://example.com/test.mp3"
+    remote_lookup.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_refreshing(monkeypatch):
+    """A warm word past its TTL is answered from cache, not the upstream"""
+    monkeypatch.setattr(settings, "DEFINITION_CACHE_TTL", 0)
+    service = DictionaryService(["cache", "remote"])
+    service.cache.set("test", make_definition("test"))
+
+    refreshed = make_definition("test")
+    refreshed.phonetic = "/test/"
+    upstream_called = asyncio.Event()
+    release_upstream = asyncio.Event()
+
+    async def slow_lookup(self, word):
+        upstream_called.set()
+        await release_upstream.wait()
+        return refreshed
+
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", slow_lookup)
+
+    definition = await asyncio.wait_for(
+        service.get_word_definition("test"), timeout=0.1
+    )
+    assert definition.phonetic is None
+
+    # A second reader does not start another refresh
+    await service.get_word_definition("test")
+    assert service.refreshes_total == 1
+
+    await upstream_called.wait()
+    release_upstream.set()
+    await asyncio.sleep(0)
+    while service.metrics()["refreshes_in_flight"]:
+        await asyncio.sleep(0)
+
+    assert service.cache.get_stale("test").phonetic == "/test/"
+
+
+@pytest.mark.asyncio
+async def test_entry_past_max_stale_is_fetched_inline(monkeypatch):
+    monkeypatch.setattr(settings, "DEFINITION_CACHE_TTL", 0)
+    monkeypatch.setattr(settings, "DEFINITION_CACHE_MAX_STALE", 0)
+    service = DictionaryService(["cache", "remote"])
+    service.cache.set("test", make_definition("test"))
+
+    remote_lookup = AsyncMock(return_value=make_definition("test"))
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", remote_lookup)
+
+    await service.get_word_definition("test")
+    remote_lookup.assert_called_once_with("test")
+    assert service.refreshes_total == 0
+
+
+@pytest.mark.asyncio
+async def test_refresh_concurrency_is_limited(monkeypatch):
+    monkeypatch.setattr(settings, "DEFINITION_CACHE_TTL", 0)
+    monkeypatch.setattr(settings, "DEFINITION_REFRESH_CONCURRENCY", 2)
+    service = DictionaryService(["cache", "remote"])
+    release_upstream = asyncio.Event()
+
+    async def slow_lookup(self, word):
+        await release_upstream.wait()
+        return make_definition(word)
+
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", slow_lookup)
+
+    for word in ["alpha", "beta", "gamma"]:
+        service.cache.set(word, make_definition(word))
+        await service.get_word_definition(word)
+
+    assert service.refreshes_total == 2
+    assert service.refreshes_skipped_total == 1
+
+    release_upstream.set()
+    while service.metrics()["refreshes_in_flight"]:
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_stale_entry(monkeypatch):
+    monkeypatch.setattr(settings, "DEFINITION_CACHE_TTL", 0)
+    service = DictionaryService(["cache", "remote"])
+    service.cache.set("test", make_definition("test"))
+
+    remote_lookup = AsyncMock(side_effect=DictionaryUnavailableError("down"))
+    monkeypatch.setattr(RemoteDictionaryProvider, "lookup", remote_lookup)
+
+    await service.get_word_definition("test")
+    while service.metrics()["refreshes_in_flight"]:
+        await asyncio.sleep(0)
+
+    assert (await service.get_word_definition("test")).word == "test"
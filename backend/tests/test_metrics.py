@@ -0,0 +1,182 @@
+"""Tests for the metrics primitives and GET /metrics"""
+
+import gc
+import re
+import threading
+import time
+
+from app.core.metrics import Counter, Gauge, Histogram, MetricsRegistry
+from app.services.dictionary_service import dictionary_service
+from tests.test_books import create_test_pdf
+
+
+def sample(text: str, name: str, **labels: str) -> float:
+    """Value of the sample with exactly these labels in a /metrics response"""
+    rendered = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    series = f"{name}{{{rendered}}}" if labels else name
+    match = re.search(rf"^{re.escape(series)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_render_text_format():
+    registry = MetricsRegistry()
+    requests = Counter("requests_total", "Requests", ("route",), registry=registry)
+    in_flight = Gauge("in_flight", "In flight", registry=registry)
+    latency = Histogram(
+        "latency_seconds", "Latency", buckets=(0.1, 1), registry=registry
+    )
+
+    requests.labels('/a"b').inc()
+    requests.labels('/a"b').inc(2)
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a\\"b"} 3',
+        "# HELP in_flight In flight",
+        "# TYPE in_flight gauge",
+        "in_flight 1",
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 3.65",
+        "latency_seconds_count 4",
+    ]
+
+
+def test_updates_from_many_threads_are_not_lost():
+    registry = MetricsRegistry()
+    counter = Counter("events_total", "Events", ("kind",), registry=registry)
+    histogram = Histogram("sizes", "Sizes", buckets=(1,), registry=registry)
+
+    def work():
+        for _ in range(10_000):
+            counter.labels("a").inc()
+            histogram.observe(1)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    text = registry.render()
+    assert sample(text, "events_total", kind="a") == 80_000
+    assert sample(text, "sizes_count") == 80_000
+    assert sample(text, "sizes_bucket", le="1") == 80_000
+
+
+def test_finished_threads_are_folded_into_the_totals():
+    """Values of ended threads are kept, their per-thread copies are not"""
+    registry = MetricsRegistry()
+    counter = Counter("events_total", "Events", registry=registry)
+    histogram = Histogram("sizes", "Sizes", buckets=(1,), registry=registry)
+
+    def work():
+        counter.inc()
+        histogram.observe(2)
+
+    for _ in range(50):
+        threads = [threading.Thread(target=work) for _ in range(40)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # Thread-local storage is freed when the thread is torn down, which may
+    # finish just after join() returns
+    deadline = time.monotonic() + 5
+    while counter._unlabelled._cells._shards and time.monotonic() < deadline:
+        gc.collect()
+        time.sleep(0.01)
+
+    assert counter._unlabelled._cells._shards == {}
+    assert histogram._unlabelled._cells._shards == {}
+    text = registry.render()
+    assert sample(text, "events_total") == 2000
+    assert sample(text, "sizes_count") == 2000
+    assert sample(text, "sizes_sum") == 4000
+
+
+def test_metrics_endpoint(authenticated_client, test_user):
+    before = authenticated_client.get("/metrics").text
+    book_id = "00000000-0000-0000-0000-000000000000"
+    authenticated_client.get(f"/api/v1/books/{book_id}")
+    authenticated_client.get("/api/v1/dictionary")
+
+    response = authenticated_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = response.text
+    book_route = {"method": "GET", "route": "/api/v1/books/{book_id}"}
+
+    def delta(name, **labels):
+        return sample(after, name, **labels) - sample(before, name, **labels)
+
+    # Requests are labelled with the route template, not the path
+    assert delta("http_requests_total", **book_route, status="404") == 1
+    assert delta("http_request_duration_seconds_count", **book_route) == 1
+    assert (
+        delta(
+            "http_requests_total",
+            method="GET",
+            route="/api/v1/dictionary",
+            status="200",
+        )
+        == 1
+    )
+    # Only the /metrics request itself is being served
+    assert sample(after, "http_requests_in_flight") == 1
+    assert delta("db_query_duration_seconds_count", operation="select") >= 2
+
+
+def test_metrics_unknown_methods_share_a_label(client):
+    """Arbitrary methods sent by clients do not create new label sets"""
+    before = client.get("/metrics").text
+    for method in ("FOO", "BAR"):
+        client.request(method, "/health")
+
+    after = client.get("/metrics").text
+
+    assert 'method="FOO"' not in after and 'method="BAR"' not in after
+    labels = {"method": "other", "route": "/health", "status": "405"}
+    assert (
+        sample(after, "http_requests_total", **labels)
+        - sample(before, "http_requests_total", **labels)
+        == 2
+    )
+
+
+def test_metrics_pdf_pages(authenticated_client, test_user):
+    before = authenticated_client.get("/metrics").text
+    response = authenticated_client.post(
+        "/api/v1/books",
+        files={"file": ("test_book.pdf", create_test_pdf(), "application/pdf")},
+    )
+    after = authenticated_client.get("/metrics").text
+
+    pages = len(response.json()["content"])
+    assert (
+        sample(after, "pdf_page_extraction_seconds_count")
+        - sample(before, "pdf_page_extraction_seconds_count")
+        == pages
+    )
+
+
+def test_metrics_dictionary_cache(client, monkeypatch):
+    monkeypatch.setattr(dictionary_service.cache, "hits", 3)
+    monkeypatch.setattr(dictionary_service.cache, "misses", 1)
+
+    text = client.get("/metrics").text
+
+    assert sample(text, "dictionary_cache_hits_total") == 3
+    assert sample(text, "dictionary_cache_misses_total") == 1
+    assert sample(text, "dictionary_cache_hit_ratio") == 0.75
@@ -0,0 +1,126 @@
+"""Tests for the Alembic migrations"""
+
+import logging
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+from app.db.database import Base
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Alembic config and engine for an empty SQLite file"""
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    config.set_main_option("sqlalchemy.url", url)
+    engine = create_engine(url)
+    yield config, engine
+    engine.dispose()
+
+
+def test_migrations_match_models(database):
+    """Upgrading an empty database yields exactly the models' schema"""
+    config, engine = database
+    command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+
+    # The trigram index is only created on PostgreSQL
+    assert [
+        change
+        for change in diff
+        if change[0] != "add_index" or change[1].name != "ix_dictionary_words_word_trgm"
+    ] == []
+
+
+def test_downgrade_and_upgrade_again(database):
+    config, engine = database
+    command.upgrade(config, "head")
+    command.downgrade(config, "base")
+
+    assert set(inspect(engine).get_table_names()) == {"alembic_version"}
+
+    command.upgrade(config, "head")
+    assert "refresh_tokens" in inspect(engine).get_table_names()
+
+
+def test_upgrade_keeps_existing_data(database, caplog):
+    """A database created before migrations keeps its rows, minus duplicates"""
+    config, engine = database
+    command.upgrade(config, "0001")
+
+    saved_at = datetime(2024, 1, 1)
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    duplicate_id = ids[1]
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO users (id, email, password_hash, created_at, updated_at) "
+                "VALUES ('u', 'reader@example.com', 'x', :at, :at)"
+            ),
+            {"at": saved_at},
+        )
+        for offset, (word_id, word) in enumerate(
+            zip(ids, ["ephemeral", "ephemeral", "lucid"], strict=True)
+        ):
+            connection.execute(
+                text(
+                    "INSERT INTO dictionary_words "
+                    "(id, user_id, word, definition, added_at) "
+                    "VALUES (:id, 'u', :word, 'definition', :at)"
+                ),
+                {
+                    "id": word_id,
+                    "word": word,
+                    "at": saved_at + timedelta(minutes=offset),
+                },
+            )
+
+    caplog.set_level(logging.WARNING, logger="alembic")
+    command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        words = connection.execute(
+            text("SELECT word, due_at, repetitions FROM dictionary_words ORDER BY word")
+        ).all()
+        token_version = connection.scalar(text("SELECT token_version FROM users"))
+
+    assert [row.word for row in words] == ["ephemeral", "lucid"]
+    # The first saved copy is kept, due for review since it was saved
+    assert words[0].due_at == str(saved_at)
+    assert words[0].repetitions == 0
+    assert token_version == 0
+    # Deleted duplicates are logged
+    assert [
+        record.getMessage()
+        for record in caplog.records
+        if record.getMessage().startswith("Deleting")
+    ] == [f"Deleting duplicate saved word 'ephemeral' of user u (id {duplicate_id})"]
+
+
+@pytest.mark.parametrize("stamped", ["0001", "head"])
+def test_upgrade_adopts_database_without_version_table(database, stamped):
+    """Tables made by create_all, before migrations, are stamped and upgraded"""
+    config, engine = database
+    command.upgrade(config, stamped)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))
+
+    command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        version = connection.scalar(text("SELECT version_num FROM alembic_version"))
+    assert version == "0004"
+    assert "refresh_tokens" in inspect(engine).get_table_names()
@@ -0,0 +1,163 @@
+"""Tests for token-bucket rate limiting"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from starlette.requests import Request
+
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import (
+    InMemoryRateLimitBackend,
+    client_ip,
+    parse_rate_limit,
+)
+from tests.test_books import create_test_pdf
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_parse_rate_limit():
+    assert parse_rate_limit("10/minute") == (10.0, 10 / 60)
+    assert parse_rate_limit("2/second") == (2.0, 2.0)
+
+    for rule in ["10", "ten/minute", "10/day", "0/minute"]:
+        with pytest.raises(ValueError):
+            parse_rate_limit(rule)
+
+
+def test_bucket_allows_burst_then_refills(clock):
+    backend = InMemoryRateLimitBackend(sweep_interval=60)
+
+    assert [backend.acquire("k", 3, 1.0) for _ in range(3)] == [0, 0, 0]
+    assert backend.acquire("k", 3, 1.0) == pytest.approx(1.0)
+
+    clock[0] += 0.5
+    assert backend.acquire("k", 3, 1.0) == pytest.approx(0.5)
+    clock[0] += 0.5
+    assert backend.acquire("k", 3, 1.0) == 0
+
+    # Keys have separate buckets
+    assert backend.acquire("other", 3, 1.0) == 0
+
+
+def test_idle_buckets_are_swept(clock):
+    backend = InMemoryRateLimitBackend(sweep_interval=10)
+    backend.acquire("idle", 5, 1.0)
+    backend.acquire("busy", 5, 1.0)
+    assert len(backend) == 2
+
+    clock[0] += 10
+    for _ in range(5):
+        backend.acquire("busy", 5, 1.0)
+
+    assert len(backend) == 1
+    # A swept bucket starts full again
+    assert backend.acquire("idle", 5, 1.0) == 0
+
+
+def test_upload_is_limited_per_user(authenticated_client, monkeypatch):
+    monkeypatch.setitem(settings.RATE_LIMITS, "upload_book", "2/minute")
+    pdf = create_test_pdf()
+
+    def upload(name):
+        return authenticated_client.post(
+            "/api/v1/books", files={"file": (name, pdf, "application/pdf")}
+        )
+
+    assert upload("one.pdf").status_code == 201
+    assert upload("two.pdf").status_code == 201
+    response = upload("three.pdf")
+
+    assert response.status_code == 429
+    assert 0 < int(response.headers["Retry-After"]) <= 30
+
+
+def test_definitions_are_limited_per_ip(client, monkeypatch):
+    monkeypatch.setitem(settings.RATE_LIMITS, "definitions", "1/minute")
+
+    with patch(
+        "app.services.dictionary_service.dictionary_service.get_word_definition",
+        new_callable=AsyncMock,
+        side_effect=ValueError("Definition not found"),
+    ):
+        assert client.get("/api/v1/definitions/first").status_code == 404
+        response = client.get("/api/v1/definitions/second")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "60"
+
+
+def test_audio_shares_the_definitions_limit(client, monkeypatch):
+    monkeypatch.setitem(settings.RATE_LIMITS, "definitions", "1/minute")
+
+    with patch(
+        "app.services.dictionary_service.dictionary_service.get_word_definition",
+        new_callable=AsyncMock,
+        side_effect=ValueError("Definition not found"),
+    ):
+        assert client.get("/api/v1/definitions/first").status_code == 404
+        response = client.get("/api/v1/definitions/first/audio")
+
+    assert response.status_code == 429
+
+
+def _request(peer: str, forwarded: str | None = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "client": (peer, 1234), "headers": headers})
+
+
+def test_client_ip_from_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", "127.0.0.1, 10.0.0.0/8")
+
+    # Direct clients cannot pick their own address
+    assert client_ip(_request("203.0.113.7", "198.51.100.1")) == "203.0.113.7"
+    assert client_ip(_request("127.0.0.1")) == "127.0.0.1"
+    # The rightmost address that is not a trusted proxy is the client;
+    # anything left of it came from the client and may be forged
+    assert client_ip(_request("10.0.0.2", "1.2.3.4, 203.0.113.7")) == "203.0.113.7"
+    assert client_ip(_request("127.0.0.1", "203.0.113.7, 10.0.0.5")) == "203.0.113.7"
+
+    # "*" trusts any peer, but not addresses inside the header
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", "*")
+    assert client_ip(_request("172.16.0.1", "1.2.3.4, 203.0.113.7")) == "203.0.113.7"
+    assert client_ip(_request("172.16.0.1")) == "172.16.0.1"
+
+
+def test_definitions_limit_keys_on_forwarded_client(client, monkeypatch):
+    monkeypatch.setitem(settings.RATE_LIMITS, "definitions", "1/minute")
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", "testclient")
+
+    def lookup(ip):
+        return client.get(
+            "/api/v1/definitions/word", headers={"X-Forwarded-For": ip}
+        ).status_code
+
+    with patch(
+        "app.services.dictionary_service.dictionary_service.get_word_definition",
+        new_callable=AsyncMock,
+        side_effect=ValueError("Definition not found"),
+    ):
+        # Clients behind the same proxy have their own buckets
+        assert lookup("203.0.113.7") == 404
+        assert lookup("203.0.113.8") == 404
+        assert lookup("203.0.113.7") == 429
+
+
+def test_rate_limit_can_be_disabled(client, monkeypatch):
+    monkeypatch.setitem(settings.RATE_LIMITS, "definitions", "1/minute")
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+
+    with patch(
+        "app.services.dictionary_service.dictionary_service.get_word_definition",
+        new_callable=AsyncMock,
+        side_effect=ValueError("Definition not found"),
+    ):
+        codes = {client.get("/api/v1/definitions/word").status_code for _ in range(3)}
+
+    assert codes == {404}
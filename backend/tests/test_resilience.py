@@ -0,0 +1,88 @@
+"""Tests for upstream resilience primitives"""
+
+import time
+
+from app.services.resilience import (
+    BreakerState,
+    CircuitBreaker,
+    LatencyTracker,
+    RetryBudget,
+)
+
+
+def test_latency_tracker_needs_min_samples():
+    tracker = LatencyTracker(min_samples=3)
+    tracker.observe(0.1)
+    assert tracker.percentile(50) is None
+
+    tracker.observe(0.2)
+    tracker.observe(0.3)
+    assert tracker.percentile(50) == 0.2
+    assert tracker.percentile(99) == 0.3
+
+
+def test_latency_tracker_window_drops_old_samples():
+    tracker = LatencyTracker(window=3, min_samples=1)
+    for seconds in [5.0, 0.1, 0.1, 0.1]:
+        tracker.observe(seconds)
+    assert tracker.percentile(99) == 0.1
+
+
+def test_retry_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, max_tokens=1)
+    assert budget.try_spend() is True
+    assert budget.try_spend() is False
+
+    budget.deposit()
+    assert budget.try_spend() is False
+    budget.deposit()
+    assert budget.try_spend() is True
+
+
+def test_circuit_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.allow_request() is True
+
+    breaker.record_failure()
+    assert breaker.state == BreakerState.OPEN
+    assert breaker.allow_request() is False
+    assert breaker.opened_total == 1
+
+
+def test_circuit_breaker_success_resets_failures():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == BreakerState.CLOSED
+
+
+def test_circuit_breaker_half_open_allows_one_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    assert breaker.allow_request() is True
+    assert breaker.state == BreakerState.HALF_OPEN
+    assert breaker.allow_request() is False
+
+    breaker.record_failure()
+    assert breaker.state == BreakerState.OPEN
+
+    time.sleep(0.02)
+    assert breaker.allow_request() is True
+    breaker.record_success()
+    assert breaker.state == BreakerState.CLOSED
+
+
+def test_circuit_breaker_release_frees_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    assert breaker.allow_request() is True
+    breaker.release()
+
+    assert breaker.state == BreakerState.HALF_OPEN
+    assert breaker.allow_request() is True
@@ -0,0 +1,163 @@
+"""Tests for the spaced-repetition review queue"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.models.dictionary import DictionaryWord
+from app.services.review_service import ReviewState, schedule_review
+from tests.conftest import record_statements
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+def _state(**overrides) -> ReviewState:
+    values = {"interval_days": 0, "ease": 2.5, "repetitions": 0, "due_at": NOW}
+    return ReviewState(**{**values, **overrides})
+
+
+def test_schedule_first_reviews():
+    first = schedule_review(_state(), 4, NOW)
+    assert (first.repetitions, first.interval_days, first.ease) == (1, 1, 2.5)
+    assert first.due_at == NOW + timedelta(days=1)
+
+    second = schedule_review(first, 4, NOW)
+    assert (second.repetitions, second.interval_days) == (2, 6)
+
+    third = schedule_review(second, 4, NOW)
+    assert (third.repetitions, third.interval_days) == (3, 15)
+
+
+@pytest.mark.parametrize("grade, ease", [(5, 2.6), (4, 2.5), (3, 2.36)])
+def test_schedule_adjusts_ease(grade, ease):
+    assert schedule_review(_state(), grade, NOW).ease == pytest.approx(ease)
+
+
+def test_schedule_failed_recall_resets():
+    state = _state(interval_days=30, ease=2.2, repetitions=5)
+
+    failed = schedule_review(state, 1, NOW)
+
+    assert (failed.repetitions, failed.interval_days, failed.ease) == (0, 1, 2.2)
+
+
+def test_schedule_ease_floor():
+    state = _state(ease=1.35)
+    assert schedule_review(state, 3, NOW).ease == 1.3
+
+
+def test_schedule_rejects_invalid_grade():
+    with pytest.raises(ValueError):
+        schedule_review(_state(), 6, NOW)
+
+
+def _add_card(db_session, user_id, word, due_in_days):
+    card = DictionaryWord(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        word=word,
+        definition=f"Definition of {word}",
+        due_at=datetime.utcnow() + timedelta(days=due_in_days),
+    )
+    db_session.add(card)
+    db_session.commit()
+    return card.id
+
+
+def test_review_queue_returns_due_cards(authenticated_client, test_user, db_session):
+    _add_card(db_session, test_user.id, "later", 3)
+    _add_card(db_session, test_user.id, "overdue", -5)
+    _add_card(db_session, test_user.id, "due", -1)
+    _add_card(db_session, "another-user", "theirs", -10)
+
+    response = authenticated_client.get("/api/v1/dictionary/review/next?n=10")
+
+    assert response.status_code == 200
+    cards = response.json()["cards"]
+    assert [card["word"] for card in cards] == ["overdue", "due"]
+    assert cards[0]["intervalDays"] == 0
+    assert cards[0]["ease"] == 2.5
+    assert "dueAt" in cards[0]
+
+    response = authenticated_client.get("/api/v1/dictionary/review/next?n=1")
+    assert [card["word"] for card in response.json()["cards"]] == ["overdue"]
+
+
+def test_new_words_are_due_immediately(authenticated_client):
+    authenticated_client.post(
+        "/api/v1/dictionary", json={"word": "ephemeral", "definition": "Short"}
+    )
+
+    response = authenticated_client.get("/api/v1/dictionary/review/next")
+    assert [card["word"] for card in response.json()["cards"]] == ["ephemeral"]
+
+
+def test_grade_reviews_batch(authenticated_client, test_user, db_session):
+    first = _add_card(db_session, test_user.id, "first", -1)
+    second = _add_card(db_session, test_user.id, "second", -1)
+    with record_statements() as statements:
+        response = authenticated_client.post(
+            "/api/v1/dictionary/review",
+            json={
+                "grades": [
+                    {"wordId": first, "grade": 5},
+                    {"wordId": second, "grade": 1},
+                ]
+            },
+        )
+
+    assert response.status_code == 200
+    cards = response.json()["cards"]
+    assert [card["word"] for card in cards] == ["first", "second"]
+    assert cards[0]["repetitions"] == 1
+    assert cards[0]["ease"] == pytest.approx(2.6)
+    assert cards[1]["repetitions"] == 0
+    assert cards[1]["reviewedAt"] is not None
+
+    updates = [s for s in statements if s.startswith("UPDATE dictionary_words")]
+    assert len(updates) == 1
+
+    # Both cards are now scheduled in the future
+    response = authenticated_client.get("/api/v1/dictionary/review/next")
+    assert response.json()["cards"] == []
+
+
+def test_grade_reviews_is_all_or_nothing(authenticated_client, test_user, db_session):
+    card = _add_card(db_session, test_user.id, "mine", -1)
+    theirs = _add_card(db_session, "another-user", "theirs", -1)
+
+    response = authenticated_client.post(
+        "/api/v1/dictionary/review",
+        json={"grades": [{"wordId": card, "grade": 5}, {"wordId": theirs, "grade": 5}]},
+    )
+
+    assert response.status_code == 404
+    response = authenticated_client.get("/api/v1/dictionary/review/next")
+    assert [c["word"] for c in response.json()["cards"]] == ["mine"]
+
+
+def test_grade_reviews_validation(authenticated_client):
+    response = authenticated_client.post(
+        "/api/v1/dictionary/review", json={"grades": [{"wordId": "x", "grade": 7}]}
+    )
+    assert response.status_code == 422
+
+    response = authenticated_client.post(
+        "/api/v1/dictionary/review", json={"grades": []}
+    )
+    assert response.status_code == 422
+
+
+def test_review_queue_uses_index(db_session):
+    plan = db_session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT * FROM dictionary_words "
+            "WHERE user_id = 'u' AND due_at <= '2024-01-01' ORDER BY due_at LIMIT 20"
+        )
+    ).fetchall()
+    details = " ".join(row[-1] for row in plan)
+
+    assert "ix_dictionary_words_user_due" in details
+    assert "TEMP B-TREE" not in details
@@ -0,0 +1,92 @@
+"""Tests for authenticated-user resolution and the token cache"""
+
+import time
+
+
+from app.core import security
+from app.core.security import Principal, PrincipalCache, principal_cache
+from tests.conftest import record_statements
+
+ALICE = Principal(id="alice", email="alice@example.com")
+BOB = Principal(id="bob", email="bob@example.com")
+
+
+def test_cache_hit_and_ttl(monkeypatch):
+    cache = PrincipalCache(max_entries=10, ttl=60)
+    now = time.monotonic()
+    monkeypatch.setattr(security.time, "monotonic", lambda: now)
+
+    cache.put("token", ALICE, time.time() + 3600)
+    assert cache.get("token") == ALICE
+    assert cache.get("other") is None
+
+    monkeypatch.setattr(security.time, "monotonic", lambda: now + 61)
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_cache_never_outlives_token():
+    cache = PrincipalCache(max_entries=10, ttl=60)
+
+    cache.put("expired", ALICE, time.time() - 1)
+
+    assert cache.get("expired") is None
+
+
+def test_cache_is_bounded():
+    cache = PrincipalCache(max_entries=2, ttl=60)
+    expires = time.time() + 3600
+
+    cache.put("first", ALICE, expires)
+    cache.put("second", ALICE, expires)
+    cache.get("first")
+    cache.put("third", BOB, expires)
+
+    assert len(cache) == 2
+    assert cache.get("second") is None
+    assert cache.get("first") == ALICE
+
+
+def test_invalidate_user():
+    cache = PrincipalCache(max_entries=10, ttl=60)
+    expires = time.time() + 3600
+    cache.put("alice-1", ALICE, expires)
+    cache.put("alice-2", ALICE, expires)
+    cache.put("bob", BOB, expires)
+
+    cache.invalidate_user("alice")
+
+    assert cache.get("alice-1") is None
+    assert cache.get("alice-2") is None
+    assert cache.get("bob") == BOB
+
+
+def test_repeat_requests_skip_user_lookup(authenticated_client, test_user):
+    authenticated_client.get("/api/v1/books")
+
+    with record_statements() as statements:
+        response = authenticated_client.get("/api/v1/books")
+
+    assert response.status_code == 200
+    assert not [s for s in statements if "FROM users" in s]
+
+
+def test_deleted_user_is_rejected(authenticated_client, test_user, db_session):
+    assert authenticated_client.get("/api/v1/auth/me").status_code == 200
+    assert len(principal_cache) == 1
+
+    db_session.delete(test_user)
+    db_session.commit()
+
+    assert authenticated_client.get("/api/v1/auth/me").status_code == 401
+    assert len(principal_cache) == 0
+    assert authenticated_client.get("/api/v1/books").status_code == 401
+
+
+def test_invalid_token_is_rejected(client):
+    response = client.get(
+        "/api/v1/books", headers={"Authorization": "Bearer not-a-token"}
+    )
+
+    assert response.status_code == 401
+    assert len(principal_cache) == 0
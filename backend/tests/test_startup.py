@@ -0,0 +1,16 @@
+"""
+Tests for cold start: what importing the app loads.
+
+Import time is machine-dependent, so its budget is checked by
+``python -m benchmarks.startup`` rather than here.
+"""
+
+from benchmarks.startup import LAZY_MODULES, measure_import
+
+
+def test_import_defers_heavy_modules():
+    """pypdf and httpx are imported by the first upload or lookup, not at startup"""
+    result = measure_import()
+
+    assert result["loaded"] == []
+    assert set(LAZY_MODULES) == {"pypdf", "httpx"}
@@ -0,0 +1,108 @@
+"""Tests for the per-user cache behind the saved-word structures"""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import literal, select
+
+from app.services.user_cache import UserCache
+
+
+def make_cache(build=list, max_users=10, ttl=60.0, versions=None):
+    """UserCache whose rows are the user id and whose version is versions[user]"""
+    versions = versions if versions is not None else {}
+    return UserCache(
+        max_users,
+        lambda user_id: select(literal(user_id)),
+        build,
+        lambda user_id: select(literal(versions.get(user_id, 0))),
+        ttl,
+    )
+
+
+@pytest.mark.asyncio
+async def test_builds_once_in_a_worker_thread(async_db_session):
+    built_in = []
+
+    def build(rows):
+        built_in.append(threading.get_ident())
+        return [value for (value,) in rows]
+
+    cache = make_cache(build)
+
+    assert await cache.get(async_db_session, "user-1") == ["user-1"]
+    assert await cache.get(async_db_session, "user-1") == ["user-1"]
+
+    assert built_in != [threading.get_ident()]
+    assert len(built_in) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_evicts_and_invalidates(async_db_session):
+    cache = make_cache(max_users=2)
+    for user_id in ["a", "b", "a", "c"]:
+        await cache.get(async_db_session, user_id)
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+
+    cache.invalidate("a")
+    assert "a" not in cache
+    cache.invalidate(None)
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_rebuilt_only_if_version_changed(async_db_session):
+    """Writes made by another process are picked up after the TTL"""
+    builds = []
+
+    def build(rows):
+        builds.append(rows)
+        return len(builds)
+
+    versions = {"user-1": 1}
+    cache = make_cache(build, ttl=0, versions=versions)
+
+    assert await cache.get(async_db_session, "user-1") == 1
+    # Expired, but the user's words are unchanged: kept
+    assert await cache.get(async_db_session, "user-1") == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    versions["user-1"] = 2
+    assert await cache.get(async_db_session, "user-1") == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_invalidation_only_discards_that_users_build(async_db_session):
+    started = threading.Event()
+    release = threading.Event()
+
+    def build(rows):
+        started.set()
+        release.wait(5)
+        return list(rows)
+
+    cache = make_cache(build)
+
+    async def get_while(invalidated: str) -> None:
+        started.clear()
+        release.clear()
+        task = asyncio.create_task(cache.get(async_db_session, "a"))
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        cache.invalidate(invalidated)
+        release.set()
+        await task
+
+    # A write by another user does not throw away the build in flight
+    await get_while("b")
+    assert "a" in cache
+
+    # A write by the same user does: the rows may predate it
+    cache.invalidate("a")
+    await get_while("a")
+    assert "a" not in cache
@@ -0,0 +1,123 @@
+"""Tests for saved-word page annotation"""
+
+import uuid
+
+import pytest
+
+from app.models.book import Book
+from app.services.sample_book import SAMPLE_BOOK_CONTENT, SAMPLE_BOOK_ID
+from app.services.word_annotator import AhoCorasick, word_annotator
+from app.services.word_index import word_index
+
+
+def _spans(automaton, text):
+    return [(m.word, text[m.start : m.end]) for m in automaton.find_all(text)]
+
+
+def test_finds_all_patterns_in_one_pass():
+    automaton = AhoCorasick({"he": "1", "she": "2", "hers": "3", "his": "4"})
+
+    assert _spans(automaton, "she said his was hers") == [
+        ("she", "she"),
+        ("his", "his"),
+        ("hers", "hers"),
+    ]
+
+
+def test_matches_whole_words_case_insensitively():
+    automaton = AhoCorasick({"cat": "1"})
+
+    text = "Cat, concatenate, cats and the CAT's bowl"
+    assert [(m.start, m.end) for m in automaton.find_all(text)] == [(0, 3), (31, 34)]
+
+
+def test_prefers_longest_overlapping_match():
+    automaton = AhoCorasick({"ice": "1", "ice cream": "2", "cream": "3"})
+
+    assert _spans(automaton, "ice cream or cream") == [
+        ("ice cream", "ice cream"),
+        ("cream", "cream"),
+    ]
+
+
+def test_empty_dictionary_matches_nothing():
+    assert AhoCorasick({}).find_all("anything at all") == []
+
+
+def _save(authenticated_client, word):
+    return authenticated_client.post(
+        "/api/v1/dictionary", json={"word": word, "definition": "-"}
+    ).json()["id"]
+
+
+def test_get_page_with_annotations(authenticated_client, test_user, db_session):
+    book = Book(
+        id=str(uuid.uuid4()),
+        user_id=test_user.id,
+        name="Annotated",
+        content=["The quick brown fox.", "A lazy dog and a quick fox."],
+        total_pages=2,
+        file_size=100,
+    )
+    db_session.add(book)
+    db_session.commit()
+    fox = _save(authenticated_client, "fox")
+
+    response = authenticated_client.get(f"/api/v1/books/{book.id}/pages/1")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["content"] == "A lazy dog and a quick fox."
+    assert data["pageIndex"] == 1
+    assert data["totalPages"] == 2
+    assert data["annotations"] is None
+
+    response = authenticated_client.get(
+        f"/api/v1/books/{book.id}/pages/1?annotate=saved"
+    )
+    assert response.json()["annotations"] == [
+        {"word": "fox", "wordId": fox, "start": 23, "end": 26}
+    ]
+
+    # Saving a word rebuilds the automaton
+    _save(authenticated_client, "lazy")
+    response = authenticated_client.get(
+        f"/api/v1/books/{book.id}/pages/1?annotate=saved"
+    )
+    assert [a["word"] for a in response.json()["annotations"]] == ["lazy", "fox"]
+
+
+def test_get_sample_book_page(authenticated_client):
+    word = SAMPLE_BOOK_CONTENT[0].split()[0].strip(".,").lower()
+    _save(authenticated_client, word)
+
+    response = authenticated_client.get(
+        f"/api/v1/books/{SAMPLE_BOOK_ID}/pages/0?annotate=saved"
+    )
+
+    assert response.status_code == 200
+    annotations = response.json()["annotations"]
+    assert annotations and annotations[0]["word"] == word
+
+
+def test_get_page_errors(authenticated_client):
+    response = authenticated_client.get("/api/v1/books/missing/pages/0")
+    assert response.status_code == 404
+
+    response = authenticated_client.get(
+        f"/api/v1/books/{SAMPLE_BOOK_ID}/pages/{len(SAMPLE_BOOK_CONTENT)}"
+    )
+    assert response.status_code == 400
+
+    response = authenticated_client.get(
+        f"/api/v1/books/{SAMPLE_BOOK_ID}/pages/0?annotate=everything"
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_annotator_invalidated_with_word_index(async_db_session):
+    await word_annotator.annotate(async_db_session, "user", "text")
+    assert "user" in word_annotator._automata
+
+    word_index.invalidate("user")
+    assert "user" not in word_annotator._automata
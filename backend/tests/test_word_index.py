@@ -0,0 +1,171 @@
+"""Tests for the in-memory saved-word index"""
+
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from app.models.dictionary import DictionaryWord
+from app.services.word_index import BloomFilter, WordMembershipIndex, word_index
+from tests.conftest import async_engine
+
+
+def _save_words(db_session, user_id, words):
+    for word in words:
+        db_session.add(
+            DictionaryWord(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                word=word,
+                definition=f"Definition of {word}",
+            )
+        )
+    db_session.commit()
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if "FROM dictionary_words" in statement:
+            self.count += 1
+
+    def __enter__(self):
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(async_engine.sync_engine, "before_cursor_execute", self)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    words = [f"word{i}" for i in range(1000)]
+    for word in words:
+        bloom.add(word)
+
+    assert all(word in bloom for word in words)
+    false_positives = sum(f"other{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_index_loads_once(db_session, async_db_session):
+    _save_words(db_session, "user-1", ["ephemeral", "lucid"])
+    index = WordMembershipIndex(max_users=10)
+    db = async_db_session
+
+    with _QueryCounter() as queries:
+        assert await index.contains(db, "user-1", "ephemeral")
+        assert not await index.contains(db, "user-1", "table")
+        assert await index.saved_subset(db, "user-1", {"lucid", "chair"}) == {"lucid"}
+
+    # The version of the user's words, then the words themselves
+    assert queries.count == 2
+    assert (index.hits, index.misses) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_index_evicts_least_recently_used(async_db_session):
+    index = WordMembershipIndex(max_users=2)
+    for user_id in ["a", "b", "a", "c"]:
+        await index.contains(async_db_session, user_id, "word")
+
+    assert len(index) == 2
+    assert index.misses == 3
+    await index.contains(async_db_session, "a", "word")
+    assert index.misses == 3
+
+
+@pytest.mark.asyncio
+async def test_index_invalidation_during_load_is_not_cached(async_db_session):
+    """A load that overlaps a write must not cache the pre-write words"""
+    index = WordMembershipIndex(max_users=10)
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def write_during_load(*args):
+        index.invalidate("user-1")
+
+    try:
+        await index.contains(async_db_session, "user-1", "ephemeral")
+    finally:
+        event.remove(
+            async_engine.sync_engine, "before_cursor_execute", write_during_load
+        )
+
+    assert len(index) == 0
+
+
+@pytest.mark.asyncio
+async def test_index_sees_writes_of_other_workers(db_session, async_db_session):
+    """Words saved or deleted without invalidating are seen after the TTL"""
+    _save_words(db_session, "user-1", ["ephemeral", "lucid"])
+    index = WordMembershipIndex(max_users=10)
+    db = async_db_session
+    assert not await index.contains(db, "user-1", "quietude")
+
+    # Another process saves a word and deletes one; this index is not told
+    _save_words(db_session, "user-1", ["quietude"])
+    db_session.query(DictionaryWord).filter_by(word="lucid").delete()
+    db_session.commit()
+    assert not await index.contains(db, "user-1", "quietude")
+
+    index._cache.ttl = 0
+    assert await index.saved_subset(db, "user-1", {"quietude", "lucid"}) == {"quietude"}
+
+
+@pytest.mark.asyncio
+async def test_index_bloom_mode_confirms_hits(db_session, async_db_session):
+    _save_words(db_session, "user-1", [f"word{i}" for i in range(20)])
+    index = WordMembershipIndex(max_users=10, bloom_threshold=5)
+    db = async_db_session
+
+    assert await index.contains(db, "user-1", "word3")
+    assert not await index.contains(db, "user-1", "missing")
+    assert await index.saved_subset(db, "user-1", {"word1", "word2", "nope"}) == {
+        "word1",
+        "word2",
+    }
+
+
+def test_check_word_served_from_index(authenticated_client, test_user, db_session):
+    """Repeated checks do not query the dictionary table"""
+    _save_words(db_session, test_user.id, ["ephemeral"])
+    authenticated_client.get("/api/v1/dictionary/check/ephemeral")
+
+    with _QueryCounter() as queries:
+        for word in ["ephemeral", "lucid", "table"]:
+            authenticated_client.get(f"/api/v1/dictionary/check/{word}")
+
+    assert queries.count == 0
+
+
+def test_index_invalidated_by_add_and_remove(authenticated_client):
+    def exists(word):
+        response = authenticated_client.get(f"/api/v1/dictionary/check/{word}")
+        return response.json()["exists"]
+
+    assert not exists("ephemeral")
+
+    response = authenticated_client.post(
+        "/api/v1/dictionary",
+        json={"word": "ephemeral", "definition": "Lasting a short time"},
+    )
+    assert exists("ephemeral")
+
+    authenticated_client.delete(f"/api/v1/dictionary/{response.json()['id']}")
+    assert not exists("ephemeral")
+
+
+def test_index_invalidated_by_import(authenticated_client, test_user):
+    authenticated_client.get("/api/v1/dictionary/check/lucid")
+    assert len(word_index) == 1
+
+    authenticated_client.post(
+        "/api/v1/dictionary/import",
+        files={"file": ("words.csv", b"lucid,Clear\n", "text/csv")},
+    )
+
+    response = authenticated_client.get("/api/v1/dictionary/check/lucid")
+    assert response.json()["exists"] is True
@@ -0,0 +1,95 @@
+"""Tests for word normalization and lemmatization"""
+
+import re
+
+import pytest
+
+from app.services.sample_book import SAMPLE_BOOK_CONTENT
+from app.services.word_normalizer import lemmatize, lookup_candidates, normalize_word
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("word,", "word"),
+        ("  Word. ", "word"),
+        ("“Hello!”", "hello"),
+        ("children's", "children"),
+        ("Children’s", "children"),
+        ("readers'", "readers"),
+        ("great—", "great"),
+        ("...", ""),
+    ],
+)
+def test_normalize_word(text, expected):
+    assert normalize_word(text) == expected
+
+
+@pytest.mark.parametrize(
+    "word, expected",
+    [
+        # irregular forms
+        ("ran", "run"),
+        ("was", "be"),
+        ("children", "child"),
+        ("thought", "think"),
+        # plurals and third person
+        ("runs", "run"),
+        ("studies", "study"),
+        ("boxes", "box"),
+        ("matches", "match"),
+        ("classes", "class"),
+        ("books", "book"),
+        # -ing and -ed
+        ("running", "run"),
+        ("making", "make"),
+        ("hoping", "hope"),
+        ("visiting", "visit"),
+        ("walked", "walk"),
+        ("stopped", "stop"),
+        ("tried", "try"),
+        ("loved", "love"),
+        # left alone
+        ("bus", "bus"),
+        ("analysis", "analysis"),
+        ("always", "always"),
+        ("nothing", "nothing"),
+        ("indeed", "indeed"),
+        ("sing", "sing"),
+        ("string", "string"),
+    ],
+)
+def test_lemmatize(word, expected):
+    assert lemmatize(word) == expected
+
+
+def test_lookup_candidates_order():
+    assert lookup_candidates("Running,") == ["run", "running"]
+    assert lookup_candidates("run") == ["run"]
+    assert lookup_candidates("?!") == []
+
+
+def test_cache_keys_shrink_on_book_text():
+    """
+    Measure cache key reuse on real book text: normalized lookups should
+    need noticeably fewer distinct keys than the old lower()/strip() keys,
+    and no key should carry punctuation.
+    """
+    tokens = [
+        token
+        for page in SAMPLE_BOOK_CONTENT
+        for token in re.split(r"\s+", page)
+        if token
+    ]
+
+    old_keys = {token.lower().strip() for token in tokens}
+    new_keys = {
+        lookup_candidates(token)[0] for token in tokens if normalize_word(token)
+    }
+
+    old_hit_ratio = 1 - len(old_keys) / len(tokens)
+    new_hit_ratio = 1 - len(new_keys) / len(tokens)
+
+    assert new_hit_ratio > old_hit_ratio
+    assert len(new_keys) < len(old_keys) * 0.85
+    assert not any(re.search(r"[^\w'-]", key) for key in new_keys)
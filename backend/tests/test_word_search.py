@@ -0,0 +1,122 @@
+"""Tests for dictionary search"""
+
+import uuid
+
+import pytest
+
+from app.models.dictionary import DictionaryWord
+from app.services.word_search import (
+    TrigramIndex,
+    WordSearchService,
+    similarity,
+    trigrams,
+)
+
+
+def _save_words(db_session, user_id, words):
+    for word in words:
+        db_session.add(
+            DictionaryWord(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                word=word,
+                definition=f"Definition of {word}",
+            )
+        )
+    db_session.commit()
+
+
+def test_trigrams_match_pg_trgm():
+    assert trigrams("cat") == {"  c", " ca", "cat", "at "}
+    assert similarity("word", "word") == 1.0
+    assert similarity("word", "two") == 0.0
+    # 7 shared trigrams out of 13 distinct ones
+    assert similarity("ephemeral", "ephemerel") == pytest.approx(7 / 13)
+
+
+def test_trigram_index_ranks_by_similarity():
+    index = TrigramIndex({"ephemeral": "1", "ephemera": "2", "lucid": "3"})
+
+    matches = index.search("ephemerel", threshold=0.3, limit=10)
+
+    assert [word for word, _ in matches] == ["ephemera", "ephemeral"]
+    assert [score for _, score in matches] == [
+        pytest.approx(similarity("ephemerel", "ephemera")),
+        pytest.approx(similarity("ephemerel", "ephemeral")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_prefix_then_fuzzy(db_session, async_db_session):
+    _save_words(
+        db_session,
+        "user-1",
+        ["serene", "serendipity", "serenity", "sere", "lucid", "seren"],
+    )
+    _save_words(db_session, "user-2", ["serenade"])
+    service = WordSearchService(max_users=10)
+
+    results = await service.search(async_db_session, "user-1", "Seren")
+
+    words = [word.word for word in results]
+    # Exact and prefix matches first, alphabetically
+    assert words[:4] == ["seren", "serendipity", "serene", "serenity"]
+    # Then fuzzy matches; other users' words never appear
+    assert "sere" in words[4:]
+    assert "lucid" not in words
+    assert "serenade" not in words
+
+
+@pytest.mark.asyncio
+async def test_search_tolerates_typos(db_session, async_db_session):
+    _save_words(db_session, "user-1", ["ephemeral", "serendipity", "quixotic"])
+    service = WordSearchService(max_users=10)
+
+    async def search(query):
+        return [w.word for w in await service.search(async_db_session, "user-1", query)]
+
+    assert await search("serendipty") == ["serendipity"]
+    assert await search("quixotc") == ["quixotic"]
+
+
+@pytest.mark.asyncio
+async def test_search_limit(db_session, async_db_session):
+    _save_words(db_session, "user-1", [f"word{i}" for i in range(10)])
+    service = WordSearchService(max_users=10)
+    db = async_db_session
+
+    assert len(await service.search(db, "user-1", "word", limit=3)) == 3
+    assert len(await service.search(db, "user-1", "wordx", limit=3)) == 3
+
+
+def test_search_endpoint(authenticated_client):
+    for word in ["ephemeral", "lucid"]:
+        authenticated_client.post(
+            "/api/v1/dictionary",
+            json={"word": word, "definition": f"Definition of {word}"},
+        )
+
+    response = authenticated_client.get("/api/v1/dictionary/search?q=Ephem")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["query"] == "ephem"
+    assert [w["word"] for w in data["words"]] == ["ephemeral"]
+    assert "addedAt" in data["words"][0]
+
+    # Newly added words are searchable (the trigram index is invalidated)
+    assert (
+        authenticated_client.get("/api/v1/dictionary/search?q=lucit").json()["words"][
+            0
+        ]["word"]
+        == "lucid"
+    )
+    authenticated_client.post(
+        "/api/v1/dictionary", json={"word": "lucidity", "definition": "Clarity"}
+    )
+    words = authenticated_client.get("/api/v1/dictionary/search?q=lucit").json()
+    assert {w["word"] for w in words["words"]} == {"lucid", "lucidity"}
+
+
+def test_search_endpoint_requires_query(authenticated_client):
+    response = authenticated_client.get("/api/v1/dictionary/search?q=")
+    assert response.status_code == 422
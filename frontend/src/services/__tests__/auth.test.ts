@@ -0,0 +1,98 @@
+import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
+import {
+  fetchWithAuth,
+  getRefreshToken,
+  getToken,
+  logout,
+  setToken,
+} from '../auth';
+
+const API = 'http://localhost:3000/api/v1';
+
+function jsonResponse(status: number, body: unknown): Response {
+  return new Response(JSON.stringify(body), {
+    status,
+    headers: { 'Content-Type': 'application/json' },
+  });
+}
+
+function signIn(accessToken: string, refreshToken: string) {
+  setToken(accessToken);
+  localStorage.setItem('refresh_token', refreshToken);
+}
+
+describe('auth session', () => {
+  beforeEach(() => {
+    localStorage.clear();
+  });
+
+  afterEach(() => {
+    vi.unstubAllGlobals();
+  });
+
+  it('should refresh an expired access token once and retry', async () => {
+    signIn('expired', 'refresh-1');
+    const fetchMock = vi.fn(async (url: string, init?: RequestInit) => {
+      if (url.endsWith('/auth/refresh')) {
+        return jsonResponse(200, {
+          access_token: 'fresh',
+          token_type: 'bearer',
+          refresh_token: 'refresh-2',
+          expires_in: 900,
+        });
+      }
+      const authorization = new Headers(init?.headers).get('Authorization');
+      return authorization === 'Bearer fresh'
+        ? jsonResponse(200, { books: [] })
+        : jsonResponse(401, { detail: 'Could not validate credentials' });
+    });
+    vi.stubGlobal('fetch', fetchMock);
+
+    const responses = await Promise.all([
+      fetchWithAuth(`${API}/books`),
+      fetchWithAuth(`${API}/dictionary`),
+    ]);
+
+    expect(responses.map((response) => response.status)).toEqual([200, 200]);
+    // Refresh tokens are single-use: concurrent 401s share one refresh
+    const refreshes = fetchMock.mock.calls.filter(([url]) =>
+      url.endsWith('/auth/refresh'),
+    );
+    expect(refreshes).toHaveLength(1);
+    expect(JSON.parse(refreshes[0][1]?.body as string)).toEqual({
+      refresh_token: 'refresh-1',
+    });
+    expect(getToken()).toBe('fresh');
+    expect(getRefreshToken()).toBe('refresh-2');
+  });
+
+  it('should clear the session when the refresh is rejected', async () => {
+    signIn('expired', 'revoked');
+    vi.stubGlobal(
+      'fetch',
+      vi.fn(async () => jsonResponse(401, { detail: 'Invalid refresh token' })),
+    );
+
+    const response = await fetchWithAuth(`${API}/books`);
+
+    expect(response.status).toBe(401);
+    expect(getToken()).toBeNull();
+    expect(getRefreshToken()).toBeNull();
+  });
+
+  it('should revoke the refresh token on logout', () => {
+    signIn('expired', 'refresh-1');
+    const fetchMock = vi.fn(async () => new Response(null, { status: 204 }));
+    vi.stubGlobal('fetch', fetchMock);
+
+    logout();
+
+    expect(getToken()).toBeNull();
+    expect(getRefreshToken()).toBeNull();
+    expect(fetchMock).toHaveBeenCalledWith(`${API}/auth/logout`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ refresh_token: 'refresh-1' }),
+    });
+  });
+});
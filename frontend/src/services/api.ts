@@ -1,4 +1,4 @@
-import { getToken, removeToken } from "./auth";
+import { fetchWithAuth, removeToken } from "./auth";
 
 // API base URL configuration
 const API_BASE_URL =
@@ -10,24 +10,19 @@ async function fetchAPI<T>(
   options: RequestInit = {},
 ): Promise<T> {
   const url = `${API_BASE_URL}${endpoint}`;
-  const token = getToken();
 
   const headers: HeadersInit = {
     "Content-Type": "application/json",
     ...options.headers,
   };
 
-  // Add authorization header if token exists
-  if (token) {
-    (headers as Record<string, string>)["Authorization"] = `Bearer ${token}`;
-  }
-
-  const response = await fetch(url, {
+  // Adds the access token, refreshing it once if it has expired
+  const response = await fetchWithAuth(url, {
     ...options,
     headers,
   });
 
-  // Handle 401 Unauthorized - clear token and redirect
+  // Handle 401 Unauthorized (the refresh failed too) - clear token and redirect
   if (response.status === 401) {
     removeToken();
     window.location.href = "/login";
@@ -9,10 +9,13 @@ export interface User {
 export interface AuthResponse {
   access_token: string;
   token_type: string;
+  refresh_token: string | null;
+  expires_in: number | null;
 }
 
 // Token storage
 const TOKEN_KEY = 'access_token';
+const REFRESH_TOKEN_KEY = 'refresh_token';
 
 export function getToken(): string | null {
   return localStorage.getItem(TOKEN_KEY);
@@ -22,8 +25,85 @@ export function setToken(token: string): void {
   localStorage.setItem(TOKEN_KEY, token);
 }
 
+export function getRefreshToken(): string | null {
+  return localStorage.getItem(REFRESH_TOKEN_KEY);
+}
+
+function setTokens(data: AuthResponse): void {
+  setToken(data.access_token);
+  if (data.refresh_token) {
+    localStorage.setItem(REFRESH_TOKEN_KEY, data.refresh_token);
+  }
+}
+
 export function removeToken(): void {
   localStorage.removeItem(TOKEN_KEY);
+  localStorage.removeItem(REFRESH_TOKEN_KEY);
+}
+
+// Refresh tokens are single-use, so concurrent 401s share one refresh
+let refreshing: Promise<boolean> | null = null;
+
+/**
+ * Exchange the refresh token for a new token pair.
+ * Resolves to false (and clears the session) if the refresh token is
+ * missing or rejected; rejects on network errors.
+ */
+export function refreshSession(): Promise<boolean> {
+  if (!refreshing) {
+    refreshing = (async () => {
+      const refreshToken = getRefreshToken();
+      if (!refreshToken) {
+        removeToken();
+        return false;
+      }
+      const response = await fetch(`${API_BASE_URL}/auth/refresh`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      });
+      if (!response.ok) {
+        removeToken();
+        return false;
+      }
+      setTokens(await response.json());
+      return true;
+    })().finally(() => {
+      refreshing = null;
+    });
+  }
+  return refreshing;
+}
+
+/**
+ * fetch() with the access token, refreshing the session once if the
+ * access token has expired. A 401 is returned only if the refresh failed.
+ */
+export async function fetchWithAuth(
+  url: string,
+  options: RequestInit = {},
+): Promise<Response> {
+  const send = () => {
+    const headers = new Headers(options.headers);
+    const token = getToken();
+    if (token) {
+      headers.set('Authorization', `Bearer ${token}`);
+    }
+    return fetch(url, { ...options, headers });
+  };
+
+  const sentToken = getToken();
+  const response = await send();
+  if (response.status !== 401 || !getRefreshToken()) {
+    return response;
+  }
+  // Another request may have refreshed the session in the meantime
+  if (getToken() !== sentToken || (await refreshSession())) {
+    return send();
+  }
+  return response;
 }
 
 // Auth API calls
@@ -68,25 +148,33 @@ export async function login(email: string, password: string): Promise<AuthRespon
   }
 
   const data: AuthResponse = await response.json();
-  setToken(data.access_token);
+  setTokens(data);
   return data;
 }
 
 export function logout(): void {
+  const refreshToken = getRefreshToken();
   removeToken();
+  if (refreshToken) {
+    // Revoke the session server-side; the refresh token alone is enough
+    fetch(`${API_BASE_URL}/auth/logout`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ refresh_token: refreshToken }),
+    }).catch(() => {
+      // The session is already gone locally
+    });
+  }
 }
 
 export async function getMe(): Promise<User> {
-  const token = getToken();
-  if (!token) {
+  if (!getToken()) {
     throw new Error('Not authenticated');
   }
 
-  const response = await fetch(`${API_BASE_URL}/auth/me`, {
-    headers: {
-      Authorization: `Bearer ${token}`,
-    },
-  });
+  const response = await fetchWithAuth(`${API_BASE_URL}/auth/me`);
 
   if (!response.ok) {
     if (response.status === 401) {
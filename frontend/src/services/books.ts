@@ -1,5 +1,5 @@
 import { fetchAPI, API_BASE_URL } from "./api";
-import { getToken, removeToken } from "./auth";
+import { fetchWithAuth, removeToken } from "./auth";
 
 export interface Book {
   id: string;
@@ -27,15 +27,8 @@ export async function uploadBook(file: File): Promise<Book> {
   const formData = new FormData();
   formData.append("file", file);
 
-  const token = getToken();
-  const headers: HeadersInit = {};
-  if (token) {
-    headers["Authorization"] = `Bearer ${token}`;
-  }
-
-  const response = await fetch(`${API_BASE_URL}/books`, {
+  const response = await fetchWithAuth(`${API_BASE_URL}/books`, {
     method: "POST",
-    headers,
     body: formData,
   });
 